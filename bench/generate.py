@@ -0,0 +1,140 @@
+"""Generate synthetic bento projects, used by the benchmarks.
+
+A project made with the default scale looks like::
+
+    bento.info          (Recurse: sub0, ..., DataFiles: data)
+    bscript             (empty hook file)
+    pkg0/__init__.py    (each package has a few modules and a subpackage)
+    pkg0/mod0.py
+    pkg0/sub/__init__.py
+    ext0.c              (trivial C extensions)
+    sub0/__init__.py
+    sub0/bento.info     (subento, with its own package sub0.subpkg0)
+    sub0/subpkg0/__init__.py
+    data/d0/f0.dat      (data files, installed through a glob)
+"""
+import os
+import shutil
+
+import os.path as op
+
+class Scale(object):
+    """Size of a synthetic project."""
+    def __init__(self, packages=10, modules=10, extensions=2, subentos=2,
+                 data_files=200, data_dirs=10):
+        self.packages = packages
+        self.modules = modules
+        self.extensions = extensions
+        self.subentos = subentos
+        self.data_files = data_files
+        self.data_dirs = data_dirs
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+_EXTENSION_SOURCE = """\
+#include <Python.h>
+
+static PyMethodDef methods[] = {
+    {NULL, NULL, 0, NULL}
+};
+
+#if PY_MAJOR_VERSION >= 3
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT, "%(name)s", NULL, -1, methods
+};
+
+PyMODINIT_FUNC PyInit_%(name)s(void)
+{
+    return PyModule_Create(&module);
+}
+#else
+PyMODINIT_FUNC init%(name)s(void)
+{
+    Py_InitModule("%(name)s", methods);
+}
+#endif
+"""
+
+def _write(filename, content):
+    d = op.dirname(filename)
+    if d and not op.exists(d):
+        os.makedirs(d)
+    fid = open(filename, "w")
+    try:
+        fid.write(content)
+    finally:
+        fid.close()
+
+def _module_source(name, i):
+    # Some actual code, so that byte-compilation is not trivial
+    lines = ['"""Synthetic module %s."""' % name, "import os", ""]
+    for j in range(20):
+        lines.append("def func%d(a, b=%d):" % (j, j))
+        lines.append("    return os.path.join(str(a), str(b * %d))" % i)
+        lines.append("")
+    return "\n".join(lines)
+
+def _write_package(root, name, n_modules):
+    _write(op.join(root, name, "__init__.py"), "")
+    for i in range(n_modules):
+        module = "%s.mod%d" % (name, i)
+        _write(op.join(root, name, "mod%d.py" % i), _module_source(module, i))
+    _write(op.join(root, name, "sub", "__init__.py"), _module_source(name + ".sub", 0))
+    return [name, name + ".sub"]
+
+def generate_project(root, scale):
+    """Create a synthetic project of the given Scale in the directory root
+    (removed first if it exists)."""
+    if op.exists(root):
+        shutil.rmtree(root)
+    os.makedirs(root)
+
+    packages = []
+    for i in range(scale.packages):
+        packages.extend(_write_package(root, "pkg%d" % i, scale.modules))
+
+    extensions = []
+    for i in range(scale.extensions):
+        name = "_ext%d" % i
+        _write(op.join(root, "ext%d.c" % i), _EXTENSION_SOURCE % {"name": name})
+        extensions.append((name, "ext%d.c" % i))
+
+    subentos = []
+    for i in range(scale.subentos):
+        sub = "sub%d" % i
+        subentos.append(sub)
+        # The subento packages are subpackages of sub<i>, declared at the top
+        _write(op.join(root, sub, "__init__.py"), "")
+        packages.append(sub)
+        _write_package(op.join(root, sub), "subpkg%d" % i, scale.modules)
+        _write(op.join(root, sub, "bento.info"), """\
+Library:
+    Packages: subpkg%d, subpkg%d.sub
+""" % (i, i))
+
+    for i in range(scale.data_files):
+        d = "d%d" % (i % max(scale.data_dirs, 1))
+        _write(op.join(root, "data", d, "f%d.dat" % i), "data %d\n" % i)
+
+    info = ["Name: synthetic", "Version: 0.1", "Summary: synthetic benchmark project",
+            "HookFile: bscript"]
+    if subentos:
+        info.append("Recurse: %s" % ", ".join(subentos))
+    info.append("")
+    if scale.data_files:
+        info.extend(["DataFiles: data",
+                     "    SourceDir: data",
+                     "    TargetDir: $pkgdatadir",
+                     "    Files: **/*.dat",
+                     ""])
+    if packages or extensions:
+        info.append("Library:")
+        if packages:
+            info.append("    Packages: %s" % ", ".join(packages))
+        for name, source in extensions:
+            info.extend(["    Extension: %s" % name,
+                         "        Sources: %s" % source])
+        info.append("")
+    _write(op.join(root, "bento.info"), "\n".join(info))
+    _write(op.join(root, "bscript"), "")
@@ -0,0 +1,272 @@
+"""Time bentomaker commands on synthetic projects.
+
+Example::
+
+    python bench/run_bench.py --packages 50 --extensions 4 --subentos 5 \\
+        --data-files 5000 -o bench-$(git rev-parse --short HEAD).json
+    python bench/run_bench.py --compare bench-old.json --compare-only bench-new.json
+
+configure, build, install, sdist and build_egg are run in order on a newly
+generated project (see generate.py), each one twice: the first (cold) run
+follows the previous command, the second one (warm, or noop for build) is the
+same command run again without any change. Each run calls bentomakerlib's main
+in a fresh interpreter, as when bentomaker is run from the command line, and
+the whole sequence is repeated --repeat times.
+
+The results are written as JSON: for each step, the times of every repetition
+(main itself, and the import of bentomaker), with their minimum and median.
+Comparing two result files shows the steps which became slower or faster.
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+import os.path as op
+
+from optparse \
+    import \
+        OptionParser
+
+ROOT = op.abspath(op.join(op.dirname(__file__), os.pardir))
+
+sys.path.insert(0, op.dirname(op.abspath(__file__)))
+from generate \
+    import \
+        Scale, generate_project
+sys.path.pop(0)
+
+try:
+    import json
+except ImportError:
+    sys.path.insert(0, ROOT)
+    from bento.compat.api \
+        import \
+            json
+
+try:
+    _clock = time.perf_counter
+except AttributeError:
+    _clock = time.time
+
+# (name, bentomaker arguments, name of the second run)
+STEPS = [("configure", ["configure", "--prefix=%(prefix)s"], "warm"),
+         ("build", ["--disable-autoconfigure", "build"], "noop"),
+         ("install", ["--disable-autoconfigure", "install"], "warm"),
+         ("sdist", ["sdist"], "warm"),
+         ("build_egg", ["--disable-autoconfigure", "build_egg"], "warm")]
+
+# Steps slower (or faster) than this ratio are reported by --compare
+THRESHOLD = 1.1
+
+def _run_step(argv, result):
+    """Run bentomaker main with the given arguments in the current process
+    (the child side of run_step)."""
+    start = _clock()
+    sys.path.insert(0, ROOT)
+    import bento
+    import bentomakerlib.bentomaker
+    imported = _clock()
+    bentomakerlib.bentomaker.main(argv)
+    end = _clock()
+
+    fid = open(result, "w")
+    try:
+        json.dump({"import": imported - start, "main": end - imported}, fid)
+    finally:
+        fid.close()
+
+def run_step(project, argv, log):
+    """Run bentomaker with the given arguments in project, in a fresh
+    interpreter, and return (import time, main time)."""
+    fd, result = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        cmd = [sys.executable, op.abspath(__file__), "--run-step", result, "--"] + argv
+        log.write("$ %s\n" % " ".join(argv))
+        log.flush()
+        p = subprocess.Popen(cmd, cwd=project, stdin=subprocess.PIPE,
+                             stdout=log, stderr=subprocess.STDOUT)
+        # bentomaker asks for confirmation when run as root
+        p.communicate("y\n".encode("ascii"))
+        if p.returncode:
+            raise RuntimeError("bentomaker %s failed (see %s)" % (" ".join(argv), log.name))
+        fid = open(result)
+        try:
+            data = json.load(fid)
+        finally:
+            fid.close()
+        return data["import"], data["main"]
+    finally:
+        os.remove(result)
+
+def _median(values):
+    values = sorted(values)
+    n = len(values)
+    if n % 2:
+        return values[n // 2]
+    else:
+        return 0.5 * (values[n // 2 - 1] + values[n // 2])
+
+def run_benchmarks(scale, repeat, work_dir, log, verbose=True):
+    project = op.join(work_dir, "project")
+    prefix = op.join(work_dir, "prefix")
+
+    times = {}
+    order = []
+    for i in range(repeat):
+        generate_project(project, scale)
+        if op.exists(prefix):
+            shutil.rmtree(prefix)
+        for name, argv, second in STEPS:
+            argv = [a % {"prefix": prefix} for a in argv]
+            for kind in ["cold", second]:
+                key = "%s/%s" % (name, kind)
+                if not key in times:
+                    times[key] = {"main": [], "import": []}
+                    order.append(key)
+                import_time, main_time = run_step(project, argv, log)
+                times[key]["main"].append(main_time)
+                times[key]["import"].append(import_time)
+                if verbose:
+                    print("%-20s %8.3fs" % (key, main_time))
+
+    steps = []
+    for key in order:
+        t = times[key]
+        steps.append({"name": key, "times": t["main"], "import_times": t["import"],
+                      "min": min(t["main"]), "median": _median(t["main"])})
+    return steps
+
+def _revision():
+    try:
+        p = subprocess.Popen(["git", "rev-parse", "HEAD"], cwd=ROOT,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out = p.communicate()[0]
+        if p.returncode == 0:
+            return out.decode("ascii").strip()
+    except OSError:
+        pass
+    return None
+
+def compare(old, new, threshold=THRESHOLD):
+    """Return the lines of the comparison of two results (as loaded from
+    their JSON files), based on the minimum time of each step."""
+    old_steps = dict([(s["name"], s) for s in old["steps"]])
+    lines = []
+    if old.get("scale") != new.get("scale"):
+        lines.append("Warning: the results are for projects of different scales")
+    for step in new["steps"]:
+        name = step["name"]
+        if not name in old_steps:
+            lines.append("%-20s %8.3fs  (new)" % (name, step["min"]))
+            continue
+        before = old_steps[name]["min"]
+        after = step["min"]
+        if before > 0:
+            ratio = after / before
+        else:
+            ratio = 1.0
+        if ratio > threshold:
+            flag = "SLOWER"
+        elif ratio < 1.0 / threshold:
+            flag = "faster"
+        else:
+            flag = ""
+        lines.append("%-20s %8.3fs -> %8.3fs  x%.2f %s" % (name, before, after, ratio, flag))
+    return lines
+
+def _load(filename):
+    fid = open(filename)
+    try:
+        return json.load(fid)
+    finally:
+        fid.close()
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if argv[:1] == ["--run-step"]:
+        _run_step(argv[3:], argv[1])
+        return 0
+
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("--packages", type="int", default=10,
+                      help="Number of python packages (default: %default)")
+    parser.add_option("--modules", type="int", default=10,
+                      help="Number of modules per package (default: %default)")
+    parser.add_option("--extensions", type="int", default=2,
+                      help="Number of C extensions (default: %default)")
+    parser.add_option("--subentos", type="int", default=2,
+                      help="Number of subentos (default: %default)")
+    parser.add_option("--data-files", type="int", default=200, dest="data_files",
+                      help="Number of data files, installed through a glob (default: %default)")
+    parser.add_option("--data-dirs", type="int", default=10, dest="data_dirs",
+                      help="Number of directories the data files are spread in (default: %default)")
+    parser.add_option("-r", "--repeat", type="int", default=3,
+                      help="Number of times each step is run (default: %default)")
+    parser.add_option("-o", "--output",
+                      help="Write the results into this JSON file")
+    parser.add_option("--work-dir", dest="work_dir",
+                      help="Directory where the project is generated (default: a " \
+                           "temporary directory, removed at the end)")
+    parser.add_option("--compare",
+                      help="Compare the results with the ones in this JSON file")
+    parser.add_option("--compare-only", dest="compare_only",
+                      help="Do not run anything, compare the --compare results " \
+                           "with the ones in this JSON file")
+    o, a = parser.parse_args(argv)
+
+    if o.compare_only:
+        if not o.compare:
+            parser.error("--compare-only requires --compare")
+        for line in compare(_load(o.compare), _load(o.compare_only)):
+            print(line)
+        return 0
+
+    scale = Scale(o.packages, o.modules, o.extensions, o.subentos, o.data_files,
+                  o.data_dirs)
+    if o.work_dir:
+        work_dir = op.abspath(o.work_dir)
+        if not op.exists(work_dir):
+            os.makedirs(work_dir)
+    else:
+        work_dir = tempfile.mkdtemp(prefix="bento-bench-")
+
+    log = open(op.join(work_dir, "bench.log"), "w")
+    try:
+        try:
+            steps = run_benchmarks(scale, o.repeat, work_dir, log)
+        finally:
+            log.close()
+    except RuntimeError:
+        e = sys.exc_info()[1]
+        print("Error: %s" % e)
+        return 1
+
+    results = {"revision": _revision(),
+               "python": sys.version.split()[0],
+               "platform": sys.platform,
+               "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "scale": scale.as_dict(),
+               "repeat": o.repeat,
+               "steps": steps}
+    if o.output:
+        fid = open(o.output, "w")
+        try:
+            json.dump(results, fid, indent=2, sort_keys=True)
+        finally:
+            fid.close()
+    if o.compare:
+        for line in compare(_load(o.compare), results):
+            print(line)
+
+    if not o.work_dir:
+        shutil.rmtree(work_dir)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
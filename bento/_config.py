@@ -21,8 +21,11 @@ _CLI = os.path.join(PKGDATADIR, "commands", "cli.exe")
 WININST_DIR = os.path.join(PKGDATADIR, "commands", "wininst")
 
 # Parser parameters
-_PICKLED_PARSETAB = os.path.join(PKGDATADIR, "parsetab")
+# Precomputed LR tables, regenerated with tools/generate_parsetab.py
+_PARSETAB_MODULE = "bento.parser.parsetab"
 _OPTIMIZE_LEX = 0
+# Lexer backend: "fused" (single pass, see bento.parser.fused_lexer) or "ply"
+_LEXER = "fused"
 _DEBUG_YACC = 0
 
 # Use subdist bento to avoid clashing with distutils ATM
@@ -32,6 +35,9 @@ CONFIGURED_STATE_DUMP = os.path.join(_SUB_BUILD_DIR, ".config.bin")
 DB_FILE = os.path.join(_SUB_BUILD_DIR, "cache.db")
 DISTCHECK_DIR = os.path.join(_SUB_BUILD_DIR, "distcheck")
 BUILD_MANIFEST_PATH = os.path.join(_SUB_BUILD_DIR, "build_manifest.info")
+INSTALL_RECORD_PATH = os.path.join(_SUB_BUILD_DIR, "install_record.bin")
+BYTECODE_CACHE_DIR = os.path.join(_SUB_BUILD_DIR, "bytecode_cache")
+SDIST_RECORD_PATH = os.path.join(_SUB_BUILD_DIR, "sdist_record.bin")
 
 BENTO_SCRIPT = "bento.info"
 
@@ -2,7 +2,7 @@ import os.path as op
 
 from bento.utils.utils \
     import \
-        extract_exception
+        extract_exception, pprint
 from bento.core.node_package \
     import \
         translate_name
@@ -19,8 +19,12 @@ from bento.backends.core \
     import \
         AbstractBackend
 
+import bento.utils.trace
+
 import yaku.context
 import yaku.errors
+import yaku.object_cache
+import yaku.timings
 
 class ConfigureYakuContext(ConfigureContext):
     def __init__(self, global_context, cmd_argv, options_context, pkg, run_node):
@@ -28,6 +32,7 @@ class ConfigureYakuContext(ConfigureContext):
         build_path = run_node._ctx.bldnode.path_from(run_node)
         source_path = run_node._ctx.srcnode.path_from(run_node)
         self.yaku_context = yaku.context.get_cfg(src_path=source_path, build_path=build_path)
+        self.yaku_context.tracer = bento.utils.trace.get_tracer()
 
     def configure(self):
         extensions = get_extensions(self.pkg, self.run_node)
@@ -63,6 +68,7 @@ class BuildYakuContext(BuildContext):
         build_path = run_node._ctx.bldnode.path_from(run_node)
         source_path = run_node._ctx.srcnode.path_from(run_node)
         self.yaku_context = yaku.context.get_bld(src_path=source_path, build_path=build_path)
+        self.yaku_context.tracer = bento.utils.trace.get_tracer()
 
         o, a = options_context.parser.parse_args(cmd_argv)
         if o.jobs:
@@ -70,7 +76,12 @@ class BuildYakuContext(BuildContext):
         else:
             jobs = 1
         self.verbose = o.verbose
+        self.report = o.report
         self.jobs = jobs
+        self.yaku_context.node_sigs.paranoid = o.paranoid
+        if o.object_cache:
+            self.yaku_context.object_cache = yaku.object_cache.ObjectCache(o.object_cache,
+                    o.object_cache_size * 2 ** 20, o.object_cache_hardlink)
 
         def _builder_factory(category, builder):
             def _build(extension, include_dirs=None, **kw):
@@ -128,6 +139,14 @@ class BuildYakuContext(BuildContext):
         runner.start()
         runner.run()
 
+        cache = bld.object_cache
+        if cache is not None:
+            pprint("PINK", "Object cache: %d hits, %d misses" % (cache.hits, cache.misses))
+
+        if self.report and bld.tasks:
+            for line in yaku.timings.report(bld.timings, bld.tasks, self.jobs):
+                pprint("PINK", line)
+
         # TODO: inplace support
 
     def pre_recurse(self, local_node):
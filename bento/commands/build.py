@@ -50,8 +50,30 @@ Usage:   bentomaker build [OPTIONS]."""
                                   dest="jobs", action="callback", callback=jobs_callback),
                            Option("-v", "--verbose",
                                   help="Verbose output (yaku build only)",
+                                  action="store_true"),
+                           Option("--paranoid",
+                                  help="Always hash files content to detect changes, instead " \
+                                       "of trusting unchanged stat metadata (yaku build only)",
+                                  action="store_true"),
+                           Option("--object-cache",
+                                  help="Cache compiled objects in the given directory, which " \
+                                       "may be shared between build directories (yaku build only)",
+                                  dest="object_cache"),
+                           Option("--object-cache-size",
+                                  help="Maximum size of the objects cache, in Mb (default: 1024)",
+                                  dest="object_cache_size", type="int", default=1024),
+                           Option("--object-cache-hardlink",
+                                  help="Hard link cached objects instead of copying them",
+                                  dest="object_cache_hardlink", action="store_true"),
+                           Option("--report",
+                                  help="Show the slowest tasks, the critical path and the " \
+                                       "achieved parallelism of the build (yaku build only)",
                                   action="store_true")]
 
+    def stored_argv(self, cmd_argv):
+        # The report is only shown for the build it was asked for
+        return [arg for arg in cmd_argv if arg != "--report"]
+
     def run(self, ctx):
         p = ctx.options_context.parser
         o, a = p.parse_args(ctx.command_argv)
@@ -1,29 +1,52 @@
 import os
+import sys
 import warnings
 
+try:
+    import multiprocessing
+except ImportError:
+    multiprocessing = None
+
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5
+
 from bento._config \
     import \
-        BUILD_MANIFEST_PATH
+        BUILD_MANIFEST_PATH, BYTECODE_CACHE_DIR
 from bento.commands.core \
     import \
         Command, Option
 from bento.commands.egg_utils \
     import \
         EggInfo, egg_filename
-from bento.utils.utils import pprint, extract_exception
+from bento.utils.utils \
+    import \
+        pprint, extract_exception, cpu_count, file_signature, check_file_signature
 from bento.core \
     import \
         PackageMetadata
 from bento.private.bytecode \
     import \
-        bcompile, PyCompileError
+        bcompile, PyCompileError, MAGIC
 from bento.installed_package_description \
     import \
         BuildManifest, iter_files
 
 import bento.compat.api as compat
+import bento.utils.io2
 import bento.utils.path
 
+if sys.version_info[0] < 3:
+    import cPickle as pickle
+else:
+    import pickle
+
+# Below this number of files to byte-compile, a process pool costs more than
+# it saves
+PARALLEL_COMPILE_THRESHOLD = 8
+
 class BuildEggCommand(Command):
     long_descr = """\
 Purpose: build egg
@@ -33,7 +56,12 @@ Usage:   bentomaker build_egg [OPTIONS]"""
                         + [Option("--output-dir",
                                   help="Output directory", default="dist"),
                            Option("--output-file",
-                                  help="Output filename")]
+                                  help="Output filename"),
+                           Option("-j", "--jobs",
+                                  help="Number of processes used to " \
+                                       "byte-compile python files (default: " \
+                                       "number of CPUs)",
+                                  type="int", dest="jobs")]
 
     def run(self, ctx):
         argv = ctx.command_argv
@@ -47,9 +75,102 @@ Usage:   bentomaker build_egg [OPTIONS]"""
 
         n = ctx.build_node.make_node(BUILD_MANIFEST_PATH)
         build_manifest = BuildManifest.from_file(n.abspath())
-        build_egg(build_manifest, ctx.build_node, ctx.build_node, output_dir, output_file)
+        build_egg(build_manifest, ctx.build_node, ctx.build_node, output_dir, output_file,
+                  jobs=o.jobs)
+
+def _bcompile_file(filename):
+    """Return (bytecode, error message) for the given python file."""
+    try:
+        return bcompile(filename), None
+    except PyCompileError:
+        e = extract_exception()
+        return None, str(e)
+
+class BytecodeCache(object):
+    """Cache of the bytecode of python files, stored in a directory with one
+    entry per source file.
+
+    An entry is only reused if the source signature (see file_signature) and
+    the magic number of the running interpreter are the ones it was created
+    with. A source whose stat metadata changed is compiled again even if its
+    content did not, the bytecode header containing its mtime."""
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _entry(self, filename):
+        name = md5(os.path.abspath(filename).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name)
 
-def build_egg(build_manifest, build_node, source_root, output_dir=None, output_file=None):
+    def get(self, filename):
+        """Return the cached bytecode for filename, or None."""
+        try:
+            fid = open(self._entry(filename), "rb")
+            try:
+                magic, r_signature, bytecode = pickle.load(fid)
+            finally:
+                fid.close()
+            if magic != MAGIC:
+                return None
+            signature = check_file_signature(filename, r_signature)
+        except Exception:
+            # Missing or invalid entry
+            return None
+        if signature is not r_signature:
+            return None
+        return bytecode
+
+    def set(self, filename, signature, bytecode):
+        entry = self._entry(filename)
+        bento.utils.path.ensure_dir(entry)
+        bento.utils.io2.safe_write(entry,
+                lambda fd: pickle.dump((MAGIC, signature, bytecode), fd))
+
+def compile_files(filenames, jobs=1, cache=None):
+    """Return a dictionary {filename: bytecode} for the given python files.
+
+    Files are compiled from up to jobs processes, and files which cannot be
+    compiled are left out with a warning. If cache is given (BytecodeCache
+    instance), unchanged files are not compiled again."""
+    ret = {}
+    missing = []
+    for f in filenames:
+        bytecode = None
+        if cache is not None:
+            bytecode = cache.get(f)
+        if bytecode is None:
+            missing.append(f)
+        else:
+            ret[f] = bytecode
+
+    # Signatures are taken before compiling, so that a file modified while
+    # being compiled is compiled again next time
+    signatures = [file_signature(f) for f in missing]
+    jobs = min(jobs, len(missing))
+    results = None
+    if multiprocessing is not None and jobs >= 2 \
+            and len(missing) >= PARALLEL_COMPILE_THRESHOLD:
+        try:
+            pool = multiprocessing.Pool(jobs)
+            try:
+                results = pool.map(_bcompile_file, missing)
+            finally:
+                pool.terminate()
+        except Exception:
+            results = None
+    if results is None:
+        results = [_bcompile_file(f) for f in missing]
+
+    for f, signature, (bytecode, error) in zip(missing, signatures, results):
+        if bytecode is None:
+            warnings.warn("Error byte-compiling %r (%s)" % (f, error))
+        else:
+            ret[f] = bytecode
+            if cache is not None:
+                cache.set(f, signature, bytecode)
+    return ret
+
+def build_egg(build_manifest, build_node, source_root, output_dir=None, output_file=None,
+              jobs=None):
     meta = PackageMetadata.from_build_manifest(build_manifest)
     egg_info = EggInfo.from_build_manifest(build_manifest, build_node)
 
@@ -70,22 +191,25 @@ def build_egg(build_manifest, build_node, source_root, output_dir=None, output_f
                   "eprefix": source_root.abspath(),
                   "sitedir": source_root.abspath()}
 
+    if jobs is None:
+        jobs = cpu_count()
+    files = list(build_manifest.iter_built_files(source_root, egg_scheme))
+    cache = BytecodeCache(build_node.make_node(BYTECODE_CACHE_DIR).abspath())
+    bytecodes = compile_files([source.abspath() for kind, source, target in files
+                               if kind == "pythonfiles"], jobs, cache)
+
     zid = compat.ZipFile(egg, "w", compat.ZIP_DEFLATED)
     try:
         for filename, cnt in egg_info.iter_meta(build_node):
             zid.writestr(os.path.join("EGG-INFO", filename), cnt)
 
-        for kind, source, target in build_manifest.iter_built_files(source_root, egg_scheme):
+        for kind, source, target in files:
             if not kind in ["executables"]:
                 zid.write(source.abspath(), target.path_from(source_root))
             if kind == "pythonfiles":
-                try:
-                    bytecode = bcompile(source.abspath())
-                except PyCompileError:
-                    e = extract_exception()
-                    warnings.warn("Error byte-compiling %r" % source.abspath())
-                else:
-                    zid.writestr("%sc" % target.path_from(source_root), bcompile(source.abspath()))
+                bytecode = bytecodes.get(source.abspath())
+                if bytecode is not None:
+                    zid.writestr("%sc" % target.path_from(source_root), bytecode)
     finally:
         zid.close()
 
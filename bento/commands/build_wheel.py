@@ -0,0 +1,210 @@
+import os
+import re
+import sys
+import base64
+import hashlib
+
+from distutils.util \
+    import \
+        get_platform
+from six.moves import cStringIO
+
+import bento
+
+from bento._config \
+    import \
+        BUILD_MANIFEST_PATH
+from bento.commands.core \
+    import \
+        Command, Option
+from bento.conv \
+    import \
+        write_pkg_info
+from bento.core \
+    import \
+        PackageMetadata
+from bento.core.platforms \
+    import \
+        get_scheme
+from bento.errors \
+    import \
+        InvalidPackage
+from bento.installed_package_description \
+    import \
+        BuildManifest
+from bento.utils.compress \
+    import \
+        ParallelZipFile
+import bento.utils.path
+
+try:
+    import sysconfig
+except ImportError:
+    sysconfig = None
+
+class BuildWheelCommand(Command):
+    long_descr = """\
+Purpose: build wheel
+Usage:   bentomaker build_wheel [OPTIONS]"""
+    short_descr = "build wheel."
+    common_options = Command.common_options \
+                        + [Option("--output-dir",
+                                  help="Output directory", default="dist"),
+                           Option("--output-file",
+                                  help="Output filename"),
+                           Option("-j", "--jobs",
+                                  help="Number of threads used to compress " \
+                                       "the wheel members",
+                                  type="int", dest="jobs", default=1)]
+
+    def run(self, ctx):
+        argv = ctx.command_argv
+        p = ctx.options_context.parser
+        o, a = p.parse_args(argv)
+        if o.help:
+            p.print_help()
+            return
+
+        n = ctx.build_node.make_node(BUILD_MANIFEST_PATH)
+        build_manifest = BuildManifest.from_file(n.abspath())
+        build_wheel(build_manifest, ctx.build_node, o.output_dir, o.output_file,
+                    jobs=o.jobs)
+
+def _escape(component):
+    return re.sub(r"[^\w\d.]+", "_", component)
+
+def wheel_dist_name(meta):
+    """Return the {distribution}-{version} part of the wheel names."""
+    return "%s-%s" % (_escape(meta.name), _escape(meta.version))
+
+def is_pure(build_manifest):
+    """Return True if the package does not contain any compiled code."""
+    for category in ["extensions", "compiled_libraries"]:
+        for section in build_manifest.file_sections.get(category, {}).values():
+            if section.files:
+                return False
+    return True
+
+def wheel_tags(pure):
+    """Return the (python, abi, platform) tags of a wheel for the running
+    interpreter."""
+    if pure:
+        return "py%d" % sys.version_info[0], "none", "any"
+
+    python_tag = "cp%d%d" % sys.version_info[:2]
+    abi_tag = "none"
+    if sysconfig is not None:
+        soabi = sysconfig.get_config_var("SOABI")
+        # e.g. cpython-311-x86_64-linux-gnu
+        if soabi and soabi.startswith("cpython-"):
+            abi_tag = "cp" + soabi.split("-")[1]
+    platform_tag = get_platform().replace("-", "_").replace(".", "_")
+    return python_tag, abi_tag, platform_tag
+
+def wheel_filename(meta, tags):
+    return "%s-%s.whl" % (wheel_dist_name(meta), "-".join(tags))
+
+def _record_hash(digest):
+    return "sha256=" + base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+class WheelFile(ParallelZipFile):
+    """Wheel archive being written.
+
+    The content of every member is read once, its RECORD hash being computed
+    while it is compressed."""
+    def __init__(self, filename, dist_info_dir):
+        super(WheelFile, self).__init__(filename)
+        self.dist_info_dir = dist_info_dir
+        self._record = []
+
+    def write_data(self, arcname, mode, mtime, data):
+        super(WheelFile, self).write_data(arcname, mode, mtime, data)
+        self._add_record(arcname, hashlib.sha256(data).digest(), len(data))
+
+    def write_deflated(self, arcname, mode, mtime, deflated):
+        super(WheelFile, self).write_deflated(arcname, mode, mtime, deflated)
+        digest, size = deflated[:2]
+        self._add_record(arcname, digest, size)
+
+    def _add_record(self, arcname, digest, size):
+        self._record.append("%s,%s,%d" % (arcname, _record_hash(digest), size))
+
+    def close(self):
+        """Write RECORD and close the archive."""
+        record = "%s/RECORD" % self.dist_info_dir
+        lines = self._record + ["%s,," % record, ""]
+        self.writestr(record, "\n".join(lines))
+        super(WheelFile, self).close()
+
+def _wheel_scheme(build_manifest, root, data_dir):
+    # Everything not in sitedir goes into the .data directory, the install
+    # scheme of the package deciding where it eventually goes
+    default_scheme = get_scheme(sys.platform)[0]
+    paths = {}
+    for k in build_manifest._path_variables:
+        if k in default_scheme:
+            paths[k] = default_scheme[k]
+    paths.update({"prefix": os.path.join(root, data_dir, "data"),
+                  "eprefix": os.path.join(root, data_dir, "data"),
+                  "bindir": os.path.join(root, data_dir, "scripts"),
+                  "sitedir": root})
+    return paths
+
+def _get_wheel_metadata(meta, executables, tags, pure):
+    tmp = cStringIO()
+    try:
+        write_pkg_info(meta, tmp)
+        metadata = tmp.getvalue()
+    finally:
+        tmp.close()
+
+    wheel = ["Wheel-Version: 1.0",
+             "Generator: bento (%s)" % bento.__version__,
+             "Root-Is-Purelib: %s" % (pure and "true" or "false"),
+             "Tag: %s" % "-".join(tags),
+             ""]
+    ret = [("METADATA", metadata), ("WHEEL", "\n".join(wheel))]
+
+    if executables:
+        entry_points = ["[console_scripts]"]
+        entry_points.extend([exe.full_representation() for exe in executables.values()])
+        entry_points.append("")
+        ret.append(("entry_points.txt", "\n".join(entry_points)))
+    return ret
+
+def build_wheel(build_manifest, source_root, output_dir=None, output_file=None, jobs=1):
+    meta = PackageMetadata.from_build_manifest(build_manifest)
+    pure = is_pure(build_manifest)
+    tags = wheel_tags(pure)
+
+    if output_dir is None:
+        output_dir = "dist"
+    if output_file is None:
+        output_file = wheel_filename(meta, tags)
+    wheel = os.path.join(output_dir, output_file)
+    bento.utils.path.ensure_dir(wheel)
+
+    dist_name = wheel_dist_name(meta)
+    dist_info_dir = "%s.dist-info" % dist_name
+    scheme = _wheel_scheme(build_manifest, source_root.abspath(), "%s.data" % dist_name)
+
+    files = []
+    for kind, source, target in build_manifest.iter_built_files(source_root, scheme):
+        # Scripts are generated from entry_points.txt when installing the
+        # wheel
+        if kind == "executables":
+            continue
+        arcname = target.path_from(source_root)
+        if arcname.startswith(os.pardir):
+            raise InvalidPackage("Target %r is outside of the wheel" % target.abspath())
+        files.append((source.abspath(), arcname.replace(os.sep, "/")))
+
+    zid = WheelFile(wheel, dist_info_dir)
+    try:
+        zid.write_files(files, jobs)
+        for name, content in _get_wheel_metadata(meta, build_manifest.executables, tags, pure):
+            zid.writestr("%s/%s" % (dist_info_dir, name), content)
+    finally:
+        zid.close()
+
+    return wheel
@@ -446,8 +446,8 @@ class HelpContext(CmdContext):
         super(HelpContext, self).__init__(*a, **kw)
         self.short_descriptions = {}
         for cmd_name in self._global_context.command_names(public_only=False):
-            cmd = self._global_context.retrieve_command(cmd_name)
-            self.short_descriptions[cmd_name] = cmd.short_descr
+            self.short_descriptions[cmd_name] = \
+                    self._global_context.retrieve_command_short_descr(cmd_name)
 
     def retrieve_options_context(self, cmd_name):
         return self._global_context.retrieve_options_context(cmd_name)
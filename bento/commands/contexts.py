@@ -3,7 +3,7 @@ from bento.commands.configure \
         _compute_scheme, set_scheme_options
 from bento.commands.registries \
     import \
-        CommandRegistry, ContextRegistry, OptionsRegistry
+        CommandRegistry, ContextRegistry, OptionsRegistry, Lazy
 from bento.commands.dependency \
     import \
         CommandScheduler
@@ -57,7 +57,8 @@ class GlobalContext(object):
         cmd_name: str
             name of the command
         cmd: object
-            instance from a subclass of Command
+            instance from a subclass of Command, or Lazy placeholder creating
+            it (see bento.commands.registries.lazy_command)
         """
         self._commands_registry.register(cmd_name, cmd, public)
 
@@ -65,6 +66,11 @@ class GlobalContext(object):
         """Return the command instance registered for the given command name."""
         return self._commands_registry.retrieve(cmd_name)
 
+    def retrieve_command_short_descr(self, cmd_name):
+        """Return the short description of the given command name, creating
+        the command only if needed."""
+        return self._commands_registry.retrieve_short_descr(cmd_name)
+
     def is_command_registered(self, cmd_name):
         """Return True if the command is registered."""
         return self._commands_registry.is_registered(cmd_name)
@@ -100,10 +106,22 @@ class GlobalContext(object):
         return self._options_registry.register(name, context)
 
     def register_options_context(self, cmd_name, context):
-        cmd = self.retrieve_command(cmd_name)
-        if self._package_options is not None and hasattr(cmd, "register_options"):
-            cmd.register_options(context, self._package_options)
-
+        """Register the options context of the given command.
+
+        context may be a Lazy placeholder, in which case neither the options
+        context nor the command are created until the options context is
+        retrieved."""
+        def _add_package_options(context):
+            cmd = self.retrieve_command(cmd_name)
+            if self._package_options is not None and hasattr(cmd, "register_options"):
+                cmd.register_options(context, self._package_options)
+            return context
+
+        if isinstance(context, Lazy):
+            factory = context.factory
+            context = Lazy(lambda: _add_package_options(factory()))
+        else:
+            _add_package_options(context)
         return self._options_registry.register(cmd_name, context)
 
     def retrieve_options_context(self, cmd_name):
@@ -33,6 +33,11 @@ Usage: command's usage (default description)
     def register_options(self, options_context, package_options=None):
         pass
 
+    def stored_argv(self, cmd_argv):
+        """Return the arguments stored to run the command again as a
+        dependency of another one (see run_with_dependencies)."""
+        return cmd_argv
+
     def finish(self, ctx):
         pass
 
@@ -1,18 +1,43 @@
 import os
+import stat
 import shutil
 import subprocess
 import errno
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 from bento._config \
     import \
-        BUILD_MANIFEST_PATH
+        BUILD_MANIFEST_PATH, INSTALL_RECORD_PATH
+from bento.errors \
+    import \
+        UsageException
 from bento.installed_package_description import \
     BuildManifest, iter_files
 
 from bento.commands.core import \
     Command, Option
+from bento.utils.records import \
+    PickledRecord, output_signature
 from bento.utils.utils import \
-    pprint, extract_exception, MODE_755, MODE_777
+    pprint, extract_exception, threaded_map, cpu_count, file_signature, \
+    check_file_signature, MODE_755, MODE_777
+
+LINK_MODES = ["copy", "hardlink", "reflink", "symlink"]
+
+# ioctl to share the extents of a file (linux/fs.h)
+_FICLONE = 0x40049409
+
+# errno values meaning a kernel-side copy or link is not possible between the
+# source and target (which are then copied normally)
+_UNSUPPORTED_ERRNOS = [getattr(errno, name) for name in \
+                       ["EXDEV", "ENOSYS", "EINVAL", "ENOTTY", "EOPNOTSUPP",
+                        "EPERM", "EMLINK", "EBADF"] \
+                       if hasattr(errno, name)]
 
 def _rollback_operation(line):
     operation, arg = line.split()
@@ -56,7 +81,7 @@ class TransactionLog(object):
         self.f = open(journal_filename, "w")
         self.journal_filename = journal_filename
 
-    def copy(self, source, target, category):
+    def copy(self, source, target, category, link_mode="copy"):
         if os.path.exists(target):
             self.rollback()
             raise ValueError("File %s already exists, rolled back installation" % target)
@@ -64,9 +89,7 @@ class TransactionLog(object):
         if not os.path.exists(d):
             self.makedirs(d)
         self.f.write("COPY %s\n" % target)
-        shutil.copy(source, target)
-        if category == "executables":
-            os.chmod(target, MODE_755)
+        install_file(source, target, category, link_mode)
 
     def makedirs(self, name, mode=MODE_777):
         head, tail = os.path.split(name)
@@ -108,6 +131,217 @@ def copy_installer(source, target, kind):
     if kind == "executables":
         os.chmod(target, MODE_755)
 
+def _copy_file_range(fsrc, fdst):
+    """Copy the content of the fsrc file object into fdst inside the kernel,
+    without going through user space buffers. Return False if this is not
+    supported."""
+    if not hasattr(os, "copy_file_range"):
+        return False
+    size = os.fstat(fsrc.fileno()).st_size
+    copied = 0
+    while copied < size:
+        try:
+            n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+        except OSError:
+            e = extract_exception()
+            if copied == 0 and e.errno in _UNSUPPORTED_ERRNOS:
+                return False
+            raise
+        if n == 0:
+            # The file shrank while being copied
+            break
+        copied += n
+    return True
+
+def _reflink(fsrc, fdst):
+    """Make fdst a copy-on-write clone of fsrc. Return False if the
+    filesystem does not support it."""
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        return True
+    except (IOError, OSError):
+        e = extract_exception()
+        if e.errno in _UNSUPPORTED_ERRNOS:
+            return False
+        raise
+
+def _copy(source, target, reflink=False):
+    fsrc = open(source, "rb")
+    try:
+        fdst = open(target, "wb")
+        try:
+            if not (reflink and _reflink(fsrc, fdst)) \
+                    and not _copy_file_range(fsrc, fdst):
+                shutil.copyfileobj(fsrc, fdst)
+        finally:
+            fdst.close()
+    finally:
+        fsrc.close()
+    shutil.copymode(source, target)
+
+def _link(link, source, target):
+    try:
+        link(source, target)
+        return True
+    except OSError:
+        e = extract_exception()
+        if e.errno in _UNSUPPORTED_ERRNOS:
+            return False
+        raise
+
+def install_file(source, target, kind, link_mode="copy"):
+    """Install source as target, the target directory being expected to
+    exist.
+
+    link_mode is one of LINK_MODES: targets are copied when the given mode is
+    not supported for this source and target."""
+    # Never write through an existing target, which may be a link to a file
+    # from a previous installation
+    try:
+        os.remove(target)
+    except OSError:
+        e = extract_exception()
+        if e.errno != errno.ENOENT:
+            raise
+
+    if kind == "executables" and link_mode in ["hardlink", "symlink"] \
+            and stat.S_IMODE(os.stat(source).st_mode) != MODE_755:
+        # A linked target shares the mode of its source, which must not be
+        # changed
+        link_mode = "copy"
+
+    linked = False
+    if link_mode == "copy":
+        _copy(source, target)
+    elif link_mode == "hardlink":
+        linked = _link(os.link, source, target)
+        if not linked:
+            _copy(source, target)
+    elif link_mode == "symlink":
+        linked = _link(os.symlink, os.path.abspath(source), target)
+        if not linked:
+            _copy(source, target)
+    elif link_mode == "reflink":
+        _copy(source, target, reflink=True)
+    else:
+        raise ValueError("Unknown link mode %r" % (link_mode,))
+
+    if kind == "executables" and not linked:
+        os.chmod(target, MODE_755)
+
+class InstallRecord(PickledRecord):
+    """Record of the files installed by incremental installs, for each
+    installation scheme.
+
+    For every target, the record keeps its kind, link mode and source, the
+    source (size, mtime, md5) when it was installed, and the target (size,
+    mtime) right after it was installed."""
+    def __init__(self, filename, scheme):
+        super(InstallRecord, self).__init__(filename)
+        items = list(scheme.items())
+        items.sort()
+        self._key = tuple(items)
+
+        # Targets of the previous install into the same scheme
+        self.entries = self.records.get(self._key, {})
+        # Targets of this install
+        self._installed = {}
+        self._lock = threading.Lock()
+
+    def is_up_to_date(self, kind, source, target, link_mode):
+        """Return True if target was installed from source by a previous
+        install, and neither was modified since."""
+        entry = self.entries.get(target)
+        if entry is None:
+            return False
+        r_kind, r_link_mode, r_source, r_source_sig, r_target_sig = entry
+        if (r_kind, r_link_mode, r_source) != (kind, link_mode, source):
+            return False
+        try:
+            if output_signature(target) != r_target_sig:
+                return False
+        except OSError:
+            return False
+
+        source_sig = check_file_signature(source, r_source_sig)
+        if source_sig is None:
+            return False
+        # The stat metadata are refreshed if only those changed
+        self._installed[target] = (kind, link_mode, source, source_sig, r_target_sig)
+        return True
+
+    def add(self, kind, source, target, link_mode, source_sig):
+        """Record target as installed from source, whose signature was taken
+        before installing it."""
+        entry = (kind, link_mode, source, source_sig, output_signature(target))
+        self._lock.acquire()
+        try:
+            self._installed[target] = entry
+        finally:
+            self._lock.release()
+
+    def remove_stale(self):
+        """Remove the targets of the previous install which are not installed
+        anymore, and return them. Targets modified since are kept."""
+        removed = []
+        for target, entry in self.entries.items():
+            if target in self._installed:
+                continue
+            try:
+                if output_signature(target) != entry[4]:
+                    pprint("YELLOW", "Not removing modified file %s" % target)
+                    continue
+                os.remove(target)
+                removed.append(target)
+            except OSError:
+                pass
+        return removed
+
+    def write(self):
+        self.records[self._key] = self._installed
+        super(InstallRecord, self).write()
+
+def unique_targets(files):
+    """Return the given (kind, source, target) files without the ones whose
+    target is the target of a later file (e.g. built files overridden by
+    source files), as if they were installed one after the other."""
+    last = {}
+    for i, (kind, source, target) in enumerate(files):
+        last[target] = i
+    return [f for i, f in enumerate(files) if last[f[2]] == i]
+
+def install_files(files, link_mode="copy", jobs=1, record=None):
+    """Install each of the given (kind, source, target) files.
+
+    Target directories are all created first, and files are then installed
+    from up to jobs threads. For a target given several times, the last file
+    wins. Installed files are added to record if given."""
+    files = unique_targets(files)
+    dirs = {}
+    for kind, source, target in files:
+        dirs[os.path.dirname(target)] = True
+    dirs = list(dirs.keys())
+    dirs.sort()
+    for d in dirs:
+        if not os.path.isdir(d):
+            try:
+                os.makedirs(d)
+            except OSError:
+                e = extract_exception()
+                if e.errno != errno.EEXIST:
+                    raise
+
+    def _install(f):
+        kind, source, target = f
+        if record is not None:
+            source_sig = file_signature(source)
+        install_file(source, target, kind, link_mode)
+        if record is not None:
+            record.add(kind, source, target, link_mode, source_sig)
+    threaded_map(_install, files, jobs)
+
 def unix_installer(source, target, kind):
     if kind in ["executables"]:
         mode = "755"
@@ -130,7 +364,22 @@ Usage:   bentomaker install [OPTIONS]."""
                                 help="Do a transaction-based install", action="store_true"),
                          Option("-n", "--dry-run", "--list-files",
                                 help="List installed files (do not install anything)",
-                                action="store_true", dest="list_files")]
+                                action="store_true", dest="list_files"),
+                         Option("--link-mode",
+                                help="How files are installed: %s (default: copy). " \
+                                     "Files are copied when the mode is not supported" \
+                                     % "|".join(LINK_MODES),
+                                type="choice", choices=LINK_MODES, default="copy",
+                                dest="link_mode"),
+                         Option("--incremental",
+                                help="Only install files changed since the last " \
+                                     "incremental install into the same scheme, and " \
+                                     "remove the files which are not installed anymore",
+                                action="store_true"),
+                         Option("-j", "--jobs",
+                                help="Number of files installed in parallel " \
+                                     "(default: number of CPUs)",
+                                type="int", dest="jobs")]
     def run(self, ctx):
         argv = ctx.command_argv
         p = ctx.options_context.parser
@@ -153,13 +402,30 @@ Usage:   bentomaker install [OPTIONS]."""
                 print(target.abspath())
             return
 
+        if o.transaction and o.incremental:
+            raise UsageException("--transaction and --incremental cannot be used together")
+
         if o.transaction:
             trans = TransactionLog("transaction.log")
             try:
                 for kind, source, target in iter_files(node_sections):
-                    trans.copy(source.abspath(), target.abspath(), kind)
+                    trans.copy(source.abspath(), target.abspath(), kind, o.link_mode)
             finally:
                 trans.close()
         else:
-            for kind, source, target in iter_files(node_sections):
-                copy_installer(source.abspath(), target.abspath(), kind)
+            if o.jobs is None:
+                jobs = cpu_count()
+            else:
+                jobs = o.jobs
+            files = unique_targets([(kind, source.abspath(), target.abspath()) \
+                                    for kind, source, target in iter_files(node_sections)])
+            if o.incremental:
+                record_node = ctx.build_node.make_node(INSTALL_RECORD_PATH)
+                record = InstallRecord(record_node.abspath(), scheme)
+                files = [(kind, source, target) for kind, source, target in files \
+                         if not record.is_up_to_date(kind, source, target, o.link_mode)]
+                install_files(files, o.link_mode, jobs, record)
+                record.remove_stale()
+                record.write()
+            else:
+                install_files(files, o.link_mode, jobs)
@@ -1,7 +1,44 @@
+import sys
+
 from bento.compat.api \
     import \
         defaultdict
 
+class Lazy(object):
+    """Placeholder which may be registered instead of a command, context
+    class or options context: the actual object is created by calling factory
+    when it is first retrieved from the registry."""
+    def __init__(self, factory):
+        self.factory = factory
+
+def _import_attribute(module_name, name):
+    __import__(module_name)
+    return getattr(sys.modules[module_name], name)
+
+class LazyCommand(Lazy):
+    """Placeholder for a command, which also knows the command short
+    description, so that the commands can be listed without creating them."""
+    def __init__(self, factory, short_descr=None):
+        super(LazyCommand, self).__init__(factory)
+        self.short_descr = short_descr
+
+def lazy_command(module_name, class_name, short_descr=None):
+    """Return a placeholder for the command class_name of the given module,
+    which is only imported (and instantiated) once the command is needed.
+
+    short_descr should be the short_descr of the command class, if it has
+    one."""
+    def _create():
+        return _import_attribute(module_name, class_name)()
+    return LazyCommand(_create, short_descr)
+
+def lazy_class(module_name, class_name):
+    """Return a placeholder for the class class_name of the given module
+    (e.g. a command context), which is only imported once needed."""
+    def _create():
+        return _import_attribute(module_name, class_name)
+    return Lazy(_create)
+
 class CommandRegistry(object):
     def __init__(self):
         # command line name -> command class
@@ -22,8 +59,18 @@ class CommandRegistry(object):
         if cmd_klass is None:
             raise ValueError("No command class registered for name %r" % name)
         else:
+            if isinstance(cmd_klass, Lazy):
+                cmd_klass = self._klasses[name] = cmd_klass.factory()
             return cmd_klass
 
+    def retrieve_short_descr(self, name):
+        """Return the short description of the given command, without
+        creating it if it is known beforehand."""
+        cmd_klass = self._klasses.get(name, None)
+        if isinstance(cmd_klass, LazyCommand) and cmd_klass.short_descr is not None:
+            return cmd_klass.short_descr
+        return self.retrieve(name).short_descr
+
     def is_registered(self, name):
         return name in self._klasses
 
@@ -58,6 +105,8 @@ class ContextRegistry(object):
             else:
                 return self._default
         else:
+            if isinstance(context, Lazy):
+                context = self._contexts[cmd_name] = context.factory()
             return context
 
 class OptionsRegistry(object):
@@ -80,6 +129,8 @@ class OptionsRegistry(object):
         if options_context is None:
             raise ValueError("No options context registered for cmd_name %r" % cmd_name)
         else:
+            if isinstance(options_context, Lazy):
+                options_context = self._contexts[cmd_name] = options_context.factory()
             return options_context
 
 class _Dummy(object):
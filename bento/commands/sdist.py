@@ -1,3 +1,4 @@
+import os
 import tarfile
 
 import os.path as op
@@ -5,12 +6,29 @@ import os.path as op
 import bento.compat.api as compat
 import bento.errors
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from bento._config \
+    import \
+        SDIST_RECORD_PATH
 from bento.commands.core \
     import \
         Command, Option
 from bento.conv \
     import \
         write_pkg_info
+from bento.utils.compress \
+    import \
+        ParallelZipFile, ParallelGzipWriter, ParallelXzWriter, normalized_mode
+from bento.utils.records \
+    import \
+        PickledRecord, output_signature
+from bento.utils.utils \
+    import \
+        pprint, file_signature, check_file_signature
 
 from six.moves \
     import \
@@ -22,33 +40,188 @@ def archive_basename(pkg):
     else:
         return pkg.name
 
-def create_tarball(node_pkg, archive_root, archive_node):
+# Modification time of the members of reproducible archives when
+# SOURCE_DATE_EPOCH is not set: 1980-01-01, the earliest date zip supports
+_REPRODUCIBLE_MTIME = 315532800
+
+def reproducible_mtime():
+    """Return the modification time used for the members of reproducible
+    archives (SOURCE_DATE_EPOCH if set, see reproducible-builds.org)."""
+    try:
+        return max(int(os.environ["SOURCE_DATE_EPOCH"]), _REPRODUCIBLE_MTIME)
+    except (KeyError, ValueError):
+        return _REPRODUCIBLE_MTIME
+
+def _archive_files(node_pkg, archive_root, reproducible):
+    files = [(filename, op.join(archive_root, alias))
+             for filename, alias in node_pkg.iter_source_files()]
+    if reproducible:
+        files.sort(key=lambda item: item[1])
+    return files
+
+def _add_reproducible(tf, filename, arcname, mtime):
+    tarinfo = tf.gettarinfo(filename, arcname)
+    tarinfo.mtime = mtime
+    tarinfo.uid = tarinfo.gid = 0
+    tarinfo.uname = tarinfo.gname = ""
+    if tarinfo.isreg():
+        tarinfo.mode = normalized_mode(tarinfo.mode)
+        fid = open(filename, "rb")
+        try:
+            tf.addfile(tarinfo, fid)
+        finally:
+            fid.close()
+    else:
+        tf.addfile(tarinfo)
+
+def _create_tar(files, fileobj, reproducible):
+    if reproducible:
+        tf = tarfile.open(mode="w|", fileobj=fileobj, format=tarfile.PAX_FORMAT)
+        mtime = reproducible_mtime()
+    else:
+        tf = tarfile.open(mode="w|", fileobj=fileobj)
+    try:
+        for filename, arcname in files:
+            if reproducible:
+                _add_reproducible(tf, filename, arcname, mtime)
+            else:
+                tf.add(filename, arcname)
+    finally:
+        tf.close()
+
+def _create_compressed_tar(files, archive_node, reproducible, create_writer):
+    fid = open(archive_node.abspath(), "wb")
+    try:
+        writer = create_writer(fid)
+        try:
+            _create_tar(files, writer, reproducible)
+        finally:
+            writer.close()
+    finally:
+        fid.close()
+
+def create_tarball(node_pkg, archive_root, archive_node, jobs=1, reproducible=False):
+    files = _archive_files(node_pkg, archive_root, reproducible)
+    # The block compression output does not depend on the number of jobs,
+    # and its gzip header does not contain the archive name
+    if jobs > 1 or reproducible:
+        if reproducible:
+            mtime = reproducible_mtime()
+        else:
+            mtime = None
+        return _create_compressed_tar(files, archive_node, reproducible,
+                lambda fid: ParallelGzipWriter(fid, jobs, mtime=mtime))
     tf = tarfile.open(archive_node.abspath(), "w:gz")
     try:
-        for filename, alias in node_pkg.iter_source_files():
-            tf.add(filename, op.join(archive_root, alias))
+        for filename, arcname in files:
+            tf.add(filename, arcname)
     finally:
         tf.close()
 
-def create_zarchive(node_pkg, archive_root, archive_node):
+def create_xztarball(node_pkg, archive_root, archive_node, jobs=1, reproducible=False):
+    files = _archive_files(node_pkg, archive_root, reproducible)
+    if jobs > 1 or reproducible:
+        return _create_compressed_tar(files, archive_node, reproducible,
+                lambda fid: ParallelXzWriter(fid, jobs))
+    tf = tarfile.open(archive_node.abspath(), "w:xz")
+    try:
+        for filename, arcname in files:
+            tf.add(filename, arcname)
+    finally:
+        tf.close()
+
+def create_zstdtarball(node_pkg, archive_root, archive_node, jobs=1, reproducible=False):
+    if zstandard is None:
+        raise bento.errors.UsageException("zstd format requires the zstandard package")
+    files = _archive_files(node_pkg, archive_root, reproducible)
+    # zstd output is the same for any number of worker threads, but differs
+    # from the single-threaded mode (threads=0)
+    if jobs > 1 or reproducible:
+        threads = max(jobs, 1)
+    else:
+        threads = 0
+    compressor = zstandard.ZstdCompressor(threads=threads)
+    _create_compressed_tar(files, archive_node, reproducible,
+            lambda fid: compressor.stream_writer(fid, closefd=False))
+
+def create_zarchive(node_pkg, archive_root, archive_node, jobs=1, reproducible=False):
+    files = _archive_files(node_pkg, archive_root, reproducible)
+    if jobs > 1 or reproducible:
+        if reproducible:
+            zid = ParallelZipFile(archive_node.abspath(), mtime=reproducible_mtime())
+        else:
+            zid = ParallelZipFile(archive_node.abspath())
+        try:
+            zid.write_files(files, jobs)
+        finally:
+            zid.close()
+        return
     zid = compat.ZipFile(archive_node.abspath(), "w", compat.ZIP_DEFLATED)
     try:
-        for filename, alias in node_pkg.iter_source_files():
-            zid.write(filename, op.join(archive_root, alias))
+        for filename, arcname in files:
+            zid.write(filename, arcname)
     finally:
         zid.close()
 
 _FORMATS = {"gztar": {"ext": ".tar.gz", "func": create_tarball},
+            "xztar": {"ext": ".tar.xz", "func": create_xztarball},
+            "zstd": {"ext": ".tar.zst", "func": create_zstdtarball},
             "zip": {"ext": ".zip", "func": create_zarchive}}
 
-def create_archive(archive_name, archive_root, node_pkg, top_node, run_node, format="tgz", output_directory="dist"):
+class SdistRecord(PickledRecord):
+    """Record of the archives generated by incremental sdists.
+
+    For every archive, the record keeps the options it was generated with,
+    its (filename, alias) source files with their signature (see
+    file_signature), and the archive (size, mtime) right after it was
+    generated."""
+    def is_up_to_date(self, archive, key, files):
+        """Return True if archive was generated with the same key from the
+        same (filename, alias) files, and neither was modified since."""
+        entry = self.records.get(archive)
+        if entry is None:
+            return False
+        r_key, r_archive_sig, r_files = entry
+        if r_key != key or [f[:2] for f in r_files] != list(files):
+            return False
+        try:
+            if output_signature(archive) != r_archive_sig:
+                return False
+        except OSError:
+            return False
+
+        new_files = []
+        updated = False
+        for filename, alias, signature in r_files:
+            new_signature = check_file_signature(filename, signature)
+            if new_signature is None:
+                return False
+            elif new_signature is not signature:
+                updated = True
+            new_files.append((filename, alias, new_signature))
+        if updated:
+            # Same content: only refresh the stat metadata
+            self.records[archive] = (key, r_archive_sig, new_files)
+            self.write()
+        return True
+
+    def source_signatures(self, files):
+        """Return the signatures of the given (filename, alias) files, to be
+        taken before the archive is generated."""
+        return [(filename, alias, file_signature(filename)) for filename, alias in files]
+
+    def add(self, archive, key, signatures):
+        self.records[archive] = (key, output_signature(archive), signatures)
+
+def create_archive(archive_name, archive_root, node_pkg, top_node, run_node, format="tgz", output_directory="dist",
+                   jobs=1, reproducible=False):
     if not format in _FORMATS:
         raise ValueError("Unknown format: %r" % (format,))
 
     archive_node = top_node.make_node(op.join(output_directory, archive_name))
     archive_node.parent.mkdir()
 
-    _FORMATS[format]["func"](node_pkg, archive_root, archive_node) 
+    _FORMATS[format]["func"](node_pkg, archive_root, archive_node, jobs, reproducible)
     return archive_root, archive_node
 
 class SdistCommand(Command):
@@ -60,7 +233,21 @@ Usage:   bentomaker sdist [OPTIONS]."""
                         + [Option("--output-dir",
                                   help="Output directory", default="dist"),
                            Option("--format",
-                                  help="Archive format (supported: 'gztar', 'zip')", default="gztar"),
+                                  help="Archive format (supported: 'gztar', 'xztar', 'zstd', 'zip')",
+                                  default="gztar"),
+                           Option("-j", "--jobs",
+                                  help="Number of threads used to compress the " \
+                                       "archive",
+                                  type="int", dest="jobs", default=1),
+                           Option("--reproducible",
+                                  help="Create a reproducible archive: sorted members, with " \
+                                       "normalized owner, permissions and modification time " \
+                                       "(SOURCE_DATE_EPOCH if set)",
+                                  action="store_true"),
+                           Option("--incremental",
+                                  help="Do not create the archive again if its sources did " \
+                                       "not change since the last incremental sdist",
+                                  action="store_true"),
                            Option("--output-file",
                                   help="Archive filename (default: $pkgname-$version.$archive_extension)")]
 
@@ -74,6 +261,8 @@ Usage:   bentomaker sdist [OPTIONS]."""
 
         pkg = ctx.pkg
         format = o.format
+        if not format in _FORMATS:
+            raise bento.errors.UsageException("Unknown archive format %r" % (format,))
 
         archive_root = "%s-%s" % (pkg.name, pkg.version)
         if not o.output_file:
@@ -91,7 +280,24 @@ Usage:   bentomaker sdist [OPTIONS]."""
         n.write(s.getvalue())
         ctx.register_source_node(n, "PKG_INFO")
 
+        if o.incremental:
+            archive_node = ctx.top_node.make_node(op.join(o.output_dir, archive_name))
+            files = list(ctx._node_pkg.iter_source_files())
+            key = (o.format, archive_root, o.reproducible)
+            if o.reproducible:
+                key += (reproducible_mtime(),)
+            record = SdistRecord(ctx.build_node.make_node(SDIST_RECORD_PATH).abspath())
+            if record.is_up_to_date(archive_node.abspath(), key, files):
+                pprint("GREEN", "%s is up to date" % archive_node.path_from(ctx.run_node))
+                self.archive_root, self.archive_node = archive_root, archive_node
+                return
+            signatures = record.source_signatures(files)
+
         # XXX: find a better way to pass archive name from other commands (used
         # by distcheck ATM)
         self.archive_root, self.archive_node = create_archive(archive_name, archive_root, ctx._node_pkg,
-                ctx.top_node, ctx.run_node, o.format, o.output_dir)
+                ctx.top_node, ctx.run_node, o.format, o.output_dir, o.jobs, o.reproducible)
+
+        if o.incremental:
+            record.add(self.archive_node.abspath(), key, signatures)
+            record.write()
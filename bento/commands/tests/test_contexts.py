@@ -1,8 +1,20 @@
 import sys
 
+from bento.commands.command_contexts \
+    import \
+        ConfigureContext
+from bento.commands.configure \
+    import \
+        ConfigureCommand
 from bento.commands.contexts \
     import \
         GlobalContext
+from bento.commands.options \
+    import \
+        OptionsContext
+from bento.commands.registries \
+    import \
+        Lazy, lazy_command, lazy_class
 from bento.compat.api.moves \
     import \
         unittest
@@ -44,3 +56,57 @@ Path: floupi
     Default: /yeah
 """)
         self._test(package_options, {"floupi": "/yeah"})
+
+class TestLazyRegistration(unittest.TestCase):
+    def setUp(self):
+        self.context = GlobalContext(None)
+
+    def test_command(self):
+        created = []
+        def _create():
+            created.append(True)
+            return ConfigureCommand()
+        self.context.register_command("configure", Lazy(_create))
+        self.assertTrue(self.context.is_command_registered("configure"))
+        self.assertEqual(created, [])
+
+        cmd = self.context.retrieve_command("configure")
+        self.assertTrue(isinstance(cmd, ConfigureCommand))
+        self.assertTrue(self.context.retrieve_command("configure") is cmd)
+        self.assertEqual(created, [True])
+
+    def test_lazy_command(self):
+        self.context.register_command("configure",
+                lazy_command("bento.commands.configure", "ConfigureCommand"))
+        self.assertTrue(isinstance(self.context.retrieve_command("configure"), ConfigureCommand))
+
+    def test_lazy_context(self):
+        self.context.register_command_context("configure",
+                lazy_class("bento.commands.command_contexts", "ConfigureContext"))
+        self.assertTrue(self.context.retrieve_command_context("configure") is ConfigureContext)
+
+    def test_options_context(self):
+        package_options = PackageOptions.from_string("""\
+Name: foo
+
+Flag: debug
+    Description: debug build
+    Default: false
+""")
+        self.context.register_package_options(package_options)
+        self.context.register_command("configure",
+                lazy_command("bento.commands.configure", "ConfigureCommand"))
+
+        created = []
+        def _create():
+            created.append(True)
+            return OptionsContext.from_command(self.context.retrieve_command("configure"))
+        self.context.register_options_context("configure", Lazy(_create))
+        self.assertTrue(self.context.is_options_context_registered("configure"))
+        self.assertEqual(created, [])
+
+        # Package options are added once the options context is created
+        options_context = self.context.retrieve_options_context("configure")
+        self.assertTrue(options_context.parser.has_option("--debug"))
+        self.assertTrue(self.context.retrieve_options_context("configure") is options_context)
+        self.assertEqual(created, [True])
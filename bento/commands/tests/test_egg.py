@@ -1,6 +1,12 @@
 import os
+import sys
 import shutil
+import struct
 import tempfile
+import time
+import warnings
+
+import mock
 
 from bento.compat.api.moves \
     import \
@@ -25,6 +31,10 @@ from bento.core.pkg_objects \
 from bento.commands.egg_utils \
     import \
         EggInfo
+from bento.commands.build_egg \
+    import \
+        BytecodeCache, compile_files
+import bento.commands.build_egg as build_egg
 
 DESCR = """\
 Name: Sphinx
@@ -161,3 +171,94 @@ Platform: UNKNOWN
         egg_info = self._prepare_egg_info()
         for name, content in egg_info.iter_meta(self.build_node):
             pass
+
+class TestCompileFiles(unittest.TestCase):
+    def setUp(self):
+        self.d = tempfile.mkdtemp()
+        self.cache = BytecodeCache(os.path.join(self.d, "cache"))
+        self.files = []
+        # Old enough for stat metadata to be trusted
+        t = time.time() - 3600
+        for name, content in [("foo.py", "a = 1\n"), ("bar.py", "b = 2\n")]:
+            f = os.path.join(self.d, name)
+            fid = open(f, "wt")
+            try:
+                fid.write(content)
+            finally:
+                fid.close()
+            os.utime(f, (t, t))
+            self.files.append(f)
+
+    def tearDown(self):
+        shutil.rmtree(self.d)
+
+    def _compiled_files(self, cache=None, magic=None):
+        p = mock.patch("bento.commands.build_egg._bcompile_file",
+                       mock.Mock(side_effect=build_egg._bcompile_file))
+        mocked = p.start()
+        try:
+            if magic is not None:
+                p_magic = mock.patch("bento.commands.build_egg.MAGIC", magic)
+                p_magic.start()
+                try:
+                    bytecodes = compile_files(self.files, 1, cache)
+                finally:
+                    p_magic.stop()
+            else:
+                bytecodes = compile_files(self.files, 1, cache)
+        finally:
+            p.stop()
+        self.assertEqual(sorted(bytecodes.keys()), sorted(self.files))
+        return [args[0] for args, kw in mocked.call_args_list]
+
+    def test_no_cache(self):
+        self.assertEqual(self._compiled_files(), self.files)
+        self.assertEqual(self._compiled_files(), self.files)
+
+    def test_cache(self):
+        self.assertEqual(self._compiled_files(self.cache), self.files)
+        self.assertEqual(self._compiled_files(self.cache), [])
+
+    def test_cache_modified(self):
+        self._compiled_files(self.cache)
+        fid = open(self.files[1], "wt")
+        try:
+            fid.write("b = 3\n")
+        finally:
+            fid.close()
+        t = time.time() - 1800
+        os.utime(self.files[1], (t, t))
+        self.assertEqual(self._compiled_files(self.cache), self.files[1:])
+
+    def test_cache_touched(self):
+        """Check the bytecode of a touched file has its new mtime in its
+        header."""
+        self._compiled_files(self.cache)
+        t = int(time.time()) - 1800
+        os.utime(self.files[1], (t, t))
+        self.assertEqual(self._compiled_files(self.cache), self.files[1:])
+
+        bytecode = compile_files(self.files[1:], 1, self.cache)[self.files[1]]
+        if sys.version_info >= (3, 7):
+            # PEP 552 flags come first
+            offset = 8
+        else:
+            offset = 4
+        self.assertEqual(struct.unpack("<I", bytecode[offset:offset+4])[0], t)
+
+    def test_cache_magic(self):
+        self._compiled_files(self.cache)
+        self.assertEqual(self._compiled_files(self.cache, magic="XXXX"), self.files)
+
+    def test_error(self):
+        fid = open(self.files[0], "wt")
+        try:
+            fid.write("a = \n")
+        finally:
+            fid.close()
+        warnings.simplefilter("ignore")
+        try:
+            bytecodes = compile_files(self.files, 1, self.cache)
+        finally:
+            warnings.resetwarnings()
+        self.assertEqual(list(bytecodes.keys()), self.files[1:])
@@ -1,8 +1,12 @@
 import os
+import stat
 import shutil
 import tempfile
+import time
 import os.path as op
 
+import mock
+
 from bento.compat.api.moves \
     import \
         unittest
@@ -28,7 +32,8 @@ from bento.commands.tests.utils \
         prepare_configure, prepare_build
 from bento.commands.install \
     import \
-        InstallCommand, TransactionLog, rollback_transaction
+        InstallCommand, TransactionLog, rollback_transaction, install_files, \
+        InstallRecord
 from bento.commands.options \
     import \
         OptionsContext
@@ -158,6 +163,133 @@ def write_simple_tree(base_dir):
         files.append(filename)
     return files
 
+class TestInstallFiles(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.files = write_simple_tree(op.join(self.base_dir, "src"))
+        self.target_prefix = op.join(self.base_dir, "foo")
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def _install(self, link_mode):
+        files = []
+        for i, source in enumerate(self.files):
+            target = op.join(self.target_prefix, "dir%d" % (i % 4), op.basename(source))
+            files.append((i == 0 and "executables" or "datafiles", source, target))
+        install_files(files, link_mode, 4)
+
+        for kind, source, target in files:
+            fid = open(target)
+            try:
+                self.assertEqual(fid.read(), "file %s" % op.basename(source)[3:-4])
+            finally:
+                fid.close()
+        return files
+
+    def test_copy(self):
+        files = self._install("copy")
+        self.assertTrue(os.access(files[0][2], os.X_OK))
+        # Reinstalling overwrites existing targets
+        self._install("copy")
+
+    def test_reflink(self):
+        self._install("reflink")
+
+    def test_hardlink(self):
+        files = self._install("hardlink")
+        if hasattr(os, "link"):
+            self.assertTrue(os.stat(files[1][2]).st_nlink > 1)
+
+    def test_symlink(self):
+        files = self._install("symlink")
+        if hasattr(os, "symlink"):
+            self.assertTrue(op.islink(files[1][2]))
+        # Copying over a symlinked target must not overwrite its source
+        self._install("copy")
+        self.assertFalse(op.islink(files[1][2]))
+
+    def test_linked_executable(self):
+        """Check installing an executable does not change the mode of its
+        source."""
+        mode = stat.S_IMODE(os.stat(self.files[0]).st_mode)
+        for link_mode in ["hardlink", "symlink"]:
+            files = self._install(link_mode)
+            self.assertEqual(stat.S_IMODE(os.stat(self.files[0]).st_mode), mode)
+            self.assertTrue(os.access(files[0][2], os.X_OK))
+
+    def test_duplicate_targets(self):
+        target = op.join(self.target_prefix, "foo.txt")
+        files = [("datafiles", source, target) for source in self.files]
+        for link_mode in ["copy", "hardlink", "symlink"]:
+            install_files(files, link_mode, 4)
+            fid = open(target)
+            try:
+                self.assertEqual(fid.read(), "file 24")
+            finally:
+                fid.close()
+
+class TestInstallRecord(unittest.TestCase):
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.files = write_simple_tree(op.join(self.base_dir, "src"))
+        # Old enough for stat metadata to be trusted
+        t = time.time() - 3600
+        for f in self.files:
+            os.utime(f, (t, t))
+        self.record_file = op.join(self.base_dir, "install_record.bin")
+        self.scheme = {"prefix": op.join(self.base_dir, "foo")}
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def _install(self, sources, scheme=None):
+        """Run an incremental install, and return the installed targets."""
+        if scheme is None:
+            scheme = self.scheme
+        files = [("datafiles", source, op.join(scheme["prefix"], op.basename(source))) \
+                 for source in sources]
+        record = InstallRecord(self.record_file, scheme)
+        files = [f for f in files if not record.is_up_to_date(f[0], f[1], f[2], "copy")]
+        install_files(files, "copy", 1, record)
+        record.remove_stale()
+        record.write()
+        return [op.basename(target) for kind, source, target in files]
+
+    def test_unchanged(self):
+        self.assertEqual(len(self._install(self.files)), len(self.files))
+        p = mock.patch("bento.utils.utils.file_checksum")
+        mocked = p.start()
+        try:
+            self.assertEqual(self._install(self.files), [])
+        finally:
+            p.stop()
+        self.assertFalse(mocked.called)
+
+    def test_changed(self):
+        self._install(self.files)
+        fid = open(self.files[3], "w")
+        try:
+            fid.write("modified")
+        finally:
+            fid.close()
+        # Same content, new mtime
+        os.utime(self.files[4], None)
+
+        self.assertEqual(self._install(self.files), [op.basename(self.files[3])])
+
+    def test_stale(self):
+        self._install(self.files)
+        self._install(self.files[1:])
+        self.assertFalse(op.exists(op.join(self.scheme["prefix"], op.basename(self.files[0]))))
+        self.assertTrue(op.exists(op.join(self.scheme["prefix"], op.basename(self.files[1]))))
+
+    def test_other_scheme(self):
+        self._install(self.files)
+        scheme = {"prefix": op.join(self.base_dir, "bar")}
+        self.assertEqual(len(self._install(self.files, scheme)), len(self.files))
+        self.assertEqual(self._install(self.files), [])
+
 class TestTransactionLog(unittest.TestCase):
     def setUp(self):
         self.base_dir = tempfile.mkdtemp()
@@ -1,9 +1,22 @@
 import os
 import os.path as op
+import time
 import tempfile
 import shutil
+import tarfile
 import zipfile
 
+try:
+    import lzma
+except ImportError:
+    lzma = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+import mock
+
 from bento.compat.api.moves \
     import \
         unittest
@@ -22,17 +35,19 @@ from bento.commands.command_contexts \
 from bento.commands.sdist \
     import \
         SdistCommand
+import bento.commands.sdist
 from bento.commands.wrapper_utils \
     import \
         run_command_in_context
 from bento.core.testing \
     import \
-        create_fake_package_from_bento_infos, create_fake_package_from_bento_info
+        create_fake_package_from_bento_infos, create_fake_package_from_bento_info, \
+        skip_if
 from bento.convert.utils \
     import \
         canonalize_path
 
-class TestBaseSdist(unittest.TestCase):
+class _SdistTestCase(unittest.TestCase):
     def setUp(self):
         self.save = os.getcwd()
         self.d = tempfile.mkdtemp()
@@ -50,6 +65,7 @@ class TestBaseSdist(unittest.TestCase):
         os.chdir(self.save)
         shutil.rmtree(self.d)
 
+class TestBaseSdist(_SdistTestCase):
     def _assert_archive_equality(self, archive, r_archive_list):
         r_archive_list = set(canonalize_path(f) for f in r_archive_list)
         archive = self.run_node.find_node(archive)
@@ -170,3 +186,147 @@ VERSION = $VERSION
         run_command_in_context(context, sdist)
 
         self._assert_archive_equality(op.join("dist", "foo.zip"), archive_list)
+
+class _FormatsTestCase(_SdistTestCase):
+    bento_info = """\
+Name: foo
+Version: 1.0
+
+ExtraSourceFiles: data.bin
+
+Library:
+    Modules: fubar
+"""
+
+    def _run_sdist(self, format, ext, jobs, extra_argv=None):
+        create_fake_package_from_bento_info(self.top_node, self.bento_info)
+        # Large enough to be compressed as several blocks
+        data = "".join(["%d\n" % i for i in range(100000)])
+        self.top_node.make_node("data.bin").write(data)
+        package = PackageDescription.from_string(self.bento_info)
+
+        sdist = SdistCommand()
+        opts = OptionsContext.from_command(sdist)
+        cmd_argv = ["--output-file=foo%s" % ext, "--format=%s" % format, "-j", str(jobs)]
+        if extra_argv:
+            cmd_argv.extend(extra_argv)
+
+        context = SdistContext(None, cmd_argv, opts, package, self.run_node)
+        run_command_in_context(context, sdist)
+        return self.run_node.find_node(op.join("dist", "foo%s" % ext)).abspath(), data
+
+    def _assert_tarball(self, archive, data):
+        tf = tarfile.open(archive)
+        try:
+            self.assertEqual(sorted(tf.getnames()),
+                             sorted([op.join("foo-1.0", f) for f in ["PKG_INFO", "data.bin", "fubar.py"]]))
+            self.assertEqual(tf.extractfile("foo-1.0/data.bin").read().decode("ascii"), data)
+        finally:
+            tf.close()
+
+class TestSdistFormats(_FormatsTestCase):
+    def test_gztar(self):
+        for jobs in [1, 4]:
+            archive, data = self._run_sdist("gztar", ".tar.gz", jobs)
+            self._assert_tarball(archive, data)
+
+    @skip_if(lzma is None, "lzma not available")
+    def test_xztar(self):
+        for jobs in [1, 4]:
+            archive, data = self._run_sdist("xztar", ".tar.xz", jobs)
+            self._assert_tarball(archive, data)
+
+    @skip_if(zstandard is None, "zstandard not available")
+    def test_zstd(self):
+        archive, data = self._run_sdist("zstd", ".tar.zst", 4)
+        fid = open(archive, "rb")
+        try:
+            reader = zstandard.ZstdDecompressor().stream_reader(fid)
+            tf = tarfile.open(fileobj=reader, mode="r|")
+            try:
+                names = [m.name for m in tf]
+            finally:
+                tf.close()
+        finally:
+            fid.close()
+        self.assertTrue("foo-1.0/data.bin" in names)
+
+    def test_zip(self):
+        archive, data = self._run_sdist("zip", ".zip", 4)
+        z = zipfile.ZipFile(archive)
+        try:
+            self.assertEqual(z.testzip(), None)
+            self.assertEqual(z.read("foo-1.0/data.bin").decode("ascii"), data)
+        finally:
+            z.close()
+
+class TestReproducibleSdist(_FormatsTestCase):
+    def _read(self, archive):
+        fid = open(archive, "rb")
+        try:
+            return fid.read()
+        finally:
+            fid.close()
+
+    def _run_sdist_twice(self, format, ext):
+        archive, data = self._run_sdist(format, ext, 1, ["--reproducible"])
+        first = self._read(archive)
+        os.remove(archive)
+
+        t = time.time() - 3600
+        os.utime(self.top_node.find_node("fubar.py").abspath(), (t, t))
+        archive, data = self._run_sdist(format, ext, 4, ["--reproducible"])
+        return first, self._read(archive)
+
+    def test_gztar(self):
+        first, second = self._run_sdist_twice("gztar", ".tar.gz")
+        self.assertEqual(first, second)
+
+    @skip_if(lzma is None, "lzma not available")
+    def test_xztar(self):
+        first, second = self._run_sdist_twice("xztar", ".tar.xz")
+        self.assertEqual(first, second)
+
+    def test_zip(self):
+        first, second = self._run_sdist_twice("zip", ".zip")
+        self.assertEqual(first, second)
+
+    def test_sorted(self):
+        archive, data = self._run_sdist("gztar", ".tar.gz", 1, ["--reproducible"])
+        tf = tarfile.open(archive)
+        try:
+            names = tf.getnames()
+            self.assertEqual(names, sorted(names))
+            for member in tf.getmembers():
+                self.assertEqual((member.uid, member.gid, member.mtime), (0, 0, 315532800))
+        finally:
+            tf.close()
+
+class TestIncrementalSdist(_FormatsTestCase):
+    def _created(self, cmd_argv=None):
+        if cmd_argv is None:
+            cmd_argv = []
+        p = mock.patch("bento.commands.sdist.create_archive",
+                       mock.Mock(side_effect=bento.commands.sdist.create_archive))
+        mocked = p.start()
+        try:
+            self._run_sdist("gztar", ".tar.gz", 1, ["--incremental"] + cmd_argv)
+        finally:
+            p.stop()
+        return mocked.called
+
+    def test_unchanged(self):
+        self.assertTrue(self._created())
+        self.assertFalse(self._created())
+        # Different options
+        self.assertTrue(self._created(["--reproducible"]))
+
+    def test_modified(self):
+        self.assertTrue(self._created())
+        self.bento_info = self.bento_info.replace("Modules: fubar", "Modules: fubar, foo")
+        self.assertTrue(self._created())
+
+    def test_archive_removed(self):
+        self.assertTrue(self._created())
+        os.remove(os.path.join(self.d, "dist", "foo.tar.gz"))
+        self.assertTrue(self._created())
@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+import zipfile
+import hashlib
+import base64
+
+import os.path as op
+
+from bento.commands.build_wheel \
+    import \
+        build_wheel, is_pure, wheel_tags
+from bento.compat.api.moves \
+    import \
+        unittest
+from bento.core.node \
+    import \
+        create_base_nodes
+from bento.core.pkg_objects \
+    import \
+        Executable
+from bento.installed_package_description \
+    import \
+        BuildManifest, InstalledSection
+
+class TestBuildWheel(unittest.TestCase):
+    def setUp(self):
+        self.old_dir = None
+        self.tmpdir = None
+
+        self.old_dir = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+
+        try:
+            self.top_node, self.build_node, self.run_node = \
+                    create_base_nodes(self.tmpdir, op.join(self.tmpdir, "build"))
+            os.chdir(self.tmpdir)
+        except:
+            shutil.rmtree(self.tmpdir)
+            raise
+
+    def tearDown(self):
+        os.chdir(self.old_dir)
+        shutil.rmtree(self.tmpdir)
+
+    def _create_build_manifest(self, n_modules=10):
+        files = ["foo/__init__.py"] + ["foo/m%d.py" % i for i in range(n_modules)]
+        for f in files:
+            n = self.build_node.make_node(f)
+            n.parent.mkdir()
+            n.write("a = %r\n" % f)
+        data = self.build_node.make_node("data/foo.dat")
+        data.parent.mkdir()
+        data.write("data")
+
+        sections = {
+            "pythonfiles": {"foo": InstalledSection.from_source_target_directories(
+                "pythonfiles", "foo", "$_srcrootdir", "$sitedir", files)},
+            "datafiles": {"data": InstalledSection.from_source_target_directories(
+                "datafiles", "data", "$_srcrootdir/data", "$datadir", ["foo.dat"])}}
+        executables = {"foo-cli": Executable.from_representation("foo-cli = foo.m0:main")}
+        return BuildManifest(sections, {"name": "foo", "version": "1.0"}, executables)
+
+    def _check_record(self, wheel):
+        fp = zipfile.ZipFile(wheel)
+        try:
+            record = fp.read("foo-1.0.dist-info/RECORD").decode("utf-8")
+            entries = [line.rsplit(",", 2) for line in record.splitlines()]
+            self.assertEqual(sorted([e[0] for e in entries]), sorted(fp.namelist()))
+            for name, h, size in entries:
+                if name == "foo-1.0.dist-info/RECORD":
+                    self.assertEqual((h, size), ("", ""))
+                else:
+                    content = fp.read(name)
+                    digest = base64.urlsafe_b64encode(hashlib.sha256(content).digest())
+                    self.assertEqual(h, "sha256=" + digest.decode("ascii").rstrip("="))
+                    self.assertEqual(int(size), len(content))
+            return fp.namelist()
+        finally:
+            fp.close()
+
+    def test_simple(self):
+        build_manifest = self._create_build_manifest()
+        wheel = build_wheel(build_manifest, self.build_node, "dist", jobs=1)
+        self.assertEqual(os.path.basename(wheel), "foo-1.0-%s.whl" % "-".join(wheel_tags(True)))
+
+        names = self._check_record(wheel)
+        self.assertTrue("foo/m0.py" in names)
+        self.assertTrue("foo-1.0.data/data/share/foo.dat" in names)
+        self.assertTrue("foo-1.0.dist-info/METADATA" in names)
+        self.assertTrue("foo-1.0.dist-info/entry_points.txt" in names)
+
+        fp = zipfile.ZipFile(wheel)
+        try:
+            self.assertEqual(fp.read("foo/m3.py").decode("ascii"), "a = 'foo/m3.py'\n")
+            self.assertTrue("Root-Is-Purelib: true" in fp.read("foo-1.0.dist-info/WHEEL").decode("ascii"))
+        finally:
+            fp.close()
+
+    def test_parallel(self):
+        build_manifest = self._create_build_manifest(n_modules=50)
+        wheel = build_wheel(build_manifest, self.build_node, "dist", jobs=4)
+        self.assertEqual(len(self._check_record(wheel)), 51 + 1 + 4)
+
+    def test_is_pure(self):
+        self.assertTrue(is_pure(self._create_build_manifest()))
@@ -9,7 +9,7 @@ from bento.pypi.register_utils \
         DEFAULT_REPOSITORY, PyPIConfig
 from bento.pypi.upload_utils \
     import \
-        upload
+        upload, UploadConnection
 
 import bento.errors
 
@@ -18,7 +18,7 @@ _SUPPORTED_DISTRIBUTIONS = {"source": "sdist", "egg": "bdist_egg"}
 class UploadPyPI(Command):
     long_descr = """\
 Purpose: register the package to pypi
-Usage: bentomaker register [OPTIONS] distribution_file"""
+Usage: bentomaker register [OPTIONS] distribution_file [distribution_file ...]"""
     short_descr = "register packages to pypi."
     common_options = Command.common_options \
                         + [Option("-r", "--repository",
@@ -39,7 +39,7 @@ Usage: bentomaker register [OPTIONS] distribution_file"""
             # FIXME
             raise NotImplementedError("expected file argument")
         else:
-            filename = a[0]
+            filenames = a
 
         if o.repository and (o.username or o.password or o.repository_url):
             raise bento.errors.UsageException(
@@ -63,4 +63,11 @@ Usage: bentomaker register [OPTIONS] distribution_file"""
                  ", ".join(repr(i) for i in _SUPPORTED_DISTRIBUTIONS)))
 
         upload_type = _SUPPORTED_DISTRIBUTIONS[o.distribution_type]
-        upload(filename, upload_type, context.pkg, config=config)
+        # Every file is uploaded through the same connection
+        connection = UploadConnection(config.repository)
+        try:
+            for filename in filenames:
+                upload(filename, upload_type, context.pkg, config=config,
+                       connection=connection)
+        finally:
+            connection.close()
@@ -8,6 +8,8 @@ from bento.commands.hooks \
     import \
         create_hook_module
 
+import bento.utils.trace as trace
+
 def run_with_dependencies(global_context, cmd_name, cmd_argv, run_node, top_node, package):
     """Run the given command, including its dependencies as defined in the
     global_context."""
@@ -29,7 +31,11 @@ def resolve_and_run_command(global_context, cmd_name, cmd_argv, run_node, packag
     pre_hooks = global_context.retrieve_pre_hooks(cmd_name)
     post_hooks = global_context.retrieve_post_hooks(cmd_name)
 
-    run_command_in_context(context, cmd, pre_hooks, post_hooks)
+    span = trace.begin(cmd_name, "command", {"argv": cmd_argv})
+    try:
+        run_command_in_context(context, cmd, pre_hooks, post_hooks)
+    finally:
+        trace.end(span)
 
     return cmd, context
 
@@ -43,41 +49,53 @@ def run_command_in_context(context, cmd, pre_hooks=None, post_hooks=None):
     top_node = context.top_node
     cmd_funcs = [(cmd.run, top_node.abspath())]
 
-    def _run_hooks(hooks):
+    def _run_hooks(hooks, kind):
         for hook in hooks:
             local_node = top_node.find_dir(relpath(hook.local_dir, top_node.abspath()))
             context.pre_recurse(local_node)
+            span = trace.begin(hook.name, kind, {"local_dir": hook.local_dir})
             try:
                 hook(context)
             finally:
+                trace.end(span)
                 context.post_recurse()
 
     context.init()
     try:
         cmd.init(context)
 
-        _run_hooks(pre_hooks)
+        _run_hooks(pre_hooks, "pre_hook")
 
-        context.configure()
+        span = trace.begin("configure", "context")
+        try:
+            context.configure()
+        finally:
+            trace.end(span)
 
         while cmd_funcs:
             cmd_func, local_dir = cmd_funcs.pop(0)
             local_node = top_node.find_dir(relpath(local_dir, top_node.abspath()))
             context.pre_recurse(local_node)
+            span = trace.begin("run", "command")
             try:
                 cmd_func(context)
             finally:
+                trace.end(span)
                 context.post_recurse()
 
-        _run_hooks(post_hooks)
+        _run_hooks(post_hooks, "post_hook")
 
         cmd.finish(context)
     finally:
-        context.finish()
+        span = trace.begin("finish", "context")
+        try:
+            context.finish()
+        finally:
+            trace.end(span)
 
     return cmd, context
 
-def set_main(pkg, top_node, build_node):
+def set_main(pkg, top_node, build_node, create_module=create_hook_module):
     modules = []
     hook_files = pkg.hook_files
     for name, spkg in pkg.subpackages.items():
@@ -88,5 +106,5 @@ def set_main(pkg, top_node, build_node):
         hook_node = top_node.make_node(f)
         if hook_node is None or not os.path.exists(hook_node.abspath()):
             raise ValueError("Hook file %s not found" % f)
-        modules.append(create_hook_module(hook_node.abspath()))
+        modules.append(create_module(hook_node.abspath()))
     return modules
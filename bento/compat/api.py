@@ -31,11 +31,11 @@ if sys.version_info < (2, 6, 0):
     # own copy
     from bento.compat._zipfile \
         import \
-            ZipFile, ZIP_DEFLATED
+            ZipFile, ZipInfo, ZIP_DEFLATED
 else:
     from zipfile \
         import \
-            ZipFile, ZIP_DEFLATED
+            ZipFile, ZipInfo, ZIP_DEFLATED
 
 if sys.version_info < (2, 6, 0):
     import simplejson as json
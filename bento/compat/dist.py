@@ -1,5 +1,5 @@
+import os
 import sys
-import distutils.dist 
 
 from distutils.util \
     import \
@@ -98,7 +98,7 @@ class _DistributionMetadata:
     def _encode_field(self, value):
         if value is None:
             return None
-        if isinstance(value, unicode):
+        if sys.version_info[0] < 3 and isinstance(value, unicode):
             return value.encode(PKG_INFO_ENCODING)
         return str(value)
 
@@ -189,7 +189,7 @@ class _DistributionMetadata:
             distutils.versionpredicate.VersionPredicate(v)
         self.obsoletes = value
 
-if sys.version_info[0] < 3:
-    DistributionMetadata = _DistributionMetadata
-else:
-    DistributionMetadata = distutils.dist.DistributionMetadata
+# distutils.dist.DistributionMetadata is not used on python 3 either, as
+# setuptools replaces its write_pkg_file with one expecting setuptools-only
+# attributes
+DistributionMetadata = _DistributionMetadata
@@ -8,7 +8,7 @@ efficient.
 Ripped off from waf (v 1.6), by Thomas Nagy. The cool design is his, bugs most
 certainly mine :) We removed a few things which are not useful for bento.
 """
-import os, shutil, re, sys, errno
+import os, shutil, re, sys, errno, time
 
 import os.path as op
 
@@ -83,8 +83,83 @@ if sys.platform == 'cygwin':
 elif sys.platform == 'win32':
     split_path = split_path_win32
 
+try:
+    _scandir = os.scandir
+except AttributeError:
+    _scandir = None
+
+# A directory modified less than _RACY_DELAY seconds before being listed may be
+# modified again without any change in its mtime
+_RACY_DELAY = 2
+
+def _read_dir(path):
+    """Return the sorted list of (name, isdir) for each entry of the given
+    directory."""
+    if _scandir is not None:
+        # Entry types come with the directory listing on most platforms
+        entries = [(e.name, e.is_dir()) for e in _scandir(path)]
+    else:
+        entries = [(name, op.isdir(op.join(path, name))) for name in os.listdir(path)]
+    entries.sort()
+    return entries
+
+_PATTERNS_CACHE = {}
+
+def _to_pat(s):
+    """Compile the given ant patterns (cached)."""
+    if is_string(s):
+        key = s
+    else:
+        key = tuple(s)
+    try:
+        return _PATTERNS_CACHE[key]
+    except KeyError:
+        pass
+
+    lst = to_list(s)
+    ret = []
+    for x in lst:
+        x = x.replace('\\', '/').replace('//', '/')
+        if x.endswith('/'):
+            x += '**'
+        lst2 = x.split('/')
+        accu = []
+        for k in lst2:
+            if k == '**':
+                accu.append(k)
+            else:
+                k = k.replace('.', '[.]').replace('*','.*').replace('?', '.').replace('+', '\\+')
+                k = '^%s$' % k
+                accu.append(re.compile(k))
+        ret.append(accu)
+    _PATTERNS_CACHE[key] = ret
+    return ret
+
+def _filtre(name, nn):
+    ret = []
+    for lst in nn:
+        if not lst:
+            pass
+        elif lst[0] == '**':
+            ret.append(lst)
+            if len(lst) > 1:
+                if lst[1].match(name):
+                    ret.append(lst[2:])
+            else:
+                ret.append([])
+        elif lst[0].match(name):
+            ret.append(lst[1:])
+    return ret
+
+def _accept(name, pats):
+    nacc = _filtre(name, pats[0])
+    nrej = _filtre(name, pats[1])
+    if [] in nrej:
+        nacc = []
+    return [nacc, nrej]
+
 class Node(object):
-    __slots__ = ('name', 'sig', 'children', 'parent', 'cache_abspath', 'cache_isdir')
+    __slots__ = ('name', 'sig', 'children', 'parent', 'cache_abspath', 'cache_isdir', 'cache_dirent')
     def __init__(self, name, parent):
         self.name = name
         self.parent = parent
@@ -175,6 +250,25 @@ class Node(object):
         "list the directory contents"
         return os.listdir(self.abspath())
 
+    def listdir_types(self):
+        """Return the sorted list of (name, isdir) for each entry of the
+        directory.
+
+        The listing is kept on the node, and only read again once the directory
+        mtime changes, so that it is shared by every ant_glob call."""
+        path = self.abspath()
+        mtime = os.stat(path).st_mtime
+        cached = getattr(self, 'cache_dirent', None)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        entries = _read_dir(path)
+        if time.time() - mtime >= _RACY_DELAY:
+            self.cache_dirent = (mtime, entries)
+        else:
+            self.cache_dirent = None
+        return entries
+
     def mkdir(self):
         "write a directory for the node"
         if getattr(self, 'cache_isdir', None):
@@ -357,25 +451,23 @@ class Node(object):
         :param remove: remove files/folders that do not exist (True by default)
         :type remove: bool
         """
-        dircont = self.listdir()
-        dircont.sort()
+        entries = self.listdir_types()
 
         try:
             lst = set(self.children.keys())
             if remove:
-                for x in lst - set(dircont):
+                for x in lst - set([name for name, isdir in entries]):
                     del self.children[x]
         except:
             self.children = {}
 
-        for name in dircont:
+        for name, isdir in entries:
             npats = accept(name, pats)
             if npats and npats[0]:
                 accepted = [] in npats[0]
 
                 node = self.make_node([name])
 
-                isdir = os.path.isdir(node.abspath())
                 if accepted:
                     if isdir:
                         if dir:
@@ -389,7 +481,6 @@ class Node(object):
                     if maxdepth:
                         for k in node._ant_iter(accept=accept, maxdepth=maxdepth - 1, pats=npats, dir=dir, src=src):
                             yield k
-        raise StopIteration
 
     def ant_glob(self, *k, **kw):
         """
@@ -430,49 +521,7 @@ class Node(object):
         excl = kw.get('excl', exclude_regs)
         incl = k and k[0] or kw.get('incl', '**')
 
-        def to_pat(s):
-            lst = to_list(s)
-            ret = []
-            for x in lst:
-                x = x.replace('\\', '/').replace('//', '/')
-                if x.endswith('/'):
-                    x += '**'
-                lst2 = x.split('/')
-                accu = []
-                for k in lst2:
-                    if k == '**':
-                        accu.append(k)
-                    else:
-                        k = k.replace('.', '[.]').replace('*','.*').replace('?', '.').replace('+', '\\+')
-                        k = '^%s$' % k
-                        accu.append(re.compile(k))
-                ret.append(accu)
-            return ret
-
-        def filtre(name, nn):
-            ret = []
-            for lst in nn:
-                if not lst:
-                    pass
-                elif lst[0] == '**':
-                    ret.append(lst)
-                    if len(lst) > 1:
-                        if lst[1].match(name):
-                            ret.append(lst[2:])
-                    else:
-                        ret.append([])
-                elif lst[0].match(name):
-                    ret.append(lst[1:])
-            return ret
-
-        def accept(name, pats):
-            nacc = filtre(name, pats[0])
-            nrej = filtre(name, pats[1])
-            if [] in nrej:
-                nacc = []
-            return [nacc, nrej]
-
-        ret = [x for x in self._ant_iter(accept=accept, pats=[to_pat(incl), to_pat(excl)], maxdepth=25, dir=dir, src=src, remove=kw.get('remove', True))]
+        ret = [x for x in self._ant_iter(accept=_accept, pats=[_to_pat(incl), _to_pat(excl)], maxdepth=25, dir=dir, src=src, remove=kw.get('remove', True))]
         if kw.get('flat', False):
             return ' '.join([x.path_from(self) for x in ret])
 
@@ -1,5 +1,10 @@
 import os
 
+try:
+    import multiprocessing
+except ImportError:
+    multiprocessing = None
+
 from copy \
     import \
         deepcopy
@@ -25,6 +30,9 @@ from bento.core.parse_helpers \
 from bento.errors \
     import \
         InvalidPackage, InternalBentoError
+from bento.utils.utils \
+    import \
+        cpu_count
 import bento.utils.path
 
 def _parse_libraries(libraries):
@@ -49,32 +57,80 @@ def _parse_libraries(libraries):
                     CompiledLibrary.from_parse_dict(v)
     return ret
 
-def recurse_subentos(subentos, source_dir):
+# Minimum number of bento.info to parse at once for a process pool to be worth
+# its startup cost
+PARALLEL_PARSE_THRESHOLD = 8
+
+def _raw_parse_file(filename):
+    fid = open(filename)
+    try:
+        return raw_parse(fid.read(), filename)
+    finally:
+        fid.close()
+
+def raw_parse_files(filenames):
+    """Return the raw parsed dictionary of each of the given bento.info files,
+    parsing them concurrently if there are enough of them."""
+    jobs = min(cpu_count(), len(filenames))
+    if multiprocessing is None or jobs < 2 \
+            or len(filenames) < PARALLEL_PARSE_THRESHOLD:
+        return [_raw_parse_file(f) for f in filenames]
+
+    try:
+        pool = multiprocessing.Pool(jobs)
+        try:
+            return pool.map(_raw_parse_file, filenames)
+        finally:
+            pool.terminate()
+    except Exception:
+        # Parse errors are reported by parsing again in this process, as
+        # exceptions do not always survive the trip back from the workers
+        return [_raw_parse_file(f) for f in filenames]
+
+def recurse_subentos(subentos, source_dir, parse_files=None):
+    """Return the subpackages of the given subentos (recursively), and the
+    files they depend on.
+
+    parse_files is the function used to parse a list of bento.info files (see
+    raw_parse_files)."""
+    if parse_files is None:
+        parse_files = raw_parse_files
+
+    # Parse every subento first, one level of recursion at a time, so that
+    # the subentos of a same level are parsed together
+    parsed = {}
+    level = [os.path.normpath(os.path.join(source_dir, s)) for s in subentos]
+    while level:
+        infos = []
+        for d in level:
+            f = os.path.join(d, "bento.info")
+            if not os.path.exists(f):
+                raise ValueError("%s not found !" % f)
+            if not (f in parsed or f in infos):
+                infos.append(f)
+        level = []
+        for f, d in zip(infos, parse_files(infos)):
+            kw, children = raw_to_subpkg_kw(d)
+            parsed[f] = (kw, children)
+            level.extend([os.path.normpath(os.path.join(os.path.dirname(f), s)) \
+                          for s in children])
+
     filenames = []
     subpackages = {}
 
-    # FIXME: this is damn ugly - using nodes would be good here
     def _recurse(subento, cwd):
-        f = os.path.normpath(os.path.join(cwd, subento, "bento.info"))
-        if not os.path.exists(f):
-            raise ValueError("%s not found !" % f)
-        filenames.append(relpath(f, source_dir))
-
-        fid = open(f)
-        try:
-            key = relpath(f, source_dir)
-            rdir = relpath(os.path.join(cwd, subento), source_dir)
-
-            d = raw_parse(fid.read(), f)
-            kw, subentos = raw_to_subpkg_kw(d)
-            subpackages[key] = SubPackageDescription(rdir, **kw)
-            hooks_as_abspaths = [os.path.normpath(os.path.join(cwd, subento, h)) \
-                                 for h in subpackages[key].hook_files]
-            filenames.extend([relpath(f, source_dir) for f in hooks_as_abspaths])
-            for s in subentos:
-                _recurse(s, os.path.join(cwd, subento))
-        finally:
-            fid.close()
+        d = os.path.normpath(os.path.join(cwd, subento))
+        f = os.path.join(d, "bento.info")
+        key = relpath(f, source_dir)
+        filenames.append(key)
+
+        kw, children = parsed[f]
+        subpackages[key] = SubPackageDescription(relpath(d, source_dir), **kw)
+        hooks_as_abspaths = [os.path.normpath(os.path.join(d, h)) \
+                             for h in subpackages[key].hook_files]
+        filenames.extend([relpath(f, source_dir) for f in hooks_as_abspaths])
+        for s in children:
+            _recurse(s, d)
 
     for s in subentos:
         _recurse(s, source_dir)
@@ -111,7 +167,7 @@ def raw_to_subpkg_kw(raw_dict):
 
     return kw, misc_d["subento"]
 
-def raw_to_pkg_kw(raw_dict, user_flags, bento_info=None):
+def raw_to_pkg_kw(raw_dict, user_flags, bento_info=None, parse_files=None):
     if bento_info is None:
         source_dir = os.getcwd()
     else:
@@ -150,7 +206,8 @@ def raw_to_pkg_kw(raw_dict, user_flags, bento_info=None):
         if len(subentos) > 0 and libraries and libraries["sub_directory"] is not None:
             raise InvalidPackage("You cannot use both Recurse and Library:SubDirectory features !")
         else:
-            subpackages, files = recurse_subentos(subentos, source_dir=source_dir)
+            subpackages, files = recurse_subentos(subentos, source_dir=source_dir,
+                                                       parse_files=parse_files)
             kw["subpackages"] = subpackages
     else:
         files = []
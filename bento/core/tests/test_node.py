@@ -4,6 +4,9 @@ import pickle
 import tempfile
 import shutil
 import copy
+import time
+
+import mock
 
 import os.path as op
 
@@ -126,6 +129,42 @@ class TestNodeInsideTemp(unittest.TestCase):
         foobar = self.d_node.find_node("foo.bar")
         self.assertEqual(set(node.abspath() for node in nodes), set([foobar.abspath()]))
 
+    def _make_old(self, node):
+        t = time.time() - 3600
+        os.utime(node.abspath(), (t, t))
+
+    def test_ant_dirs(self):
+        for filename in ["foo/bar.txt", "foo/fubar/bar.txt", "bar.txt"]:
+            n = self.d_node.make_node(filename)
+            n.parent.mkdir()
+            n.write("")
+        nodes = self.d_node.ant_glob("**/bar.txt")
+        self.assertEqual([n.path_from(self.d_node) for n in nodes],
+                         ["bar.txt", op.join("foo", "bar.txt"),
+                          op.join("foo", "fubar", "bar.txt")])
+        nodes = self.d_node.ant_glob("*", dir=True, src=False)
+        self.assertEqual([n.name for n in nodes], ["foo"])
+
+    def test_ant_shared_listing(self):
+        for filename in ["bar.txt", "foo.bar"]:
+            self.d_node.make_node(filename).write("")
+        self._make_old(self.d_node)
+
+        self.d_node.ant_glob("*.txt")
+        p = mock.patch("bento.core.node._read_dir")
+        mocked = p.start()
+        try:
+            nodes = self.d_node.ant_glob("*.bar")
+        finally:
+            p.stop()
+        self.assertFalse(mocked.called)
+        self.assertEqual([n.name for n in nodes], ["foo.bar"])
+
+        # Listing is read again once the directory changes
+        self.d_node.make_node("fubar.txt").write("")
+        nodes = self.d_node.ant_glob("*.txt")
+        self.assertEqual([n.name for n in nodes], ["bar.txt", "fubar.txt"])
+
 class TestNodeWithBuild(unittest.TestCase):
     def setUp(self):
         top = os.getcwd()
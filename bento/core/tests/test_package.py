@@ -1,4 +1,5 @@
 import os
+import shutil
 import tempfile
 
 from bento.compat.api.moves \
@@ -6,11 +7,12 @@ from bento.compat.api.moves \
         unittest
 from bento.core.package \
     import \
-        PackageDescription
+        PackageDescription, recurse_subentos, raw_parse_files
 from bento.core.package import static_representation
 from bento.core.meta import PackageMetadata
 from bento.core.pkg_objects import DataFiles
 from bento.core.node import Node
+from bento.compat.api import relpath
 
 def create_file(file, makedirs=True):
     if makedirs:
@@ -81,3 +83,41 @@ class TestPackageMetadata(unittest.TestCase):
         self.assertEqual(meta.fullname, "foo-1.0")
         self.assertEqual(meta.contact, "John Doe")
         self.assertEqual(meta.contact_email, "john@doe.com")
+
+class TestRecurseSubentos(unittest.TestCase):
+    def setUp(self):
+        self.d = tempfile.mkdtemp()
+        tree = {
+            "foo/bento.info": "Recurse: bar, baz\nLibrary:\n    Packages: foo\n",
+            "foo/bar/bento.info": "Library:\n    Packages: bar\n",
+            "foo/baz/bento.info": "HookFile: bscript\n",
+            "fubar/bento.info": "Library:\n    Packages: fubar\n",
+        }
+        for f, content in tree.items():
+            f = os.path.join(self.d, f)
+            create_file(f)
+            fid = open(f, "w")
+            try:
+                fid.write(content)
+            finally:
+                fid.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.d)
+
+    def test_recurse(self):
+        parsed = []
+        def parse_files(filenames):
+            parsed.append([relpath(f, self.d) for f in filenames])
+            return raw_parse_files(filenames)
+
+        subpackages, files = recurse_subentos(["foo", "fubar"], self.d, parse_files)
+        self.assertEqual(files, ["foo/bento.info", "foo/bar/bento.info",
+                                 "foo/baz/bento.info", "foo/baz/bscript",
+                                 "fubar/bento.info"])
+        self.assertEqual(subpackages["foo/bar/bento.info"].rdir, "foo/bar")
+        self.assertEqual(subpackages["foo/bar/bento.info"].packages, ["bar"])
+        self.assertEqual(subpackages["fubar/bento.info"].packages, ["fubar"])
+        # Subentos of a same level are parsed together
+        self.assertEqual(parsed, [["foo/bento.info", "fubar/bento.info"],
+                                  ["foo/bar/bento.info", "foo/baz/bento.info"]])
@@ -12,7 +12,7 @@ from bento.core.node \
 from bento.core.platforms \
     import \
         get_scheme
-from bento.utils.utils import subst_vars, same_content, fix_kw, explode_path
+from bento.utils.utils import subst_vars, same_content, file_checksum, fix_kw, explode_path
 from bento.core.pkg_objects \
     import \
         Executable
@@ -80,6 +80,26 @@ def iter_files(file_sections):
     # category changes ? This may cause different target permissions and other
     # category-specific post-processing during install)
     installed_files = {}
+    # Sources compared at least once, and memoized md5 of sources compared
+    # more than once (i.e. installed in more than two sections)
+    compared = {}
+    checksums = {}
+    def _checksum(node):
+        try:
+            return checksums[node]
+        except KeyError:
+            checksum = checksums[node] = file_checksum(node.abspath())
+            return checksum
+
+    def _same_content(node, reference):
+        if reference in compared:
+            if os.path.getsize(node.abspath()) != os.path.getsize(reference.abspath()):
+                return False
+            return _checksum(node) == _checksum(reference)
+        else:
+            compared[reference] = True
+            return same_content(node.abspath(), reference.abspath())
+
     def _is_redundant(source, target):
         source_path = source.abspath()
         target_path = target.abspath()
@@ -89,7 +109,7 @@ def iter_files(file_sections):
             installed_files[target] = source
             return False
         else:
-            if not same_content(source_path, installed_files[target].abspath()):
+            if not _same_content(source, installed_files[target]):
                 # See top comment: not sure there is any good solution to
                 # select which one should be selected when a target has
                 # multiple sources
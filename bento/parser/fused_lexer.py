@@ -0,0 +1,389 @@
+"""Single pass implementation of the bento.info lexer.
+
+BentoLexer stacks several generators on top of ply.lex (escaping, merging of
+escaped tokens, indentation, filtering of whitespaces and post processing of
+multiline strings). FusedBentoLexer produces the same token stream, but
+matches each lexer state with one precompiled regex, and applies every
+post-processing step to a token as soon as it is lexed.
+
+The token rules themselves (regexes, keywords) are the ones defined in
+bento.parser.lexer.
+"""
+import re
+
+import six
+
+from ply.lex \
+    import \
+        LexToken
+
+from bento.errors \
+    import \
+        ParseError, InternalBentoError
+from bento.parser.utils \
+    import \
+        count_lines
+from bento.parser.lexer \
+    import \
+        keywords_dict, keyword_misc, line_keywords, multilines_keywords, \
+        comma_line_keywords, comma_word_keywords, remove_lines_indent, \
+        new_indent, new_dedent, R_NEWLINE
+import bento.parser.lexer as _lexer
+
+# Actions, see FusedBentoLexer._tokens
+_EMIT = 0
+_NEWLINE = 1
+_FIELD = 2
+_WORD = 3
+_TAB = 4
+_DISCARD = 5
+_MULTILINES_STRING = 6
+
+# Each state is defined as a list of (group name, rule, action, token type,
+# next state), in the order ply.lex tries them. A token type or next state of
+# None means the matched rule does not change it.
+_INITIAL_RULES = [
+    ("t_NEWLINE", _lexer.t_NEWLINE, _NEWLINE, "NEWLINE", None),
+    ("t_BACKSLASH", _lexer.t_BACKSLASH, _EMIT, "BACKSLASH", None),
+    ("t_TAB", _lexer.t_TAB, _TAB, None, None),
+    ("t_COLON", _lexer.t_COLON, _EMIT, "COLON", None),
+    ("t_FIELD", _lexer.t_FIELD, _FIELD, None, None),
+    ("t_COMMENT", _lexer.t_COMMENT, _DISCARD, None, None),
+    ("t_WORD", _lexer.t_WORD, _WORD, "WORD", None),
+    ("t_WS", _lexer.t_WS, _EMIT, "WS", None),
+    ("t_LPAR", _lexer.t_LPAR, _EMIT, "LPAR", None),
+    ("t_RPAR", _lexer.t_RPAR, _EMIT, "RPAR", None),
+]
+
+_STATES_RULES = {
+    "INITIAL": _INITIAL_RULES,
+    "insidestring": [
+        ("newline", _lexer.t_insidestring_newline, _NEWLINE, "NEWLINE", "INITIAL"),
+        ("COLON", _lexer.t_insidestring_COLON, _EMIT, "COLON", None),
+        ("WS", _lexer.t_insidestring_WS, _EMIT, "WS", None),
+        ("STRING", _lexer.t_insidestring_STRING, _EMIT, "STRING", "INITIAL"),
+    ],
+    "insideword": [
+        ("COMMENT", _lexer.t_insideword_COMMENT, _DISCARD, None, None),
+        ("NEWLINE", _lexer.t_insideword_NEWLINE, _NEWLINE, "NEWLINE", "INITIAL"),
+        ("COLON", _lexer.t_insideword_COLON, _EMIT, "COLON", None),
+        ("WS", _lexer.t_insideword_WS, _EMIT, "WS", None),
+        ("WORD", _lexer.t_insideword_WORD, _EMIT, "WORD", None),
+    ],
+    "insidemstring": [
+        ("COLON", _lexer.t_insidemstring_COLON, _EMIT, "COLON", None),
+        ("COLON_NO_CONTINUED", _lexer.t_insidemstring_COLON_NO_CONTINUED,
+         _EMIT, "COLON", "insidemstringnotcontinued"),
+        ("WS", _lexer.t_insidemstring_WS, _EMIT, "WS", None),
+        ("NEWLINE", _lexer.t_insidemstring_NEWLINE, _NEWLINE, "NEWLINE", None),
+        ("MULTILINES_STRING", _lexer.t_insidemstring_MULTILINES_STRING,
+         _MULTILINES_STRING, "MULTILINES_STRING", "INITIAL"),
+    ],
+    "insidemstringnotcontinued": [
+        # The line number is not updated inside this state
+        ("NEWLINE", _lexer.t_insidemstringnotcontinued_NEWLINE, _EMIT, "NEWLINE", None),
+        ("WS", _lexer.t_insidemstringnotcontinued_WS, _EMIT, "WS", None),
+        ("BLOCK_MULTILINES_STRING",
+         _lexer.t_insidemstringnotcontinued_BLOCK_MULTILINES_STRING,
+         _EMIT, "BLOCK_MULTILINES_STRING", "INITIAL"),
+    ],
+    # inclusive state
+    "insidewcommalistfirstline": [
+        ("COLON", _lexer.t_insidewcommalistfirstline_COLON, _EMIT, "COLON", None),
+        ("WS", _lexer.t_insidewcommalistfirstline_WS, _EMIT, "WS", None),
+        ("WORD", _lexer.t_insidewcommalistfirstline_WORD, _EMIT, "WORD", "insidewcommalist"),
+        ("WORD_STOP", _lexer.t_insidewcommalistfirstline_WORD_STOP, _EMIT, "WORD", "INITIAL"),
+        ("NEWLINE", _lexer.t_insidewcommalistfirstline_NEWLINE, _NEWLINE, "NEWLINE", None),
+        ("COMMA", _lexer.t_insidewcommalistfirstline_COMMA, _EMIT, "COMMA", None),
+    ] + _INITIAL_RULES,
+    # inclusive state
+    "insidewcommalist": [
+        ("WORD", _lexer.t_insidewcommalist_WORD, _EMIT, "WORD", None),
+        ("WORD_STOP", _lexer.t_insidewcommalist_WORD_STOP, _EMIT, "WORD", "INITIAL"),
+        ("NEWLINE", _lexer.t_insidewcommalist_NEWLINE, _NEWLINE, "NEWLINE", None),
+        ("WS", _lexer.t_insidewcommalist_WS, _EMIT, "WS", None),
+        ("COMMA", _lexer.t_insidewcommalist_COMMA, _EMIT, "COMMA", None),
+    ] + _INITIAL_RULES,
+    "insidescommalistfirstline": [
+        ("COLON", _lexer.t_insidescommalistfirstline_COLON, _EMIT, "COLON", None),
+        ("WS", _lexer.t_insidescommalistfirstline_WS, _EMIT, "WS", None),
+        ("STRING", _lexer.t_insidescommalistfirstline_STRING, _EMIT, "STRING", "insidescommalist"),
+        ("STRING_STOP", _lexer.t_insidescommalistfirstline_STRING_STOP, _EMIT, "STRING", "INITIAL"),
+        ("NEWLINE", _lexer.t_insidescommalistfirstline_NEWLINE, _NEWLINE, "NEWLINE", None),
+        ("COMMA", _lexer.t_insidescommalistfirstline_COMMA, _EMIT, "COMMA", None),
+    ],
+    "insidescommalist": [
+        ("WS", _lexer.t_insidescommalist_WS, _EMIT, "WS", None),
+        ("STRING", _lexer.t_insidescommalist_STRING, _EMIT, "STRING", None),
+        ("STRING_STOP", _lexer.t_insidescommalist_STRING_STOP, _EMIT, "STRING", "INITIAL"),
+        ("NEWLINE", _lexer.t_insidescommalist_NEWLINE, _NEWLINE, "NEWLINE", None),
+        ("COMMA", _lexer.t_insidescommalist_COMMA, _EMIT, "COMMA", None),
+    ],
+}
+
+_ERROR_MESSAGES = {
+    "INITIAL": "Illegal character '%s'",
+    "insideword": "Illegal character (inside word state) '%s'",
+    "insidestring": "Illegal character (insidestring state) '%s'",
+    "insidemstring": "Illegal character (insidemstring state) '%s'",
+    "insidemstringnotcontinued": "Illegal character (inside_mstringnotcontinued state) '%s'",
+    "insidewcommalist": "Illegal character (inside wcommalist state) '%s'",
+    "insidewcommalistfirstline": "Illegal character (inside wcommalistfirstline state) '%s'",
+    "insidescommalist": "Illegal character (inside scommalist state) '%s'",
+    "insidescommalistfirstline": "Illegal character (inside scommalistfirstline state) '%s'",
+}
+
+def _compile_state(rules):
+    regex = []
+    actions = {}
+    for name, rule, action, type, next_state in rules:
+        if callable(rule):
+            pattern = rule.__doc__
+        else:
+            pattern = rule
+        regex.append("(?P<%s>%s)" % (name, pattern))
+        actions[name] = (action, type, next_state)
+    # Same flags as ply.lex (which always adds re.VERBOSE)
+    return re.compile("|".join(regex), re.VERBOSE | re.UNICODE | re.MULTILINE), actions
+
+_STATES = dict([(state, _compile_state(rules)) \
+                for state, rules in _STATES_RULES.items()])
+
+def _field_state(type, lexdata, lexpos):
+    if type in line_keywords:
+        return "insidestring"
+    elif type in multilines_keywords:
+        # See bento.parser.lexer.t_FIELD
+        if lexpos >= 1 and not R_NEWLINE.match(lexdata[lexpos-1]):
+            return "insidestring"
+        else:
+            return "insidemstring"
+    elif type in comma_line_keywords:
+        return "insidescommalistfirstline"
+    elif type in comma_word_keywords:
+        return "insidewcommalistfirstline"
+    else:
+        return "insideword"
+
+class FusedBentoLexer(object):
+    """Drop-in replacement for BentoLexer."""
+    def __init__(self, optimize=False):
+        # optimize is only accepted for compatibility with BentoLexer: regexes
+        # are compiled once at import time
+        self.lexdata = None
+        self.lineno = 1
+        self.stream = None
+
+    def input(self, data):
+        self.lexdata = data
+        self.lineno = 1
+        self.stream = self._tokens(data)
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+    def token(self):
+        try:
+            return six.advance_iterator(self.stream)
+        except StopIteration:
+            pass
+
+    def _raw_tokens(self, data):
+        # Equivalent of ply.lex token stream
+        lexpos = 0
+        lexlen = len(data)
+        state = "INITIAL"
+        master, actions = _STATES[state]
+        while lexpos < lexlen:
+            m = master.match(data, lexpos)
+            if m is None:
+                t = LexToken()
+                t.value = data[lexpos:]
+                t.type = "error"
+                t.lineno = self.lineno
+                t.lexpos = lexpos
+                t.lexer = self
+                raise ParseError(_ERROR_MESSAGES[state] % t.value[0], t)
+
+            name = m.lastgroup
+            action, type, next_state = actions[name]
+
+            t = LexToken()
+            t.value = m.group()
+            t.lineno = self.lineno
+            t.lexpos = lexpos
+            t.lexer = self
+            lexpos = m.end()
+
+            if action == _EMIT:
+                t.type = type
+            elif action == _NEWLINE:
+                t.type = type
+                self.lineno += len(t.value)
+            elif action == _WORD:
+                t.type = keyword_misc.get(t.value, type)
+            elif action == _FIELD:
+                try:
+                    t.type = keywords_dict[t.value]
+                except KeyError:
+                    t.type = "FIELD"
+                    raise ParseError("Unrecognized keyword: %r" % (t.value,), t)
+                next_state = _field_state(t.type, data, t.lexpos)
+            elif action == _MULTILINES_STRING:
+                t.type = type
+                self.lineno += count_lines(t.value) - 1
+            elif action == _DISCARD:
+                t = None
+            elif action == _TAB:
+                raise SyntaxError("Tab not supported")
+            else:
+                raise InternalBentoError("Unknown lexer action %r" % action)
+
+            if next_state is not None and next_state != state:
+                state = next_state
+                master, actions = _STATES[state]
+            if t is not None:
+                yield t
+
+    def _tokens(self, data):
+        # escaping
+        escaping = None
+        # merging of escaped tokens: tokens to merge, and whether the last one
+        # is a WORD waiting to know whether the next token is escaped
+        queue = []
+        word_pending = False
+        # indentation
+        stack = [0]
+        former = LexToken()
+        former.type = "NEWLINE"
+        former.value = "dummy"
+        former.lineno = 0
+        former.lexpos = -1
+        # the next token is output as is (it follows a skipped indentation)
+        passthrough = False
+        last = None
+        # post processing
+        previous = None
+
+        raw = self._raw_tokens(data)
+        while True:
+            merged = []
+            try:
+                t = six.advance_iterator(raw)
+            except StopIteration:
+                t = None
+
+            if t is None:
+                if escaping is not None:
+                    raise SyntaxError("EOF while escaping token %r (line %d)" %
+                                      (escaping.value, escaping.lineno-1))
+                if queue:
+                    t = queue[-1]
+                    t.value = "".join([c.value for c in queue])
+                    t.type = "WORD"
+                    merged.append(t)
+                    queue = []
+            else:
+                # Escaping
+                if escaping is not None:
+                    escaping = None
+                    t.escaped = True
+                elif t.type == "BACKSLASH":
+                    escaping = t
+                    continue
+                else:
+                    t.escaped = False
+
+                # Merging of escaped tokens
+                if word_pending:
+                    word_pending = False
+                    if not t.escaped:
+                        w = queue[-1]
+                        w.value = "".join([c.value for c in queue])
+                        merged.append(w)
+                        queue = []
+                if t.escaped:
+                    queue.append(t)
+                elif t.type == "WORD":
+                    queue.append(t)
+                    word_pending = True
+                else:
+                    if queue:
+                        q = queue[-1]
+                        q.value = "".join([c.value for c in queue])
+                        q.type = "WORD"
+                        merged.append(q)
+                        queue = []
+                    merged.append(t)
+
+            # Indentation
+            indented = []
+            for token in merged:
+                if passthrough:
+                    if passthrough == 1:
+                        last = token
+                    passthrough = False
+                    former = token
+                    indented.append(token)
+                    continue
+
+                last = token
+                if former.type == "NEWLINE":
+                    if token.type == "WS":
+                        indent = len(token.value)
+                    else:
+                        indent = 0
+
+                    if indent == stack[0]:
+                        former = token
+                        if indent > 0:
+                            passthrough = 1
+                        else:
+                            indented.append(token)
+                    elif indent > stack[0]:
+                        stack.insert(0, indent)
+                        former = new_indent(indent, token)
+                        indented.append(former)
+                    else:
+                        if not indent in stack:
+                            raise ValueError("Wrong indent at line %d" % token.lineno)
+                        while stack[0] > indent:
+                            former = new_dedent(stack.pop(0), token)
+                            indented.append(former)
+                        if stack[0] > 0:
+                            passthrough = 2
+                        else:
+                            former = token
+                            indented.append(token)
+                else:
+                    former = token
+                    indented.append(token)
+
+            if t is None and not passthrough:
+                # Generate additional DEDENT so that the number of
+                # INDENT/DEDENT always match
+                while len(stack) > 1:
+                    former = new_dedent(stack.pop(0), last)
+                    indented.append(former)
+
+            for token in indented:
+                # Filtering and post processing
+                if token.type == "NEWLINE" or token.type == "WS":
+                    continue
+                if token.type == "BLOCK_MULTILINES_STRING":
+                    if previous is None:
+                        raise ValueError()
+                    elif not previous.type == "INDENT":
+                        raise InternalBentoError(
+                                "Error while post processing block line: %s -> %s" \
+                                % (previous, token))
+                    else:
+                        token.value = remove_lines_indent(token.value, previous.value)
+                        token.type = "MULTILINES_STRING"
+                elif token.type == "MULTILINES_STRING":
+                    token.value = remove_lines_indent(token.value)
+                previous = token
+                yield token
+
+            if t is None:
+                return
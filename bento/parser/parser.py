@@ -1,5 +1,5 @@
-import sys
-import errno
+import os
+import binascii
 
 import os.path as op
 
@@ -9,16 +9,16 @@ import bento.parser.rules
 
 from bento._config \
     import \
-        _PICKLED_PARSETAB, _OPTIMIZE_LEX, _DEBUG_YACC
-from bento.utils.utils \
-    import \
-        extract_exception
+        _PARSETAB_MODULE, _OPTIMIZE_LEX, _DEBUG_YACC, _LEXER
 from bento.errors \
     import \
-        InternalBentoError, BentoError, ParseError
+        InternalBentoError, ParseError
 from bento.parser.lexer \
     import \
         BentoLexer, tokens as _tokens
+from bento.parser.fused_lexer \
+    import \
+        FusedBentoLexer
 
 # XXX: is there a less ugly way to do this ?
 __GLOBALS = globals()
@@ -31,63 +31,84 @@ for k in dir(bento.parser.rules):
 # in the grammar.
 tokens = [t for t in _tokens if not t in ["WS", "NEWLINE", "BACKSLASH", "BLOCK_MULTILINES_STRING"]]
 
-def _has_parser_changed(picklefile):
-    # FIXME: private function to determine whether ply will need to write to
-    # the pickled grammar file. Highly implementation dependent.
-    from ply.yacc import PlyLogger, get_caller_module_dict, ParserReflect, YaccError, LRTable
-    errorlog = PlyLogger(sys.stderr)
-
-    pdict = get_caller_module_dict(2)
-
-    # Collect parser information from the dictionary
-    pinfo = ParserReflect(pdict, log=errorlog)
+def _load_tables():
+    """Return the LR tables shipped in the parsetab module, or None if they
+    cannot be used (missing, or generated by another version of PLY)."""
+    try:
+        lr = ply.yacc.LRTable()
+        lr.read_table(_PARSETAB_MODULE)
+    except (ImportError, ply.yacc.VersionError):
+        return None
+    lr.bind_callables(globals())
+    return lr
+
+def _grammar_signature():
+    # Expensive: reflects the whole grammar
+    pinfo = ply.yacc.ParserReflect(globals())
     pinfo.get_all()
-
     if pinfo.error:
-        raise YaccError("Unable to build parser")
+        raise ply.yacc.YaccError("Unable to build parser")
+    return binascii.hexlify(pinfo.signature()).decode("ascii")
 
-    # Check signature against table files (if any)
-    signature = pinfo.signature()
+def generate_tables():
+    """Regenerate the LR tables module from the grammar.
 
-    # Read the tables
+    This is a maintenance step, to be run (see tools/generate_parsetab.py)
+    whenever the grammar or the bundled PLY is changed: bento never writes the
+    tables by itself."""
+    cwd = os.getcwd()
+    os.chdir(op.dirname(op.abspath(__file__)))
     try:
-        lr = LRTable()
-        read_signature = lr.read_pickle(picklefile)
-        return read_signature != signature
-    except Exception:
-        return True
+        ply.yacc.yacc(start="stmt_list", tabmodule=_PARSETAB_MODULE,
+                      outputdir=os.curdir, debug=_DEBUG_YACC)
+
+        # ply writes the signature as a bytes literal under python 3: write it
+        # in hex instead, so that the module can be imported by every
+        # supported python. This also means ply never considers the tables up
+        # to date, and always regenerates them here.
+        filename = _PARSETAB_MODULE.split(".")[-1] + ".py"
+        fid = open(filename)
+        try:
+            lines = fid.readlines()
+        finally:
+            fid.close()
+        for i, line in enumerate(lines):
+            if line.startswith("_lr_signature = "):
+                lines[i] = "_lr_signature = %r\n" % str(_grammar_signature())
+        fid = open(filename, "w")
+        try:
+            fid.writelines(lines)
+        finally:
+            fid.close()
+    finally:
+        os.chdir(cwd)
+
+def _create_lexer():
+    if _LEXER == "fused":
+        return FusedBentoLexer()
+    elif _LEXER == "ply":
+        return BentoLexer(optimize=_OPTIMIZE_LEX)
+    else:
+        raise InternalBentoError("Unknown lexer backend %r" % (_LEXER,))
 
 class Parser(object):
     def __init__(self, lexer=None):
         if lexer is None:
-            self.lexer = BentoLexer(optimize=_OPTIMIZE_LEX)
+            self.lexer = _create_lexer()
         else:
             self.lexer = lexer
 
-        picklefile = _PICKLED_PARSETAB
-        if not op.exists(picklefile):
-            try:
-                fid = open(picklefile, "wb")
-                fid.close()
-            except IOError:
-                e = extract_exception()
-                raise BentoError("Could not write pickle file %r (original error was %r)" % (picklefile, e))
+        # The shipped tables are trusted as is: checking them against the
+        # grammar requires reflecting the whole grammar, which is what we want
+        # to avoid at runtime (test_parsing checks they are up to date).
+        lr = _load_tables()
+        if lr is None:
+            # Build the tables in memory, without writing anything
+            self.parser = ply.yacc.yacc(start="stmt_list",
+                                        tabmodule=_PARSETAB_MODULE,
+                                        write_tables=0, debug=_DEBUG_YACC)
         else:
-            try:
-                fid = open(_PICKLED_PARSETAB, "wb")
-                fid.close()
-            except IOError:
-                # In case of read-only support (no write access, zip import,
-                # etc...)
-                e = extract_exception()
-                if e.errno == errno.EACCES:
-                    if _has_parser_changed(_PICKLED_PARSETAB):
-                        raise BentoError("Cannot write new updated grammar to file %r" % _PICKLED_PARSETAB)
-                else:
-                    raise
-        self.parser = ply.yacc.yacc(start="stmt_list",
-                                picklefile=picklefile,
-                                debug=_DEBUG_YACC)
+            self.parser = ply.yacc.LRParser(lr, p_error)
 
     def parse(self, data):
         res = self.parser.parse(data, lexer=self.lexer)
@@ -98,7 +119,7 @@ class Parser(object):
 
     def reset(self):
         # XXX: implements reset for lexer
-        self.lexer = BentoLexer(optimize=_OPTIMIZE_LEX)
+        self.lexer = _create_lexer()
         # XXX: ply parser.reset method expects those attributes to
         # exist
         self.parser.statestack = []
@@ -0,0 +1,182 @@
+
+# ./parsetab.py
+# This file is automatically generated. Do not edit.
+_tabversion = '3.2'
+
+_lr_method = 'LALR'
+
+_lr_signature = '520e53fe9332ea1cd27b192234c24631'
+    
+_lr_action_items = {'EXTRA_SOURCE_FILES_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[33,33,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'AUTHOR_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[37,37,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'AUTHOR_EMAIL_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[38,38,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'CLASSIFIERS_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[39,39,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'CONFIG_PY_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[40,40,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'DESCRIPTION_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,67,69,94,110,111,113,114,115,116,117,139,140,141,142,143,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,196,199,219,220,234,235,237,238,260,261,263,264,266,268,269,276,286,291,292,298,299,300,304,306,],[41,41,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,118,144,-93,-61,-144,-146,118,-75,-76,-77,144,-83,-84,-85,-86,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-74,-89,-80,-82,-145,-143,-78,-79,-87,-88,-55,-54,-33,-151,-150,144,-142,144,-86,-53,-149,-122,144,-123,]),'DESCRIPTION_FROM_FILE_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[42,42,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'DOWNLOAD_URL_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[43,43,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'HOOK_FILE_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[44,44,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'KEYWORDS_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[45,45,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'LICENSE_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[46,46,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'MAINTAINER_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[47,47,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'MAINTAINER_EMAIL_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[48,48,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'NAME_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[49,49,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'PLATFORMS_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[50,50,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'RECURSE_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[51,51,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'SUMMARY_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[52,52,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'META_TEMPLATE_FILE_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[53,53,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'META_TEMPLATE_FILES_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[54,54,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'USE_BACKENDS_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[55,55,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'URL_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[56,56,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'VERSION_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[57,57,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'DATAFILES_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[58,58,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'EXECUTABLE_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[59,59,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'FLAG_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[60,60,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'LIBRARY_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[61,61,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'PATH_ID':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[62,62,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'$end':([0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,35,63,94,110,111,113,146,147,148,149,150,152,153,154,155,157,158,159,160,161,162,163,164,165,166,167,169,170,171,172,173,174,175,176,177,181,182,184,189,195,199,219,234,235,263,264,266,268,269,286,298,299,],[-11,0,-2,-3,-4,-5,-6,-7,-8,-9,-10,-12,-13,-14,-15,-16,-17,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-90,-1,-93,-61,-144,-146,-38,-39,-50,-51,-52,-56,-57,-47,-32,-43,-37,-58,-45,-42,-40,-41,-34,-44,-147,-148,-152,-59,-35,-48,-49,-60,-36,-46,-153,-91,-92,-62,-134,-72,-89,-80,-145,-143,-55,-54,-33,-151,-150,-142,-53,-149,]),'INDENT':([31,32,34,35,36,66,72,74,77,78,83,84,87,88,94,131,133,178,179,180,181,182,183,187,193,201,202,214,215,223,226,245,258,259,274,275,282,283,303,],[64,65,67,68,69,112,151,156,112,112,168,112,112,112,-93,203,213,-63,-135,-73,-91,-92,-81,112,233,168,168,112,112,262,267,276,-115,-109,112,112,112,112,304,]),'COLON':([33,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,101,102,103,108,109,118,119,129,130,134,135,136,137,138,144,145,204,205,206,207,208,210,243,244,246,247,253,254,294,295,301,302,],[66,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,186,187,188,191,192,197,198,201,202,214,215,216,217,218,221,222,245,-124,-125,-126,-130,-132,274,275,-131,-133,282,283,-127,-128,-129,303,]),'TARGET_ID':([64,96,97,98,99,100,111,113,185,228,229,230,234,235,286,],[101,101,-65,-66,-67,-68,-144,-146,-64,-69,-71,-70,-145,-143,-142,]),'FILES_ID':([64,96,97,98,99,100,111,113,185,228,229,230,234,235,286,],[102,102,-65,-66,-67,-68,-144,-146,-64,-69,-71,-70,-145,-143,-142,]),'SRCDIR_ID':([64,96,97,98,99,100,111,113,185,228,229,230,234,235,286,],[103,103,-65,-66,-67,-68,-144,-146,-64,-69,-71,-70,-145,-143,-142,]),'FUNCTION_ID':([65,104,105,106,107,190,231,232,],[108,108,-137,-138,-139,-136,-141,-140,]),'MODULE_ID':([65,104,105,106,107,190,231,232,],[109,109,-137,-138,-139,-136,-141,-140,]),'WORD':([66,71,73,75,76,77,78,81,82,84,86,87,88,89,90,91,92,93,94,95,112,186,187,188,191,192,193,198,214,215,216,217,218,222,233,236,249,250,274,275,277,282,283,],[113,147,154,157,158,113,113,163,164,113,172,113,113,175,177,178,179,180,182,183,113,228,113,230,231,232,234,238,113,113,257,258,259,261,113,234,278,279,113,113,293,113,113,]),'DEFAULT_ID':([67,69,114,115,116,117,139,140,141,142,143,196,220,237,238,260,261,276,291,292,300,304,306,],[119,145,119,-75,-76,-77,145,-83,-84,-85,-86,-74,-82,-78,-79,-87,-88,145,145,-86,-122,145,-123,]),'BUILD_REQUIRES_ID':([68,111,113,120,121,122,123,124,125,126,127,128,166,167,169,200,234,235,239,240,255,256,257,268,269,272,276,280,286,290,292,299,300,304,306,],[129,-144,-146,129,-95,-96,-97,-98,-99,-100,-101,-102,-147,-148,-152,-94,-145,-143,-118,-119,-104,-103,-105,-151,-150,-112,129,-106,-142,129,-98,-149,-122,129,-123,]),'INSTALL_REQUIRES_ID':([68,111,113,120,121,122,123,124,125,126,127,128,166,167,169,200,234,235,239,240,255,256,257,268,269,272,276,280,286,290,292,299,300,304,306,],[130,-144,-146,130,-95,-96,-97,-98,-99,-100,-101,-102,-147,-148,-152,-94,-145,-143,-118,-119,-104,-103,-105,-151,-150,-112,130,-106,-142,130,-98,-149,-122,130,-123,]),'IF':([68,69,111,113,120,121,122,123,124,125,126,127,128,139,140,141,142,143,166,167,169,200,220,234,235,239,240,255,256,257,260,261,268,269,272,276,280,286,290,291,292,299,300,304,306,],[132,132,-144,-146,132,-95,-96,-97,-98,-99,-100,-101,-102,132,-83,-84,-85,-86,-147,-148,-152,-94,-82,-145,-143,-118,-119,-104,-103,-105,-87,-88,-151,-150,-112,132,-106,-142,132,132,-86,-149,-122,132,-123,]),'MODULES_ID':([68,111,113,120,121,122,123,124,125,126,127,128,166,167,169,200,234,235,239,240,255,256,257,268,269,272,276,280,286,290,292,299,300,304,306,],[134,-144,-146,134,-95,-96,-97,-98,-99,-100,-101,-102,-147,-148,-152,-94,-145,-143,-118,-119,-104,-103,-105,-151,-150,-112,134,-106,-142,134,-98,-149,-122,134,-123,]),'PACKAGES_ID':([68,111,113,120,121,122,123,124,125,126,127,128,166,167,169,200,234,235,239,240,255,256,257,268,269,272,276,280,286,290,292,299,300,304,306,],[135,-144,-146,135,-95,-96,-97,-98,-99,-100,-101,-102,-147,-148,-152,-94,-145,-143,-118,-119,-104,-103,-105,-151,-150,-112,135,-106,-142,135,-98,-149,-122,135,-123,]),'SUB_DIRECTORY_ID':([68,111,113,120,121,122,123,124,125,126,127,128,166,167,169,200,234,235,239,240,255,256,257,268,269,272,276,280,286,290,292,299,300,304,306,],[136,-144,-146,136,-95,-96,-97,-98,-99,-100,-101,-102,-147,-148,-152,-94,-145,-143,-118,-119,-104,-103,-105,-151,-150,-112,136,-106,-142,136,-98,-149,-122,136,-123,]),'COMPILED_LIBRARY_ID':([68,111,113,120,121,122,123,124,125,126,127,128,166,167,169,200,234,235,239,240,255,256,257,268,269,272,276,280,286,290,292,299,300,304,306,],[137,-144,-146,137,-95,-96,-97,-98,-99,-100,-101,-102,-147,-148,-152,-94,-145,-143,-118,-119,-104,-103,-105,-151,-150,-112,137,-106,-142,137,-98,-149,-122,137,-123,]),'EXTENSION_ID':([68,111,113,120,121,122,123,124,125,126,127,128,166,167,169,200,234,235,239,240,255,256,257,268,269,272,276,280,286,290,292,299,300,304,306,],[138,-144,-146,138,-95,-96,-97,-98,-99,-100,-101,-102,-147,-148,-152,-94,-145,-143,-118,-119,-104,-103,-105,-151,-150,-112,138,-106,-142,138,-98,-149,-122,138,-123,]),'STRING':([70,72,79,80,83,85,151,168,197,201,202,221,223,226,262,265,267,270,],[146,153,161,162,169,171,153,169,237,169,169,260,153,268,153,153,169,268,]),'MULTILINES_STRING':([74,156,],[155,225,]),'DEDENT':([96,97,98,99,100,104,105,106,107,111,113,114,115,116,117,120,121,122,123,124,125,126,127,128,139,140,141,142,143,152,153,166,167,169,185,190,194,196,200,220,224,225,227,228,229,230,231,232,234,235,237,238,239,240,241,242,251,252,255,256,257,260,261,263,268,269,271,272,273,280,281,284,285,286,287,288,289,290,291,292,296,297,299,300,305,306,],[184,-65,-66,-67,-68,189,-137,-138,-139,-144,-146,195,-75,-76,-77,199,-95,-96,-97,-98,-99,-100,-101,-102,219,-83,-84,-85,-86,-56,-57,-147,-148,-152,-64,-136,235,-74,-94,-82,264,266,269,-69,-71,-70,-141,-140,-145,-143,-78,-79,-118,-119,272,-114,280,-108,-104,-103,-105,-87,-88,-55,-151,-150,286,-112,-113,-106,-107,298,299,-142,-116,-117,300,-120,-121,-86,-110,-111,-149,-122,306,-123,]),'COMMA':([111,113,150,152,153,167,169,194,224,227,234,263,268,271,284,285,],[193,-146,223,-56,-57,226,-152,236,265,270,-145,-55,-151,236,265,270,]),'SOURCES_ID':([111,113,203,213,234,235,241,242,251,252,273,281,286,287,288,296,297,],[-144,-146,243,253,-145,-143,243,-114,253,-108,-113,-107,-142,-116,-117,-110,-111,]),'INCLUDE_DIRS_ID':([111,113,203,213,234,235,241,242,251,252,273,281,286,287,288,296,297,],[-144,-146,244,254,-145,-143,244,-114,254,-108,-113,-107,-142,-116,-117,-110,-111,]),'TRUE':([132,209,],[208,247,]),'NOT_OP':([132,],[209,]),'FALSE':([132,209,],[210,246,]),'OS_OP':([132,],[211,]),'FLAG_OP':([132,209,],[212,248,]),'LPAR':([211,212,248,],[249,250,277,]),'RPAR':([278,279,293,],[294,295,301,]),'ELSE':([300,],[302,]),}
+
+_lr_action = { }
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = { }
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'stmt_list':([0,],[1,]),'stmt':([0,1,],[2,63,]),'empty':([0,],[3,]),'meta_stmt':([0,1,],[4,4,]),'data_files':([0,1,],[5,5,]),'exec':([0,1,],[6,6,]),'extra_source_files':([0,1,],[7,7,]),'flag':([0,1,],[8,8,]),'library':([0,1,],[9,9,]),'path':([0,1,],[10,10,]),'meta_author_stmt':([0,1,],[11,11,]),'meta_author_email_stmt':([0,1,],[12,12,]),'meta_classifiers_stmt':([0,1,],[13,13,]),'meta_config_py_stmt':([0,1,],[14,14,]),'meta_description_stmt':([0,1,],[15,15,]),'meta_description_from_file_stmt':([0,1,],[16,16,]),'meta_download_url_stmt':([0,1,],[17,17,]),'meta_hook_file_stmt':([0,1,],[18,18,]),'meta_keywords_stmt':([0,1,],[19,19,]),'meta_license_stmt':([0,1,],[20,20,]),'meta_maintainer_stmt':([0,1,],[21,21,]),'meta_maintainer_email_stmt':([0,1,],[22,22,]),'meta_name_stmt':([0,1,],[23,23,]),'meta_platforms_stmt':([0,1,],[24,24,]),'meta_recurse_stmt':([0,1,],[25,25,]),'meta_summary_stmt':([0,1,],[26,26,]),'meta_meta_template_files_stmt':([0,1,],[27,27,]),'meta_use_backends_stmt':([0,1,],[28,28,]),'meta_url_stmt':([0,1,],[29,29,]),'meta_version_stmt':([0,1,],[30,30,]),'data_files_declaration':([0,1,],[31,31,]),'exec_decl':([0,1,],[32,32,]),'flag_declaration':([0,1,],[34,34,]),'library_declaration':([0,1,],[35,35,]),'path_declaration':([0,1,],[36,36,]),'data_files_stmts':([64,],[96,]),'data_files_stmt':([64,96,],[97,185,]),'data_files_target':([64,96,],[98,98,]),'data_files_files':([64,96,],[99,99,]),'data_files_srcdir':([64,96,],[100,100,]),'exec_stmts':([65,],[104,]),'exec_stmt':([65,104,],[105,190,]),'function':([65,104,],[106,106,]),'module':([65,104,],[107,107,]),'wcomma_list':([66,77,78,84,87,88,187,214,215,274,275,282,283,],[110,159,160,170,173,174,229,255,256,287,288,296,297,]),'comma_words':([66,77,78,84,87,88,112,187,214,215,233,274,275,282,283,],[111,111,111,111,111,111,194,111,111,111,271,111,111,111,111,]),'flag_stmts':([67,],[114,]),'flag_stmt':([67,114,],[115,196,]),'flag_description':([67,114,],[116,116,]),'flag_default':([67,114,],[117,117,]),'library_stmts':([68,276,304,],[120,290,290,]),'library_stmt':([68,120,276,290,304,],[121,200,121,200,121,]),'build_requires_stmt':([68,120,276,290,304,],[122,122,122,122,122,]),'compiled_library_stmt':([68,120,276,290,304,],[123,123,123,123,123,]),'conditional_stmt':([68,69,120,139,276,290,291,304,],[124,143,124,143,292,124,143,292,]),'extension_stmt':([68,120,276,290,304,],[125,125,125,125,125,]),'modules_stmt':([68,120,276,290,304,],[126,126,126,126,126,]),'packages_stmt':([68,120,276,290,304,],[127,127,127,127,127,]),'sub_directory_stmt':([68,120,276,290,304,],[128,128,128,128,128,]),'compiled_library_decl':([68,120,276,290,304,],[131,131,131,131,131,]),'extension_decl':([68,120,276,290,304,],[133,133,133,133,133,]),'path_stmts':([69,276,304,],[139,291,291,]),'path_stmt':([69,139,276,291,304,],[140,220,140,220,140,]),'path_description':([69,139,276,291,304,],[141,141,141,141,141,]),'path_default':([69,139,276,291,304,],[142,142,142,142,142,]),'classifiers_list':([72,],[148,]),'indented_classifiers_list':([72,],[149,]),'classifiers':([72,151,262,],[150,224,284,]),'classifier':([72,151,223,262,265,],[152,152,263,152,263,]),'scomma_list':([83,201,202,],[165,239,240,]),'indented_scomma_list':([83,201,202,],[166,166,166,]),'comma_strings':([83,168,201,202,267,],[167,227,167,167,285,]),'version':([90,],[176,]),'library_name':([94,],[181,]),'test':([132,],[204,]),'bool':([132,],[205,]),'os_var':([132,],[206,]),'flag_var':([132,],[207,]),'compiled_library_field_stmts':([203,],[241,]),'compiled_library_field_stmt':([203,241,],[242,273,]),'extension_field_stmts':([213,],[251,]),'extension_field_stmt':([213,251,],[252,281,]),'in_conditional_stmts':([276,304,],[289,305,]),}
+
+_lr_goto = { }
+for _k, _v in _lr_goto_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = { }
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> stmt_list","S'",1,None,None,None),
+  ('stmt_list -> stmt_list stmt','stmt_list',2,'p_stmt_list','/root/package/bento/parser/rules.py',9),
+  ('stmt_list -> stmt','stmt_list',1,'p_stmt_list_term','/root/package/bento/parser/rules.py',15),
+  ('stmt_list -> empty','stmt_list',1,'p_stmt_list_empty','/root/package/bento/parser/rules.py',19),
+  ('stmt -> meta_stmt','stmt',1,'p_stmt','/root/package/bento/parser/rules.py',23),
+  ('stmt -> data_files','stmt',1,'p_stmt','/root/package/bento/parser/rules.py',24),
+  ('stmt -> exec','stmt',1,'p_stmt','/root/package/bento/parser/rules.py',25),
+  ('stmt -> extra_source_files','stmt',1,'p_stmt','/root/package/bento/parser/rules.py',26),
+  ('stmt -> flag','stmt',1,'p_stmt','/root/package/bento/parser/rules.py',27),
+  ('stmt -> library','stmt',1,'p_stmt','/root/package/bento/parser/rules.py',28),
+  ('stmt -> path','stmt',1,'p_stmt','/root/package/bento/parser/rules.py',29),
+  ('empty -> <empty>','empty',0,'p_empty','/root/package/bento/parser/rules.py',34),
+  ('meta_stmt -> meta_author_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',41),
+  ('meta_stmt -> meta_author_email_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',42),
+  ('meta_stmt -> meta_classifiers_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',43),
+  ('meta_stmt -> meta_config_py_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',44),
+  ('meta_stmt -> meta_description_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',45),
+  ('meta_stmt -> meta_description_from_file_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',46),
+  ('meta_stmt -> meta_download_url_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',47),
+  ('meta_stmt -> meta_hook_file_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',48),
+  ('meta_stmt -> meta_keywords_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',49),
+  ('meta_stmt -> meta_license_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',50),
+  ('meta_stmt -> meta_maintainer_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',51),
+  ('meta_stmt -> meta_maintainer_email_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',52),
+  ('meta_stmt -> meta_name_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',53),
+  ('meta_stmt -> meta_platforms_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',54),
+  ('meta_stmt -> meta_recurse_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',55),
+  ('meta_stmt -> meta_summary_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',56),
+  ('meta_stmt -> meta_meta_template_files_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',57),
+  ('meta_stmt -> meta_use_backends_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',58),
+  ('meta_stmt -> meta_url_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',59),
+  ('meta_stmt -> meta_version_stmt','meta_stmt',1,'p_meta_stmt','/root/package/bento/parser/rules.py',60),
+  ('meta_description_stmt -> DESCRIPTION_ID COLON MULTILINES_STRING','meta_description_stmt',3,'p_meta_description','/root/package/bento/parser/rules.py',65),
+  ('meta_description_stmt -> DESCRIPTION_ID COLON INDENT MULTILINES_STRING DEDENT','meta_description_stmt',5,'p_meta_description_indented','/root/package/bento/parser/rules.py',70),
+  ('meta_name_stmt -> NAME_ID COLON WORD','meta_name_stmt',3,'p_meta_name_stmt','/root/package/bento/parser/rules.py',75),
+  ('meta_summary_stmt -> SUMMARY_ID COLON STRING','meta_summary_stmt',3,'p_meta_summary_stmt','/root/package/bento/parser/rules.py',80),
+  ('meta_url_stmt -> URL_ID COLON WORD','meta_url_stmt',3,'p_meta_url_stmt','/root/package/bento/parser/rules.py',85),
+  ('meta_download_url_stmt -> DOWNLOAD_URL_ID COLON WORD','meta_download_url_stmt',3,'p_meta_download_url_stmt','/root/package/bento/parser/rules.py',90),
+  ('meta_author_stmt -> AUTHOR_ID COLON STRING','meta_author_stmt',3,'p_meta_author_stmt','/root/package/bento/parser/rules.py',95),
+  ('meta_author_email_stmt -> AUTHOR_EMAIL_ID COLON WORD','meta_author_email_stmt',3,'p_meta_author_email_stmt','/root/package/bento/parser/rules.py',100),
+  ('meta_maintainer_stmt -> MAINTAINER_ID COLON STRING','meta_maintainer_stmt',3,'p_meta_maintainer_stmt','/root/package/bento/parser/rules.py',105),
+  ('meta_maintainer_email_stmt -> MAINTAINER_EMAIL_ID COLON WORD','meta_maintainer_email_stmt',3,'p_meta_maintainer_email_stmt','/root/package/bento/parser/rules.py',110),
+  ('meta_license_stmt -> LICENSE_ID COLON STRING','meta_license_stmt',3,'p_meta_license_stmt','/root/package/bento/parser/rules.py',115),
+  ('meta_description_from_file_stmt -> DESCRIPTION_FROM_FILE_ID COLON WORD','meta_description_from_file_stmt',3,'p_meta_description_from_file_stmt','/root/package/bento/parser/rules.py',120),
+  ('meta_platforms_stmt -> PLATFORMS_ID COLON scomma_list','meta_platforms_stmt',3,'p_meta_platforms_stmt','/root/package/bento/parser/rules.py',124),
+  ('meta_keywords_stmt -> KEYWORDS_ID COLON wcomma_list','meta_keywords_stmt',3,'p_meta_keywords_stmt','/root/package/bento/parser/rules.py',129),
+  ('meta_version_stmt -> VERSION_ID COLON version','meta_version_stmt',3,'p_meta_version_stmt','/root/package/bento/parser/rules.py',134),
+  ('meta_config_py_stmt -> CONFIG_PY_ID COLON WORD','meta_config_py_stmt',3,'p_meta_config_py_stmt','/root/package/bento/parser/rules.py',139),
+  ('meta_meta_template_files_stmt -> META_TEMPLATE_FILE_ID COLON WORD','meta_meta_template_files_stmt',3,'p_meta_meta_template_file_stmt','/root/package/bento/parser/rules.py',144),
+  ('meta_meta_template_files_stmt -> META_TEMPLATE_FILES_ID COLON wcomma_list','meta_meta_template_files_stmt',3,'p_meta_meta_template_files_stmt','/root/package/bento/parser/rules.py',150),
+  ('meta_classifiers_stmt -> CLASSIFIERS_ID COLON classifiers_list','meta_classifiers_stmt',3,'p_meta_classifiers_stmt','/root/package/bento/parser/rules.py',155),
+  ('classifiers_list -> indented_classifiers_list','classifiers_list',1,'p_classifiers_list','/root/package/bento/parser/rules.py',159),
+  ('classifiers_list -> classifiers','classifiers_list',1,'p_classifiers_list_term','/root/package/bento/parser/rules.py',164),
+  ('indented_classifiers_list -> classifiers COMMA INDENT classifiers DEDENT','indented_classifiers_list',5,'p_indented_comma_list1','/root/package/bento/parser/rules.py',169),
+  ('indented_classifiers_list -> INDENT classifiers DEDENT','indented_classifiers_list',3,'p_indented_comma_list2','/root/package/bento/parser/rules.py',175),
+  ('classifiers -> classifiers COMMA classifier','classifiers',3,'p_classifiers','/root/package/bento/parser/rules.py',180),
+  ('classifiers -> classifier','classifiers',1,'p_classifiers_term','/root/package/bento/parser/rules.py',185),
+  ('classifier -> STRING','classifier',1,'p_classifier','/root/package/bento/parser/rules.py',189),
+  ('meta_hook_file_stmt -> HOOK_FILE_ID COLON wcomma_list','meta_hook_file_stmt',3,'p_meta_hook_file_stmt','/root/package/bento/parser/rules.py',193),
+  ('meta_recurse_stmt -> RECURSE_ID COLON wcomma_list','meta_recurse_stmt',3,'p_meta_subento_stmt','/root/package/bento/parser/rules.py',198),
+  ('meta_use_backends_stmt -> USE_BACKENDS_ID COLON wcomma_list','meta_use_backends_stmt',3,'p_meta_use_backends_stmt','/root/package/bento/parser/rules.py',202),
+  ('extra_source_files -> EXTRA_SOURCE_FILES_ID COLON wcomma_list','extra_source_files',3,'p_extra_source_files','/root/package/bento/parser/rules.py',209),
+  ('data_files -> data_files_declaration INDENT data_files_stmts DEDENT','data_files',4,'p_data_files','/root/package/bento/parser/rules.py',213),
+  ('data_files_declaration -> DATAFILES_ID COLON WORD','data_files_declaration',3,'p_data_files_declaration','/root/package/bento/parser/rules.py',219),
+  ('data_files_stmts -> data_files_stmts data_files_stmt','data_files_stmts',2,'p_data_files_stmts','/root/package/bento/parser/rules.py',223),
+  ('data_files_stmts -> data_files_stmt','data_files_stmts',1,'p_data_files_stmts_term','/root/package/bento/parser/rules.py',227),
+  ('data_files_stmt -> data_files_target','data_files_stmt',1,'p_data_files_stmt','/root/package/bento/parser/rules.py',231),
+  ('data_files_stmt -> data_files_files','data_files_stmt',1,'p_data_files_stmt','/root/package/bento/parser/rules.py',232),
+  ('data_files_stmt -> data_files_srcdir','data_files_stmt',1,'p_data_files_stmt','/root/package/bento/parser/rules.py',233),
+  ('data_files_target -> TARGET_ID COLON WORD','data_files_target',3,'p_data_files_target','/root/package/bento/parser/rules.py',238),
+  ('data_files_srcdir -> SRCDIR_ID COLON WORD','data_files_srcdir',3,'p_data_files_srcdir','/root/package/bento/parser/rules.py',242),
+  ('data_files_files -> FILES_ID COLON wcomma_list','data_files_files',3,'p_data_files_files','/root/package/bento/parser/rules.py',246),
+  ('flag -> flag_declaration INDENT flag_stmts DEDENT','flag',4,'p_flag','/root/package/bento/parser/rules.py',253),
+  ('flag_declaration -> FLAG_ID COLON WORD','flag_declaration',3,'p_flag_declaration','/root/package/bento/parser/rules.py',257),
+  ('flag_stmts -> flag_stmts flag_stmt','flag_stmts',2,'p_flag_stmts','/root/package/bento/parser/rules.py',261),
+  ('flag_stmts -> flag_stmt','flag_stmts',1,'p_flag_stmts_term','/root/package/bento/parser/rules.py',265),
+  ('flag_stmt -> flag_description','flag_stmt',1,'p_flag_stmt','/root/package/bento/parser/rules.py',269),
+  ('flag_stmt -> flag_default','flag_stmt',1,'p_flag_stmt','/root/package/bento/parser/rules.py',270),
+  ('flag_description -> DESCRIPTION_ID COLON STRING','flag_description',3,'p_flag_description','/root/package/bento/parser/rules.py',274),
+  ('flag_default -> DEFAULT_ID COLON WORD','flag_default',3,'p_flag_default','/root/package/bento/parser/rules.py',278),
+  ('path -> path_declaration INDENT path_stmts DEDENT','path',4,'p_path','/root/package/bento/parser/rules.py',285),
+  ('path_declaration -> PATH_ID COLON WORD','path_declaration',3,'p_path_declaration','/root/package/bento/parser/rules.py',289),
+  ('path_stmts -> path_stmts path_stmt','path_stmts',2,'p_path_stmts','/root/package/bento/parser/rules.py',293),
+  ('path_stmts -> path_stmt','path_stmts',1,'p_path_stmts_term','/root/package/bento/parser/rules.py',297),
+  ('path_stmt -> path_description','path_stmt',1,'p_path_stmt','/root/package/bento/parser/rules.py',301),
+  ('path_stmt -> path_default','path_stmt',1,'p_path_stmt','/root/package/bento/parser/rules.py',302),
+  ('path_stmt -> conditional_stmt','path_stmt',1,'p_path_stmt','/root/package/bento/parser/rules.py',303),
+  ('path_description -> DESCRIPTION_ID COLON STRING','path_description',3,'p_path_description','/root/package/bento/parser/rules.py',307),
+  ('path_default -> DEFAULT_ID COLON WORD','path_default',3,'p_path_default','/root/package/bento/parser/rules.py',312),
+  ('library -> library_declaration INDENT library_stmts DEDENT','library',4,'p_library','/root/package/bento/parser/rules.py',319),
+  ('library -> library_declaration','library',1,'p_library_decl_only','/root/package/bento/parser/rules.py',325),
+  ('library_declaration -> LIBRARY_ID COLON library_name','library_declaration',3,'p_library_declaration','/root/package/bento/parser/rules.py',330),
+  ('library_name -> WORD','library_name',1,'p_library_name','/root/package/bento/parser/rules.py',334),
+  ('library_name -> <empty>','library_name',0,'p_library_name','/root/package/bento/parser/rules.py',335),
+  ('library_stmts -> library_stmts library_stmt','library_stmts',2,'p_library_stmts','/root/package/bento/parser/rules.py',343),
+  ('library_stmts -> library_stmt','library_stmts',1,'p_library_stmts_term','/root/package/bento/parser/rules.py',350),
+  ('library_stmt -> build_requires_stmt','library_stmt',1,'p_library_stmt','/root/package/bento/parser/rules.py',355),
+  ('library_stmt -> compiled_library_stmt','library_stmt',1,'p_library_stmt','/root/package/bento/parser/rules.py',356),
+  ('library_stmt -> conditional_stmt','library_stmt',1,'p_library_stmt','/root/package/bento/parser/rules.py',357),
+  ('library_stmt -> extension_stmt','library_stmt',1,'p_library_stmt','/root/package/bento/parser/rules.py',358),
+  ('library_stmt -> modules_stmt','library_stmt',1,'p_library_stmt','/root/package/bento/parser/rules.py',359),
+  ('library_stmt -> packages_stmt','library_stmt',1,'p_library_stmt','/root/package/bento/parser/rules.py',360),
+  ('library_stmt -> sub_directory_stmt','library_stmt',1,'p_library_stmt','/root/package/bento/parser/rules.py',361),
+  ('packages_stmt -> PACKAGES_ID COLON wcomma_list','packages_stmt',3,'p_packages_stmt','/root/package/bento/parser/rules.py',366),
+  ('modules_stmt -> MODULES_ID COLON wcomma_list','modules_stmt',3,'p_modules_stmt','/root/package/bento/parser/rules.py',370),
+  ('sub_directory_stmt -> SUB_DIRECTORY_ID COLON WORD','sub_directory_stmt',3,'p_sub_directory_stmt','/root/package/bento/parser/rules.py',374),
+  ('extension_stmt -> extension_decl INDENT extension_field_stmts DEDENT','extension_stmt',4,'p_extension_stmt_content','/root/package/bento/parser/rules.py',378),
+  ('extension_field_stmts -> extension_field_stmts extension_field_stmt','extension_field_stmts',2,'p_extension_field_stmts','/root/package/bento/parser/rules.py',383),
+  ('extension_field_stmts -> extension_field_stmt','extension_field_stmts',1,'p_extension_field_stmts_term','/root/package/bento/parser/rules.py',389),
+  ('extension_decl -> EXTENSION_ID COLON WORD','extension_decl',3,'p_extension_decl','/root/package/bento/parser/rules.py',393),
+  ('extension_field_stmt -> SOURCES_ID COLON wcomma_list','extension_field_stmt',3,'p_extension_sources','/root/package/bento/parser/rules.py',397),
+  ('extension_field_stmt -> INCLUDE_DIRS_ID COLON wcomma_list','extension_field_stmt',3,'p_extension_include_dirs','/root/package/bento/parser/rules.py',401),
+  ('compiled_library_stmt -> compiled_library_decl INDENT compiled_library_field_stmts DEDENT','compiled_library_stmt',4,'p_compiled_library_stmt_content','/root/package/bento/parser/rules.py',405),
+  ('compiled_library_field_stmts -> compiled_library_field_stmts compiled_library_field_stmt','compiled_library_field_stmts',2,'p_compiled_library_field_stmts','/root/package/bento/parser/rules.py',410),
+  ('compiled_library_field_stmts -> compiled_library_field_stmt','compiled_library_field_stmts',1,'p_compiled_library_field_stmts_term','/root/package/bento/parser/rules.py',416),
+  ('compiled_library_decl -> COMPILED_LIBRARY_ID COLON WORD','compiled_library_decl',3,'p_compiled_library_decl','/root/package/bento/parser/rules.py',420),
+  ('compiled_library_field_stmt -> SOURCES_ID COLON wcomma_list','compiled_library_field_stmt',3,'p_compiled_library_sources','/root/package/bento/parser/rules.py',424),
+  ('compiled_library_field_stmt -> INCLUDE_DIRS_ID COLON wcomma_list','compiled_library_field_stmt',3,'p_compiled_library_include_dirs','/root/package/bento/parser/rules.py',428),
+  ('build_requires_stmt -> BUILD_REQUIRES_ID COLON scomma_list','build_requires_stmt',3,'p_build_requires_stmt','/root/package/bento/parser/rules.py',432),
+  ('build_requires_stmt -> INSTALL_REQUIRES_ID COLON scomma_list','build_requires_stmt',3,'p_install_requires_stmt','/root/package/bento/parser/rules.py',436),
+  ('in_conditional_stmts -> library_stmts','in_conditional_stmts',1,'p_in_conditional_stmts','/root/package/bento/parser/rules.py',443),
+  ('in_conditional_stmts -> path_stmts','in_conditional_stmts',1,'p_in_conditional_stmts','/root/package/bento/parser/rules.py',444),
+  ('conditional_stmt -> IF test COLON INDENT in_conditional_stmts DEDENT','conditional_stmt',6,'p_conditional_if_only','/root/package/bento/parser/rules.py',449),
+  ('conditional_stmt -> IF test COLON INDENT in_conditional_stmts DEDENT ELSE COLON INDENT in_conditional_stmts DEDENT','conditional_stmt',11,'p_conditional_if_else','/root/package/bento/parser/rules.py',453),
+  ('test -> bool','test',1,'p_test','/root/package/bento/parser/rules.py',459),
+  ('test -> os_var','test',1,'p_test','/root/package/bento/parser/rules.py',460),
+  ('test -> flag_var','test',1,'p_test','/root/package/bento/parser/rules.py',461),
+  ('os_var -> OS_OP LPAR WORD RPAR','os_var',4,'p_os_var','/root/package/bento/parser/rules.py',465),
+  ('flag_var -> FLAG_OP LPAR WORD RPAR','flag_var',4,'p_flag_var','/root/package/bento/parser/rules.py',469),
+  ('flag_var -> NOT_OP FLAG_OP LPAR WORD RPAR','flag_var',5,'p_not_flag_var','/root/package/bento/parser/rules.py',473),
+  ('bool -> TRUE','bool',1,'p_cond_expr_true','/root/package/bento/parser/rules.py',477),
+  ('bool -> NOT_OP FALSE','bool',2,'p_cond_expr_true_not','/root/package/bento/parser/rules.py',481),
+  ('bool -> FALSE','bool',1,'p_cond_expr_false','/root/package/bento/parser/rules.py',485),
+  ('bool -> NOT_OP TRUE','bool',2,'p_cond_expr_false_not','/root/package/bento/parser/rules.py',489),
+  ('exec -> exec_decl INDENT exec_stmts DEDENT','exec',4,'p_executable','/root/package/bento/parser/rules.py',496),
+  ('exec_decl -> EXECUTABLE_ID COLON WORD','exec_decl',3,'p_exec_declaration','/root/package/bento/parser/rules.py',500),
+  ('exec_stmts -> exec_stmts exec_stmt','exec_stmts',2,'p_exec_stmts','/root/package/bento/parser/rules.py',504),
+  ('exec_stmts -> exec_stmt','exec_stmts',1,'p_exec_stmts_term','/root/package/bento/parser/rules.py',508),
+  ('exec_stmt -> function','exec_stmt',1,'p_exec_stmt','/root/package/bento/parser/rules.py',512),
+  ('exec_stmt -> module','exec_stmt',1,'p_exec_stmt','/root/package/bento/parser/rules.py',513),
+  ('module -> MODULE_ID COLON WORD','module',3,'p_exec_module','/root/package/bento/parser/rules.py',517),
+  ('function -> FUNCTION_ID COLON WORD','function',3,'p_exec_function','/root/package/bento/parser/rules.py',521),
+  ('wcomma_list -> comma_words COMMA INDENT comma_words DEDENT','wcomma_list',5,'p_wcomma_list_indented','/root/package/bento/parser/rules.py',526),
+  ('wcomma_list -> INDENT comma_words DEDENT','wcomma_list',3,'p_wcomma_list_indented2','/root/package/bento/parser/rules.py',531),
+  ('wcomma_list -> comma_words','wcomma_list',1,'p_wcomma_list','/root/package/bento/parser/rules.py',536),
+  ('comma_words -> comma_words COMMA WORD','comma_words',3,'p_comma_words','/root/package/bento/parser/rules.py',552),
+  ('comma_words -> WORD','comma_words',1,'p_comma_words_term','/root/package/bento/parser/rules.py',558),
+  ('scomma_list -> indented_scomma_list','scomma_list',1,'p_scomma_list_indented','/root/package/bento/parser/rules.py',564),
+  ('scomma_list -> comma_strings','scomma_list',1,'p_scomma_list','/root/package/bento/parser/rules.py',569),
+  ('indented_scomma_list -> comma_strings COMMA INDENT comma_strings DEDENT','indented_scomma_list',5,'p_indented_scomma_list','/root/package/bento/parser/rules.py',574),
+  ('indented_scomma_list -> INDENT comma_strings DEDENT','indented_scomma_list',3,'p_indented_scomma_list_term','/root/package/bento/parser/rules.py',580),
+  ('comma_strings -> comma_strings COMMA STRING','comma_strings',3,'p_comma_strings','/root/package/bento/parser/rules.py',585),
+  ('comma_strings -> STRING','comma_strings',1,'p_comma_strings_term','/root/package/bento/parser/rules.py',591),
+  ('version -> WORD','version',1,'p_version','/root/package/bento/parser/rules.py',597),
+]
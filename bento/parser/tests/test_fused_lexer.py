@@ -0,0 +1,61 @@
+import os
+import glob
+
+from bento.parser.lexer \
+    import \
+        BentoLexer
+from bento.parser.fused_lexer \
+    import \
+        FusedBentoLexer
+
+from bento.compat.api.moves import unittest
+
+import bento.parser.tests.test_lexer as test_lexer
+
+# Run the whole BentoLexer test suite against FusedBentoLexer
+class TestLexerStageOne(test_lexer.TestLexerStageOne):
+    lexer_class = FusedBentoLexer
+
+class TestLexerStageTwo(test_lexer.TestLexerStageTwo):
+    lexer_class = FusedBentoLexer
+
+class TestLexerStageThree(test_lexer.TestLexerStageThree):
+    lexer_class = FusedBentoLexer
+
+class TestLexerStageFour(test_lexer.TestLexerStageFour):
+    lexer_class = FusedBentoLexer
+
+class TestMultilineString(test_lexer.TestMultilineString):
+    lexer_class = FusedBentoLexer
+
+class TestLexerStageFive(test_lexer.TestLexerStageFive):
+    lexer_class = FusedBentoLexer
+
+class TestNewLines(test_lexer.TestNewLines):
+    lexer_class = FusedBentoLexer
+
+class TestComment(test_lexer.TestComment):
+    lexer_class = FusedBentoLexer
+
+class TestMeta(test_lexer.TestMeta):
+    lexer_class = FusedBentoLexer
+
+class TestErrorHandling(test_lexer.TestErrorHandling):
+    lexer_class = FusedBentoLexer
+
+FUNCTIONALS = os.path.join(os.path.dirname(__file__), "functionals")
+
+class TestSameTokens(unittest.TestCase):
+    def _tokens(self, lexer, data):
+        lexer.input(data)
+        return [(t.type, t.value, t.lineno, t.lexpos) for t in lexer]
+
+    def test_functionals(self):
+        for info in glob.glob(os.path.join(FUNCTIONALS, "*.info")):
+            fid = open(info)
+            try:
+                data = fid.read()
+            finally:
+                fid.close()
+            self.assertEqual(self._tokens(FusedBentoLexer(), data),
+                             self._tokens(BentoLexer(), data))
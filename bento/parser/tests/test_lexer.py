@@ -19,8 +19,10 @@ def split(s):
     return ret
 
 class TestLexer(TestCase):
+    lexer_class = BentoLexer
+
     def setUp(self):
-        self.lexer = BentoLexer()
+        self.lexer = self.lexer_class()
 
     def _test(self, data, ref):
         self.lexer.input(data)
@@ -55,7 +57,7 @@ class TestLexer(TestCase):
 # Test tokenizer stage before indentation generation
 class TestLexerStageOne(TestLexer):
     def setUp(self):
-        self.lexer = BentoLexer()
+        self.lexer = self.lexer_class()
 
     def test_single_line(self):
         data = """\
@@ -82,7 +84,7 @@ Library:
 
 class TestLexerStageTwo(TestLexer):
     def setUp(self):
-        self.lexer = BentoLexer()
+        self.lexer = self.lexer_class()
 
     def test_simple(self):
         data = "yoyo"
@@ -118,7 +120,7 @@ class TestLexerStageTwo(TestLexer):
 
 class TestLexerStageThree(TestLexer):
     def setUp(self):
-        self.lexer = BentoLexer()
+        self.lexer = self.lexer_class()
 
     def test_simple(self):
         data = "yoyo"
@@ -164,7 +166,7 @@ class TestLexerStageThree(TestLexer):
 
 class TestLexerStageFour(TestLexer):
     def setUp(self):
-        self.lexer = BentoLexer()
+        self.lexer = self.lexer_class()
 
     def test_single_line(self):
         data = """\
@@ -360,7 +362,7 @@ DEDENT
 
 class TestLexerStageFive(TestLexer):
     def setUp(self):
-        self.lexer = BentoLexer()
+        self.lexer = self.lexer_class()
 
     def test_single_line(self):
         data = """\
@@ -795,7 +797,7 @@ DEDENT
 
 class TestNewLines(TestLexer):
     def setUp(self):
-        self.lexer = BentoLexer()
+        self.lexer = self.lexer_class()
 
     # Test we throw away NEWLINES except in literals
     def test_lastnewline(self):
@@ -855,7 +857,7 @@ tool""")
 
 class TestComment(TestLexer):
     def setUp(self):
-        self.lexer = BentoLexer()
+        self.lexer = self.lexer_class()
 
     def test_simple(self):
         data = """\
@@ -1,6 +1,8 @@
 import os
+import shutil
 import tempfile
-import stat
+
+import mock
 
 import os.path as op
 
@@ -24,7 +26,7 @@ from bento.compat.api \
         NamedTemporaryFile
 from bento.errors \
     import \
-        BentoError, ParseError
+        ParseError
 
 from bento.parser import parser as parser_module
 
@@ -124,60 +126,46 @@ Path: foo
             os.close(fid)
             os.remove(filename)
 
-class TestParserCaching(unittest.TestCase):
+class TestParserTables(unittest.TestCase):
     def setUp(self):
-        wdir = tempfile.mkdtemp()
-        self.subwdir= "bar"
         self.old = os.getcwd()
-        os.chdir(wdir)
+        self.d = tempfile.mkdtemp()
+        os.chdir(self.d)
 
     def tearDown(self):
         os.chdir(self.old)
-
-    def test_no_cached_failure(self):
-        """Ensure we raise an error when the cached parser file does not exists
-        and we cannot create one."""
-        os.makedirs(self.subwdir)
-        os.chmod(self.subwdir, stat.S_IREAD | stat.S_IEXEC)
-        parsetab = op.join(self.subwdir, "parsetab")
-
-        old_parsetab = parser_module._PICKLED_PARSETAB
+        shutil.rmtree(self.d)
+
+    def _parse(self):
+        p = parser_module.Parser()
+        self.assertTrue(p.parse("Name: foo") is not None)
+
+    def test_tables_up_to_date(self):
+        """Ensure the shipped tables match the grammar (run
+        tools/generate_parsetab.py if this fails)."""
+        import bento.parser.parsetab
+        self.assertEqual(bento.parser.parsetab._lr_signature,
+                         parser_module._grammar_signature())
+
+    def test_no_reflection(self):
+        """Ensure creating a parser does not reflect the grammar nor write
+        anything."""
+        p = mock.patch("ply.yacc.ParserReflect")
+        mocked = p.start()
         try:
-            parser_module._PICKLED_PARSETAB = parsetab
-            try:
-                parser_module.Parser()
-                self.assertTrue(len(self._list_files()) == 0, "Ply created a cached file in CWD")
-                self.fail("Expected an error when creating a parser in read-only dir !")
-            except BentoError:
-                pass
+            self._parse()
         finally:
-            parser_module._PICKLED_PARSETAB = old_parsetab
-
-    def _list_files(self):
-        """Return the list of files in cwd (including subdirectories)."""
-        created_files = []
-        for root, dirs, files in os.walk(os.getcwd()):
-            created_files.extend([op.join(root, f) for f in files])
-        return created_files
-
-    def test_read_only_cached(self):
-        """Test that we can create a parser backed by a read-only parsetab
-        file."""
-        os.makedirs(self.subwdir)
-        parsetab = op.join(self.subwdir, "parsetab")
-
-        old_parsetab = parser_module._PICKLED_PARSETAB
+            p.stop()
+        self.assertFalse(mocked.called)
+        self.assertEqual(os.listdir(self.d), [])
+
+    def test_missing_tables(self):
+        """Ensure we can still parse, without writing anything, if the tables
+        cannot be loaded."""
+        old_module = parser_module._PARSETAB_MODULE
         try:
-            parser_module._PICKLED_PARSETAB = parsetab
-            parser_module.Parser()
-            self.assertEqual(self._list_files(), [op.abspath(parsetab)])
-
-            os.chmod(self.subwdir, stat.S_IREAD | stat.S_IEXEC)
-            os.chmod(parsetab, stat.S_IREAD)
-
-            parser_module.Parser()
-            # This ensures ply did not write another cached file behind our back
-            self.assertEqual(self._list_files(), [op.abspath(parsetab)],
-                             "Ply created another cached parsetab file !")
+            parser_module._PARSETAB_MODULE = "bento.parser.nonexistent_parsetab"
+            self._parse()
         finally:
-            parser_module._PICKLED_PARSETAB = old_parsetab
+            parser_module._PARSETAB_MODULE = old_module
+        self.assertEqual(os.listdir(self.d), [])
@@ -4,6 +4,17 @@ import builtins
 import io
 import py_compile
 import marshal
+import struct
+
+try:
+    MAGIC = py_compile.MAGIC
+except AttributeError:
+    # python >= 3.4
+    from importlib.util import MAGIC_NUMBER as MAGIC
+
+def _wr_long(f, x):
+    """Internal; write a 32-bit int to a file in little-endian order."""
+    f.write(struct.pack("<I", x & 0xFFFFFFFF))
 
 if sys.version_info[:2] < (3, 2):
     def _bcompile(file, cfile=None, dfile=None, doraise=False):
@@ -29,15 +40,15 @@ if sys.version_info[:2] < (3, 2):
         fc = io.BytesIO()
         try:
             fc.write(b'\0\0\0\0')
-            py_compile.wr_long(fc, timestamp)
+            _wr_long(fc, timestamp)
             marshal.dump(codeobject, fc)
             fc.flush()
             fc.seek(0, 0)
-            fc.write(py_compile.MAGIC)
+            fc.write(MAGIC)
             return fc.getvalue()
         finally:
             fc.close()
-else:
+elif sys.version_info[:2] < (3, 7):
     import tokenize
     import imp
     import errno
@@ -71,11 +82,39 @@ else:
         fc = io.BytesIO()
         try:
             fc.write(b'\0\0\0\0')
-            py_compile.wr_long(fc, timestamp)
+            _wr_long(fc, timestamp)
             marshal.dump(codeobject, fc)
             fc.flush()
             fc.seek(0, 0)
-            fc.write(py_compile.MAGIC)
+            fc.write(MAGIC)
+            return fc.getvalue()
+        finally:
+            fc.close()
+
+else:
+    import tokenize
+    def _bcompile(file, cfile=None, dfile=None, doraise=False, optimize=-1):
+        with tokenize.open(file) as f:
+            st = os.fstat(f.fileno())
+            codestring = f.read()
+        try:
+            codeobject = builtins.compile(codestring, dfile or file, 'exec',
+                                          optimize=optimize)
+        except Exception as err:
+            py_exc = py_compile.PyCompileError(err.__class__, err, dfile or file)
+            if doraise:
+                raise py_exc
+            else:
+                sys.stderr.write(py_exc.msg + '\n')
+                return
+        fc = io.BytesIO()
+        try:
+            fc.write(MAGIC)
+            # Timestamp based pyc (PEP 552)
+            _wr_long(fc, 0)
+            _wr_long(fc, int(st.st_mtime))
+            _wr_long(fc, st.st_size)
+            marshal.dump(codeobject, fc)
             return fc.getvalue()
         finally:
             fc.close()
@@ -17,5 +17,7 @@ HOOK_DUMP = ".hooks.pck"
 
 CONFIG_CACHE = ".config.pck"
 BUILD_CACHE = ".build.pck"
+INCLUDE_CACHE = ".includes.pck"
+TIMINGS_CACHE = ".timings.pck"
 
 _OUTPUT = sys.stdout
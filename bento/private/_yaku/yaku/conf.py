@@ -11,17 +11,23 @@ if sys.version_info[0] < 3:
     from cStringIO \
         import \
             StringIO
+    from cPickle \
+        import \
+            dumps
 else:
     from io \
         import \
             StringIO
+    from pickle \
+        import \
+            dumps
 
 from yaku.errors \
     import \
         UnknownTask
 from yaku.utils \
     import \
-        ensure_dir
+        ensure_dir, is_string, program_identity, function_code
 
 def create_file(conf, code, prefix="", suffix=""):
     filename = "%s%s%s" % (prefix, md5(code.encode()).hexdigest(), suffix)
@@ -74,10 +80,39 @@ def write_log(conf, log, tasks, code, succeed, explanation):
     log.write("\n")
 
 def create_conf_blddir(conf, name, body):
-    dirname = ".conf-%s-%s" % (name, hash(name+body))
+    # hash() is randomized across processes on python 3: the directory name
+    # must be stable for the tasks results to be reused by the next configure
+    dirname = ".conf-%s-%s" % (name, md5((name+body).encode()).hexdigest()[:16])
     bld_root = os.path.join(conf.bld_root.abspath(), dirname)
     if not os.path.exists(bld_root):
         os.makedirs(bld_root)
     bld_root = conf.bld_root.make_node(dirname)
     old_root = conf.bld_root
     return old_root, bld_root
+
+def check_key(tasks, code):
+    """Return the key of the configuration test made of the given tasks, in
+    the configure context check_cache.
+
+    The key covers the tested code, the variables used in the commands of
+    each task (flags, include paths, etc...) and the identity of the program
+    run by each task (the first variable of the command, e.g. CC), so that a
+    cached outcome is not reused once the toolchain or the flags change.
+
+    Only successful tests are cached: the key does not cover the probed
+    headers and libraries, so that failed tests are run again by the next
+    configure, in case the missing ones were installed since."""
+    m = md5()
+    m.update(code.encode())
+    for t in tasks:
+        m.update(t.__class__.__name__.encode())
+        for k in t.env_vars:
+            m.update(dumps(t.env.get(k, [])))
+        if t.env_vars:
+            program = t.env.get(t.env_vars[0], [])
+            if not is_string(program):
+                program = program and program[0] or ""
+            m.update(program_identity(program).encode())
+        if t.func:
+            m.update(function_code(t.func).co_code)
+    return m.hexdigest()
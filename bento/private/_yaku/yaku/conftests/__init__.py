@@ -16,7 +16,8 @@ from yaku.utils \
 from yaku.conftests.conftests \
     import \
        check_compiler, check_type, check_header, check_func, \
-       check_lib, check_type_size, define, check_funcs_at_once, check_cpp_symbol
+       check_lib, check_type_size, define, check_funcs_at_once, check_cpp_symbol, \
+       run_checks_parallel
 
 VALUE_SUB = re.compile('[^A-Z0-9_]')
 
@@ -1,5 +1,60 @@
+import sys
 import copy
 
+if sys.version_info[0] < 3:
+    from cStringIO \
+        import \
+            StringIO
+else:
+    from io \
+        import \
+            StringIO
+
+from yaku._config \
+    import \
+        _OUTPUT
+from yaku.conf \
+    import \
+        create_conf_blddir, write_log, check_key
+from yaku.errors \
+    import \
+        TaskRunFailure
+from yaku.scheduler \
+    import \
+        ParallelRunner
+from yaku.task_manager \
+    import \
+        TaskManager
+from yaku.tools \
+    import \
+        create_try_tasks
+from yaku.utils \
+    import \
+        cpu_count
+
+class TryCompile(object):
+    """Compilation test requested by a check.
+
+    Checks which may run in parallel are written as generators yielding
+    TryCompile instances: the check is resumed once the compilation has been
+    tried, with the outcome in the result attribute. The last value yielded
+    by the check is its result."""
+    def __init__(self, name, code, headers):
+        self.name = name
+        self.code = code
+        self.headers = headers
+        self.result = None
+
+def _run_check(conf, check):
+    ret = None
+    for request in check:
+        if isinstance(request, TryCompile):
+            request.result = conf.builders["ctasks"].try_compile(
+                    request.name, request.code, request.headers)
+        else:
+            ret = request
+    return ret
+
 def check_compiler(conf, msg=None):
     code = """\
 int main(void)
@@ -20,6 +75,9 @@ int main(void)
     return ret
 
 def check_cpp_symbol(conf, symbol, headers=None):
+    return _run_check(conf, _check_cpp_symbol(conf, symbol, headers))
+
+def _check_cpp_symbol(conf, symbol, headers=None):
     code = []
     if headers:
         for h in headers:
@@ -38,16 +96,21 @@ int main()
     src = "\n".join(code)
 
     conf.start_message("Checking for declaration %s" % symbol)
-    ret = conf.builders["ctasks"].try_compile("check_cpp_symbol", src, headers)
+    request = TryCompile("check_cpp_symbol", src, headers)
+    yield request
+    ret = request.result
     conf.conf_results.append({"type": "decl", "value": symbol,
                               "result": ret})
     if ret:
         conf.end_message("yes")
     else:
         conf.end_message("no")
-    return ret
+    yield ret
 
 def check_type(conf, type_name, headers=None):
+    return _run_check(conf, _check_type(conf, type_name, headers))
+
+def _check_type(conf, type_name, headers=None):
     code = r"""
 int main() {
   if ((%(name)s *) 0)
@@ -58,15 +121,16 @@ int main() {
 """ % {'name': type_name}
 
     conf.start_message("Checking for type %s" % type_name)
-    ret = conf.builders["ctasks"].try_compile("check_type", code,
-                        headers)
+    request = TryCompile("check_type", code, headers)
+    yield request
+    ret = request.result
     conf.conf_results.append({"type": "type", "value": type_name,
                               "result": ret})
     if ret:
         conf.end_message("yes")
     else:
         conf.end_message("no")
-    return ret
+    yield ret
 
 def check_type_size(conf, type_name, headers=None, expect=None):
     """\
@@ -86,7 +150,9 @@ def check_type_size(conf, type_name, headers=None, expect=None):
         if given, will test wether the type has the given number of
             bytes.  If not given, will automatically find the size.
     """
+    return _run_check(conf, _check_type_size(conf, type_name, headers, expect))
 
+def _check_type_size(conf, type_name, headers=None, expect=None):
     conf.start_message("Checking for sizeof %s ..." % type_name)
     body = r"""
 typedef %(type)s yaku_check_sizeof_type;
@@ -100,10 +166,12 @@ int main ()
 }
 """ % {"type": type_name}
 
-    ret = conf.builders["ctasks"].try_compile("check_type_size", body, headers)
-    if not ret:
+    request = TryCompile("check_type_size", body, headers)
+    yield request
+    if not request.result:
         conf.end_message("no (cannot compile type)")
-        return False
+        yield False
+        return
 
     if expect is None:
         # this fails to *compile* if size > sizeof(type)
@@ -126,9 +194,9 @@ int main ()
         mid = 0
         while True:
             code = body % {'type': type_name, 'size': mid}
-            ret = conf.builders["ctasks"].try_compile("check_type_size",
-                    code, headers)
-            if ret:
+            request = TryCompile("check_type_size", code, headers)
+            yield request
+            if request.result:
                 break
             #log.info("failure to test for bound %d" % mid)
             low = mid + 1
@@ -137,10 +205,11 @@ int main ()
         high = mid
         # Binary search:
         while low != high:
-            mid = (high - low) / 2 + low
+            mid = (high - low) // 2 + low
             code = body % {'type': type_name, 'size': mid}
-            if conf.builders["ctasks"].try_compile("check_type_size",
-                    code, headers):
+            request = TryCompile("check_type_size", code, headers)
+            yield request
+            if request.result:
                 high = mid
             else:
                 low = mid + 1
@@ -152,7 +221,7 @@ int main ()
 
     conf.conf_results.append({"type": "type_size", "value": type_name,
                               "result": ret})
-    return ret
+    yield ret
 
 def define(conf, name, value=None, comment=None):
     """\
@@ -193,19 +262,24 @@ def define(conf, name, value=None, comment=None):
         "result": True})
 
 def check_header(conf, header):
+    return _run_check(conf, _check_header(conf, header))
+
+def _check_header(conf, header):
     code = r"""
 #include <%s>
 """ % header
 
     conf.start_message("Checking for header %s" % header)
-    ret = conf.builders["ctasks"].try_compile("check_header", code, None)
+    request = TryCompile("check_header", code, None)
+    yield request
+    ret = request.result
     if ret:
         conf.end_message("yes")
     else:
         conf.end_message("no !")
     conf.conf_results.append({"type": "header", "value": header,
                               "result": ret})
-    return ret
+    yield ret
 
 def check_func(conf, func, libs=None):
     if libs is None:
@@ -342,3 +416,181 @@ int main (void)
         conf.conf_results.append({"type": "func", "value": func,
                                   "result": ret})
     return ret
+
+class _CheckContext(object):
+    """Configure context for a check run by run_checks_parallel.
+
+    Messages, configuration log and results are buffered, to be written in the
+    order of the checks once they are finished."""
+    def __init__(self, conf):
+        self.conf = conf
+        self.env = conf.env
+        self.path = conf.path
+        self.builders = conf.builders
+        self.bld_root = conf.bld_root
+        self.conf_results = []
+        self.last_task = None
+        self._message = None
+
+        self.log = StringIO()
+        self.output = StringIO()
+
+    def start_message(self, msg):
+        self.output.write(msg + "... ")
+        self.log.write("=" * 79 + "\n")
+        self.log.write("%s\n" % msg)
+        # Checks run interleaved: they are traced as asynchronous spans
+        tracer = getattr(self.conf, "tracer", None)
+        if tracer is not None:
+            self._message = msg
+            tracer.async_begin(msg, "check", id(self))
+
+    def end_message(self, msg):
+        self.output.write("%s\n" % msg)
+        tracer = getattr(self.conf, "tracer", None)
+        if tracer is not None and self._message is not None:
+            tracer.async_end(self._message, "check", id(self))
+            self._message = None
+
+    def set_cmd_cache(self, task, cmd):
+        self.conf.set_cmd_cache(task, cmd)
+
+    def get_cmd(self, task):
+        return self.conf.get_cmd(task)
+
+    def set_stdout_cache(self, task, stdout):
+        self.conf.set_stdout_cache(task, stdout)
+
+    def get_stdout(self, task):
+        return self.conf.get_stdout(task)
+
+    def flush(self):
+        _OUTPUT.write(self.output.getvalue())
+        self.conf.log.write(self.log.getvalue())
+        self.conf.conf_results.extend(self.conf_results)
+
+class _CheckRun(object):
+    def __init__(self, conf, check, args):
+        self.ctx = _CheckContext(conf)
+        self.check = check(self.ctx, *args)
+        self.request = None
+        self.result = None
+        self.done = False
+
+        self.tasks = []
+        self.code = None
+        self.key = None
+
+    def advance(self):
+        """Run the check until its next compilation test, or until it is
+        finished."""
+        for value in self.check:
+            if isinstance(value, TryCompile):
+                self.request = value
+                return
+            self.result = value
+        self.done = True
+
+    def create_tasks(self):
+        conf = self.ctx.conf
+        request = self.request
+        old_root, new_root = create_conf_blddir(conf, request.name, request.code)
+        # Nodes are declared relatively to the build directory of the node
+        # context: the tasks have to be created in the check build directory
+        self.ctx.bld_root = new_root
+        new_root.ctx.bldnode = new_root
+        try:
+            self.tasks, self.code = create_try_tasks(self.ctx,
+                    conf.builders["ctasks"]._compile, request.name,
+                    request.code, request.headers)
+        finally:
+            new_root.ctx.bldnode = old_root
+        self.key = check_key(self.tasks, self.code)
+
+    def is_cached(self):
+        return self.key in self.ctx.conf.check_cache
+
+    def finish_request(self, failed):
+        check_cache = self.ctx.conf.check_cache
+        if self.key in check_cache:
+            succeed, explanation = check_cache[self.key]
+            self.ctx.log.write("---> Cached result\n")
+        else:
+            explanation = None
+            for t in self.tasks:
+                if t in failed:
+                    explanation = str(TaskRunFailure(t.error_cmd, t.error_msg))
+                    break
+            succeed = explanation is None
+            # Only successes are cached, see try_task_maker
+            if succeed:
+                check_cache[self.key] = (succeed, explanation)
+        write_log(self.ctx, self.ctx.log, self.tasks, self.code, succeed,
+                  explanation)
+        self.request.result = succeed
+
+def run_checks_parallel(conf, checks, maxjobs=None):
+    """Run the given checks concurrently.
+
+    checks is a sequence of (check, arg1, arg2, ...) tuples, where check is
+    one of check_header, check_type, check_type_size or check_cpp_symbol,
+    e.g.::
+
+        run_checks_parallel(conf, [(check_header, "stdio.h"),
+                                   (check_type_size, "long", ["stdio.h"])])
+
+    The compilation tests of all the checks are run together on maxjobs
+    threads (the number of CPUs by default). Messages, configuration log and
+    configuration results are the same, and in the same order, as if the
+    checks were run one after the other.
+
+    Returns the list of the checks results."""
+    if maxjobs is None:
+        maxjobs = cpu_count()
+
+    runs = []
+    for check in checks:
+        try:
+            func = _PARALLEL_CHECKS[check[0]]
+        except KeyError:
+            raise ValueError("Check %r cannot be run in parallel" % check[0])
+        runs.append(_CheckRun(conf, func, check[1:]))
+
+    pending = runs
+    n_flushed = 0
+    while pending:
+        for run in pending:
+            run.advance()
+        pending = [run for run in pending if not run.done]
+
+        # Output the finished checks as soon as the ones before are finished
+        while n_flushed < len(runs) and runs[n_flushed].done:
+            runs[n_flushed].ctx.flush()
+            n_flushed += 1
+
+        if pending:
+            tasks = []
+            for run in pending:
+                run.create_tasks()
+                if not run.is_cached():
+                    tasks.extend(run.tasks)
+            failed = set()
+            if tasks:
+                # Checks are independent: a failed compilation is only the
+                # (negative) result of its check
+                runner = ParallelRunner(conf, TaskManager(tasks), maxjobs,
+                                        keep_going=True)
+                runner.start()
+                runner.run()
+                failed = set(runner.failures)
+
+            for run in pending:
+                run.finish_request(failed)
+
+    return [run.result for run in runs]
+
+_PARALLEL_CHECKS = {
+        check_cpp_symbol: _check_cpp_symbol,
+        check_type: _check_type,
+        check_type_size: _check_type_size,
+        check_header: _check_header}
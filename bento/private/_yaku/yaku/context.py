@@ -14,10 +14,19 @@ else:
 from yaku._config \
     import \
         DEFAULT_ENV, BUILD_CONFIG, BUILD_CACHE, CONFIG_CACHE, HOOK_DUMP, \
-        _OUTPUT
+        INCLUDE_CACHE, TIMINGS_CACHE, _OUTPUT
 from yaku.environment \
     import \
         Environment
+from yaku.signature \
+    import \
+        NodeSignatures
+from yaku.scanner \
+    import \
+        IncludeScanner
+from yaku.timings \
+    import \
+        TaskTimings
 from yaku.tools \
     import \
         import_tools
@@ -71,10 +80,16 @@ class ConfigureContext(object):
         self._tool_modules = {}
         self.builders = {}
         self.cache = {}
+        # check_key -> (succeed, explanation) of the configuration tests
+        # which succeeded
+        self.check_cache = {}
         self.conf_results = []
         self._configured = {}
         self._stdout_cache = {}
         self._cmd_cache = {}
+        # Profiler (see bento.utils.trace.Tracer), if any
+        self.tracer = None
+        self._check_span = None
 
         self.src_root = None
         self.bld_root = None
@@ -117,6 +132,7 @@ class ConfigureContext(object):
         out.append(dumps(self.cache))
         out.append(dumps(self._stdout_cache))
         out.append(dumps(self._cmd_cache))
+        out.append(dumps(self.check_cache))
         config_cache.write(join_bytes(out), flags="wb")
 
         build_config = self.bld_root.make_node(BUILD_CONFIG)
@@ -131,11 +147,21 @@ class ConfigureContext(object):
         _OUTPUT.write(msg + "... ")
         self.log.write("=" * 79 + "\n")
         self.log.write("%s\n" % msg)
+        if self.tracer is not None:
+            self._end_check_span()
+            self._check_span = self.tracer.begin(msg, "check")
 
     def end_message(self, msg):
         _OUTPUT.write("%s\n" % msg)
+        self._end_check_span()
+
+    def _end_check_span(self):
+        if self._check_span is not None:
+            self.tracer.end(self._check_span)
+            self._check_span = None
 
     def fail_configuration(self, msg):
+        self._end_check_span()
         msg = "%s\nPlease look at the configuration log %r" % (msg, self.log.name)
         self.log.flush()
         raise ConfigurationFailure(msg)
@@ -215,6 +241,13 @@ class BuildContext(object):
         self.env = Environment()
         self.tools = []
         self.cache = {}
+        self.node_sigs = NodeSignatures()
+        self.include_scanner = IncludeScanner(self.node_sigs)
+        # ObjectCache instance (opt-in)
+        self.object_cache = None
+        # Profiler (see bento.utils.trace.Tracer), if any
+        self.tracer = None
+        self.timings = TaskTimings()
         self.builders = {}
         self.tasks = []
 
@@ -254,10 +287,37 @@ class BuildContext(object):
             fid = open(build_cache.abspath(), "rb")
             try:
                 self.cache = load(fid)
+                # Caches written before stat signatures were introduced only
+                # contain the task signatures
+                try:
+                    self.node_sigs = NodeSignatures(load(fid))
+                except EOFError:
+                    self.node_sigs = NodeSignatures()
             finally:
                 fid.close()
         else:
             self.cache = {}
+            self.node_sigs = NodeSignatures()
+
+        include_cache = bldnode.find_node(INCLUDE_CACHE)
+        if include_cache is not None:
+            fid = open(include_cache.abspath(), "rb")
+            try:
+                self.include_scanner = IncludeScanner(self.node_sigs, load(fid))
+            finally:
+                fid.close()
+        else:
+            self.include_scanner = IncludeScanner(self.node_sigs)
+
+        timings_cache = bldnode.find_node(TIMINGS_CACHE)
+        if timings_cache is not None:
+            fid = open(timings_cache.abspath(), "rb")
+            try:
+                self.timings = TaskTimings(load(fid))
+            finally:
+                fid.close()
+        else:
+            self.timings = TaskTimings()
 
         hook_dump = bldnode.find_node(HOOK_DUMP)
         fid = open(hook_dump.abspath(), "rb")
@@ -273,10 +333,30 @@ class BuildContext(object):
         tmp_fid = open(build_cache.abspath() + ".tmp", "wb")
         try:
             dump(self.cache, tmp_fid)
+            dump(self.node_sigs.entries, tmp_fid)
         finally:
             tmp_fid.close()
         rename(build_cache.abspath() + ".tmp", build_cache.abspath())
 
+        include_cache = self.bld_root.make_node(INCLUDE_CACHE)
+        tmp_fid = open(include_cache.abspath() + ".tmp", "wb")
+        try:
+            dump(self.include_scanner.entries, tmp_fid)
+        finally:
+            tmp_fid.close()
+        rename(include_cache.abspath() + ".tmp", include_cache.abspath())
+
+        timings_cache = self.bld_root.make_node(TIMINGS_CACHE)
+        tmp_fid = open(timings_cache.abspath() + ".tmp", "wb")
+        try:
+            dump(self.timings.entries, tmp_fid)
+        finally:
+            tmp_fid.close()
+        rename(timings_cache.abspath() + ".tmp", timings_cache.abspath())
+
+        if self.object_cache is not None:
+            self.object_cache.flush()
+
     def set_stdout_cache(self, task, stdout):
         pass
 
@@ -297,6 +377,11 @@ def get_cfg(src_path=None, build_path="build"):
             ctx.cache = load(fid)
             ctx._stdout_cache = load(fid)
             ctx._cmd_cache = load(fid)
+            try:
+                ctx.check_cache = load(fid)
+            except EOFError:
+                # Cache written before configuration tests were cached
+                pass
         finally:
             fid.close()
 
@@ -0,0 +1,231 @@
+"""Content-addressed cache for compiled objects (a la ccache).
+
+Objects are indexed by a hash of the preprocessed source and of the compilation
+command line, so that the same cache directory may be shared between build
+directories and source checkouts. The cache is bounded in size, least recently
+used entries being removed first.
+
+Only gcc-like compilers (which understand -E and are given the target with -o)
+are supported: other compilation commands are run as usual.
+"""
+import os
+import shutil
+import threading
+
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5
+
+from subprocess \
+    import \
+        Popen, PIPE
+
+from yaku.utils \
+    import \
+        program_identity, rename
+
+# 1 Gb
+DEFAULT_MAX_SIZE = 2 ** 30
+
+STATS_FILE = "stats.txt"
+_STDOUT_SUFFIX = ".stdout"
+
+class ObjectCache(object):
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE, hardlink=False):
+        self.directory = os.path.abspath(directory)
+        self.max_size = max_size
+        # If True, cached objects are hard linked into the build directory
+        # instead of copied
+        self.hardlink = hardlink
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._compilers = {}
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def _compiler_id(self, compiler):
+        # Compiler identity is given by its executable size and mtime, to
+        # avoid running the compiler for each object
+        try:
+            return self._compilers[compiler]
+        except KeyError:
+            ident = program_identity(compiler)
+            self._compilers[compiler] = ident
+            return ident
+
+    def key(self, task, cmd, cwd, env=None):
+        """Return the cache key of the given compilation command, or None if
+        it cannot be cached."""
+        target = task.outputs[0].abspath()
+        try:
+            i = cmd.index(target)
+        except ValueError:
+            return None
+        if i < 1 or cmd[i-1] != "-o":
+            return None
+
+        pp_cmd = [c for c in cmd[:i-1] + cmd[i+1:] if c != "-c"] + ["-E"]
+        try:
+            p = Popen(pp_cmd, stdout=PIPE, stderr=PIPE, cwd=cwd, env=env)
+            preprocessed = p.communicate()[0]
+        except OSError:
+            return None
+        if p.returncode:
+            return None
+
+        m = md5()
+        m.update(preprocessed)
+        flat_cmd = cmd[:i] + ["<TARGET>"] + cmd[i+1:]
+        m.update(" ".join(flat_cmd).encode("utf-8"))
+        m.update(self._compiler_id(cmd[0]).encode("utf-8"))
+        # Debug information contains the compilation directory
+        for c in cmd:
+            if c.startswith("-g") and c != "-g0":
+                m.update(cwd.encode("utf-8"))
+                break
+        return m.hexdigest()
+
+    def fetch(self, key, target):
+        """Copy (or link) the object for key into target.
+
+        Return the compiler output of the cached compilation, or None if key is
+        not in the cache."""
+        entry = self._entry(key)
+        try:
+            tmp = target + ".tmp"
+            if self.hardlink:
+                try:
+                    os.link(entry, tmp)
+                except OSError:
+                    shutil.copyfile(entry, tmp)
+            else:
+                shutil.copyfile(entry, tmp)
+            rename(tmp, target)
+            # Used for LRU eviction
+            os.utime(entry, None)
+
+            stdout_entry = entry + _STDOUT_SUFFIX
+            if os.path.exists(stdout_entry):
+                fid = open(stdout_entry, "rb")
+                try:
+                    stdout = fid.read().decode("utf-8")
+                finally:
+                    fid.close()
+            else:
+                stdout = ""
+        except (IOError, OSError):
+            self._lock.acquire()
+            try:
+                self.misses += 1
+            finally:
+                self._lock.release()
+            if self.hardlink and os.path.exists(target):
+                # The target may be linked to a cached object, which would be
+                # corrupted by the compiler writing into it
+                os.remove(target)
+            return None
+
+        self._lock.acquire()
+        try:
+            self.hits += 1
+        finally:
+            self._lock.release()
+        return stdout
+
+    def store(self, key, target, stdout):
+        """Store the object target compiled with the command of the given
+        key."""
+        entry = self._entry(key)
+        # Unique temporary name, so that concurrent builds sharing the cache do
+        # not step on each other
+        tmp = "%s.%d.%d.tmp" % (entry, os.getpid(), id(threading.currentThread()))
+        try:
+            if not os.path.exists(os.path.dirname(entry)):
+                os.makedirs(os.path.dirname(entry))
+            if stdout:
+                fid = open(tmp, "wb")
+                try:
+                    fid.write(stdout.encode("utf-8"))
+                finally:
+                    fid.close()
+                rename(tmp, entry + _STDOUT_SUFFIX)
+            shutil.copyfile(target, tmp)
+            rename(tmp, entry)
+        except (IOError, OSError):
+            # Failing to store an object should never fail the build
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def evict(self):
+        """Remove the least recently used objects until the cache size is
+        below the maximum size."""
+        entries = []
+        total = 0
+        for root, dirs, files in os.walk(self.directory):
+            for f in files:
+                if f.endswith(_STDOUT_SUFFIX) or f.endswith(".tmp") \
+                        or f == STATS_FILE:
+                    continue
+                path = os.path.join(root, f)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                size = st.st_size
+                if os.path.exists(path + _STDOUT_SUFFIX):
+                    size += os.path.getsize(path + _STDOUT_SUFFIX)
+                entries.append((st.st_mtime, size, path))
+                total += size
+
+        entries.sort()
+        for mtime, size, path in entries:
+            if total <= self.max_size:
+                break
+            for p in [path, path + _STDOUT_SUFFIX]:
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            total -= size
+        return total
+
+    def read_stats(self):
+        """Return the (hits, misses) accumulated over every flushed session
+        (not including the current one)."""
+        stats_file = os.path.join(self.directory, STATS_FILE)
+        hits = misses = 0
+        if os.path.exists(stats_file):
+            fid = open(stats_file)
+            try:
+                for line in fid:
+                    name, value = [s.strip() for s in line.split("=")]
+                    if name == "hits":
+                        hits = int(value)
+                    elif name == "misses":
+                        misses = int(value)
+            finally:
+                fid.close()
+        return hits, misses
+
+    def flush(self):
+        """Evict old objects and add this session statistics to the cache
+        statistics."""
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        self.evict()
+
+        hits, misses = self.read_stats()
+        stats_file = os.path.join(self.directory, STATS_FILE)
+        tmp = "%s.%d.tmp" % (stats_file, os.getpid())
+        fid = open(tmp, "w")
+        try:
+            fid.write("hits = %d\n" % (hits + self.hits))
+            fid.write("misses = %d\n" % (misses + self.misses))
+        finally:
+            fid.close()
+        rename(tmp, stats_file)
+        self.hits = self.misses = 0
@@ -0,0 +1,147 @@
+"""C/C++ include scanner.
+
+Headers included by a source file are looked up in the task include
+directories, and the ones found become explicit dependencies of the task, so
+that modifying a header triggers a recompilation. As yaku DAG is fixed once
+the tasks are created, all the nodes are scanned before the first task is run:
+generated headers are only found if they are declared as outputs of another
+task, and generated sources are only scanned once they exist (i.e. from the
+second build on).
+"""
+import os
+
+from yaku.utils \
+    import \
+        lines_includes, extract_include
+
+def _root(node):
+    while node.parent:
+        node = node.parent
+    return node
+
+def include_dirs(task_gen, cpppaths):
+    """Return the list of directory nodes searched for headers by the
+    compiler, in order, for the given task generator and list of include
+    paths."""
+    srcnode = task_gen.sources[0].ctx.srcnode
+    bldnode = task_gen.sources[0].ctx.bldnode
+    root = _root(srcnode)
+
+    # Implicit paths are given relatively to the build directory (the
+    # compiler is run from there)
+    dirs = []
+    for s in task_gen.sources:
+        d = bldnode.make_node(s.parent.srcpath())
+        if not d in dirs:
+            dirs.append(d)
+    for p in cpppaths:
+        if os.path.isabs(p):
+            d = root.find_dir(p)
+        else:
+            d = srcnode.find_node(p)
+        if d is not None:
+            dirs.append(d)
+    return dirs
+
+def include_scan(node, dirs):
+    """Return a scan function for a task compiling node, to be set as the
+    task scan attribute."""
+    def _scan(scanner, outputs):
+        return scanner.scan(node, dirs, outputs)
+    return _scan
+
+class IncludeScanner(object):
+    """Scanner for C/C++ include dependencies.
+
+    The headers directly included by each file are cached, keyed by the file
+    path and the include directories, and are only scanned again when the file
+    signature changed."""
+    def __init__(self, node_sigs, entries=None):
+        self.node_sigs = node_sigs
+        if entries is None:
+            entries = {}
+        # (abspath, include dirs abspaths) -> (signature, headers abspaths,
+        # includes which were not found)
+        self.entries = entries
+
+    def scan(self, node, dirs, outputs):
+        """Return the headers node depends on, directly or not.
+
+        outputs is the set of nodes produced by the tasks to be run: those are
+        valid dependencies even if they do not exist yet."""
+        if not os.path.isfile(node.abspath()):
+            # Generated source (e.g. cython or swig output) which is not built
+            # yet: its includes cannot be known before the build
+            return []
+        root = _root(node)
+        dirs_key = tuple([d.abspath() for d in dirs])
+
+        deps = []
+        seen = set([node])
+        todo = [node]
+        while todo:
+            n = todo.pop(0)
+            for h in self._direct_includes(root, n, dirs, dirs_key, outputs):
+                if h in seen:
+                    continue
+                seen.add(h)
+                deps.append(h)
+                if os.path.isfile(h.abspath()):
+                    todo.append(h)
+        return deps
+
+    def _direct_includes(self, root, node, dirs, dirs_key, outputs):
+        sig = self.node_sigs.get(node)
+        key = (node.abspath(), dirs_key)
+
+        entry = self.entries.get(key, None)
+        if entry is not None and entry[0] == sig:
+            headers = self._from_entry(root, node, dirs, entry, outputs)
+            if headers is not None:
+                return headers
+
+        headers = []
+        missing = []
+        for (_, line) in lines_includes(node.abspath()):
+            kind, filename = extract_include(line, None)
+            if kind is None:
+                continue
+            h = self._find_header(node, dirs, kind, filename, outputs, True)
+            if h is None:
+                missing.append((kind, filename))
+            elif not h in headers:
+                headers.append(h)
+        self.entries[key] = (sig, [h.abspath() for h in headers], missing)
+        return headers
+
+    def _from_entry(self, root, node, dirs, entry, outputs):
+        headers = []
+        for p in entry[1]:
+            h = root.search(p)
+            if h is None:
+                h = root.find_node(p)
+            if h is None or not (h in outputs or os.path.isfile(p)):
+                # A previously found header is gone: rescan
+                return None
+            headers.append(h)
+        # Includes not found last time may be generated in this build
+        for kind, filename in entry[2]:
+            h = self._find_header(node, dirs, kind, filename, outputs, False)
+            if h is not None and not h in headers:
+                headers.append(h)
+        return headers
+
+    def _find_header(self, node, dirs, kind, filename, outputs, look_disk):
+        if kind == '"':
+            candidates = [node.parent] + dirs
+        else:
+            candidates = dirs
+        for d in candidates:
+            h = d.search(filename)
+            if h is not None and h in outputs:
+                return h
+            if look_disk:
+                h = d.find_node(filename)
+                if h is not None and os.path.isfile(h.abspath()):
+                    return h
+        return None
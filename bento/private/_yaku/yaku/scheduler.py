@@ -8,7 +8,7 @@ import threading
 
 from yaku.task_manager \
     import \
-        run_task, order_tasks, TaskManager
+        run_task, order_tasks, scan_tasks, TaskManager, TaskGraph
 from yaku.utils \
     import \
         get_exception
@@ -40,6 +40,7 @@ class SerialRunner(object):
         pass
 
     def run(self):
+        scan_tasks(self.ctx, self.task_manager.tasks)
         grp = self.task_manager.next_set()
         while grp:
             for task in grp:
@@ -47,43 +48,76 @@ class SerialRunner(object):
             grp = self.task_manager.next_set()
 
 class ParallelRunner(object):
-    def __init__(self, ctx, task_manager, maxjobs=1):
+    """Run tasks in parallel on maxjobs worker threads.
+
+    Tasks are pushed to the workers as soon as all the tasks they depend on
+    are done (see TaskGraph), instead of waiting for a whole group of the task
+    manager to finish.
+
+    If the context has a timing database (timings attribute), the ready
+    tasks on the longest path to the end of the build, as estimated from the
+    durations recorded by the previous builds, are started first.
+
+    If keep_going is True, a failed task only prevents the tasks depending on
+    it from running: run does not raise, and the failed tasks are available in
+    the failures attribute."""
+    def __init__(self, ctx, task_manager, maxjobs=1, keep_going=False):
         self.njobs = maxjobs
         self.task_manager = task_manager
         self.ctx = ctx
+        self.keep_going = keep_going
+        self.failures = []
+
+        # Items are (0, -priority, counter, task) for tasks, and (1, 0,
+        # counter, None) to stop the workers once no task is left
+        self.worker_queue = queue.PriorityQueue()
+        self.done_queue = queue.Queue()
+        self._counter = 0
+        self._priorities = {}
+
+    def _push(self, task):
+        self._counter += 1
+        if task is None:
+            self.worker_queue.put((1, 0, self._counter, None))
+        else:
+            self.worker_queue.put((0, -self._priorities.get(task, 0), self._counter, task))
+
+    def _set_priorities(self, graph):
+        timings = getattr(self.ctx, "timings", None)
+        if timings is not None and timings.entries:
+            # Tasks never run before are assumed to take the average time
+            default = timings.mean_duration()
+            self._priorities = graph.bottom_levels(lambda t: timings.duration(t, default))
 
-        self.worker_queue = queue.Queue()
-        self.error_out = queue.Queue()
-        self.failure_lock = threading.Lock()
-        self.stop = False
+    def _push_tasks(self, tasks):
+        # Highest priority first, as a worker may take a task before the
+        # others are pushed
+        tasks = sorted(tasks, key=lambda t: -self._priorities.get(t, 0))
+        for task in tasks:
+            self._push(task)
+        return len(tasks)
 
     def start(self):
         def _worker():
-            # XXX: this whole thing is an hack - find a better way to
-            # notify task execution failure to all worker threads
-            while not self.stop:
-                task = self.worker_queue.get()
+            while True:
+                task = self.worker_queue.get()[-1]
+                if task is None:
+                    break
                 try:
                     run_task(self.ctx, task)
+                    self.done_queue.put((task, False))
                 except yaku.errors.TaskRunFailure:
                     e = get_exception()
-                    self.failure_lock.acquire()
-                    self.stop = True
-                    self.failure_lock.release()
                     task.error_msg = e.explain
                     task.error_cmd = e.cmd
-                    self.error_out.put(task)
+                    self.done_queue.put((task, True))
                 except Exception:
                     e = get_exception()
                     exc_type, exc_value, tb = sys.exc_info()
                     lines = traceback.format_exception(exc_type, exc_value, tb)
-                    self.failure_lock.acquire()
-                    self.stop = True
-                    self.failure_lock.release()
                     task.error_msg = "".join(lines)
                     task.error_cmd = []
-                    self.error_out.put(task)
-                self.worker_queue.task_done()
+                    self.done_queue.put((task, True))
 
         for i in range(self.njobs):
             t = threading.Thread(target=_worker)
@@ -91,21 +125,33 @@ class ParallelRunner(object):
             t.start()
 
     def run(self):
-        grp = self.task_manager.next_set()
-        while grp:
-            for task in grp:
-                self.worker_queue.put(task)
-            # XXX: we only join once we detect the worker queue to be empty, to
-            # avoid blocking for a long time. This is naive, and will break if
-            # the worker_queue is filled after this point
-            while not self.stop:
-                if self.worker_queue.empty():
-                    self.worker_queue.join()
-                    break
-            if not self.error_out.empty():
-                task = self.error_out.get()
-                msg = task.error_msg
-                cmd = task.error_cmd
-                raise yaku.errors.TaskRunFailure(cmd, msg)
+        # The graph is only ever touched from this thread: workers only
+        # report finished tasks through done_queue
+        scan_tasks(self.ctx, self.task_manager.tasks)
+        graph = TaskGraph(self.task_manager.tasks)
+        self._set_priorities(graph)
+        failures = self.failures
+        running = 0
+        try:
+            running += self._push_tasks(graph.ready_tasks())
+            while running > 0:
+                task, error = self.done_queue.get()
+                running -= 1
+                if error:
+                    # Unless keep_going is set, do not schedule anything new,
+                    # but wait for the running tasks to finish
+                    failures.append(task)
+                elif self.keep_going or not failures:
+                    running += self._push_tasks(graph.task_done(task))
+        finally:
+            for i in range(self.njobs):
+                self._push(None)
 
-            grp = self.task_manager.next_set()
+        if failures:
+            if self.keep_going:
+                return
+            failed = failures[0]
+            raise yaku.errors.TaskRunFailure(failed.error_cmd, failed.error_msg)
+        remainder = graph.remaining_tasks()
+        if remainder:
+            raise Exception("circular order constraint detected %r" % remainder)
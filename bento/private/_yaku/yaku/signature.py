@@ -0,0 +1,64 @@
+import os
+import time
+
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5
+
+# Files modified less than this many seconds ago are always rehashed: their
+# content may still change without their mtime changing (coarse timestamps)
+RACY_DELAY = 2
+
+_BLOCK_SIZE = 2 ** 16
+
+def file_digest(filename):
+    m = md5()
+    fid = open(filename, "rb")
+    try:
+        while True:
+            data = fid.read(_BLOCK_SIZE)
+            if not data:
+                break
+            m.update(data)
+    finally:
+        fid.close()
+    return m.digest()
+
+def stat_key(st):
+    try:
+        mtime = st.st_mtime_ns
+    except AttributeError:
+        mtime = int(st.st_mtime * 1e9)
+    return (mtime, st.st_size, st.st_ino)
+
+class NodeSignatures(object):
+    """Content signatures of nodes, cached by stat metadata.
+
+    A file is only rehashed when its (mtime_ns, size, inode) tuple changed
+    since the last time it was hashed. In paranoid mode, files are always
+    rehashed. The digest is the md5 of the content in both modes, so switching
+    between them does not invalidate anything."""
+    def __init__(self, entries=None, paranoid=False):
+        if entries is None:
+            entries = {}
+        # abspath -> (stat key, digest)
+        self.entries = entries
+        self.paranoid = paranoid
+
+    def get(self, node):
+        filename = node.abspath()
+        st = os.stat(filename)
+        key = stat_key(st)
+
+        if not self.paranoid:
+            entry = self.entries.get(filename, None)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+
+        digest = file_digest(filename)
+        if time.time() - st.st_mtime > RACY_DELAY:
+            self.entries[filename] = (key, digest)
+        else:
+            self.entries.pop(filename, None)
+        return digest
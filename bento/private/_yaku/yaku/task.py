@@ -72,6 +72,14 @@ class _Task(object):
         self.scan = None
         self.disable_output = False
         self.log = None
+        # NodeSignatures instance - if None, dependencies content is always
+        # read in full
+        self.node_sigs = None
+        # True if the output may be taken from the build context object cache
+        # (compilation tasks)
+        self.cacheable = False
+        # Exit status of the last command run by exec_command
+        self.returncode = None
 
     # UID and signature functionalities
     #----------------------------------
@@ -105,11 +113,12 @@ class _Task(object):
 
     def _sig_explicit_deps(self, m):
         for s in self.inputs + self.deps:
-            #if os.path.exists(s):
-            #    m.update(open(s).read())
-            m.update(s.read(flags="rb"))
+            if self.node_sigs is None:
+                m.update(md5(s.read(flags="rb")).digest())
+            else:
+                m.update(self.node_sigs.get(s))
         return m.digest()
-        
+
     # execution
     #----------
     def run(self):
@@ -128,27 +137,43 @@ class _Task(object):
                 pprint('GREEN', "%-16s%s" % (self.name.upper(), " ".join([i.bldpath() for i in self.inputs])))
 
         self.gen.bld.set_cmd_cache(self, cmd)
-        try:
-            p = subprocess.Popen(cmd, stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT, cwd=cwd, **kw)
-            stdout = p.communicate()[0].decode("utf-8")
-            if p.returncode:
-                raise TaskRunFailure(cmd, stdout)
-            if sys.version_info >= (3,):
-                stdout = stdout
-            else:
-                stdout = stdout.encode("utf-8")
-            if self.disable_output:
-                self.log.write(stdout)
-            else:
-                sys.stderr.write(stdout)
-            self.gen.bld.set_stdout_cache(self, stdout)
-        except OSError:
-            e = get_exception()
-            raise TaskRunFailure(cmd, str(e))
-        except WindowsError:
-            e = get_exception()
-            raise TaskRunFailure(cmd, str(e))
+
+        cache = None
+        key = None
+        stdout = None
+        if self.cacheable:
+            cache = getattr(self.gen.bld, "object_cache", None)
+        if cache is not None:
+            key = cache.key(self, cmd, cwd, kw.get("env", None))
+            if key is not None:
+                stdout = cache.fetch(key, self.outputs[0].abspath())
+
+        if stdout is None:
+            try:
+                p = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                        stderr=subprocess.STDOUT, cwd=cwd, **kw)
+                stdout = p.communicate()[0].decode("utf-8")
+                self.returncode = p.returncode
+                if p.returncode:
+                    raise TaskRunFailure(cmd, stdout)
+            except OSError:
+                e = get_exception()
+                raise TaskRunFailure(cmd, str(e))
+            except WindowsError:
+                e = get_exception()
+                raise TaskRunFailure(cmd, str(e))
+            if key is not None:
+                cache.store(key, self.outputs[0].abspath(), stdout)
+
+        if sys.version_info >= (3,):
+            stdout = stdout
+        else:
+            stdout = stdout.encode("utf-8")
+        if self.disable_output:
+            self.log.write(stdout)
+        else:
+            sys.stderr.write(stdout)
+        self.gen.bld.set_stdout_cache(self, stdout)
 
     def __repr__(self):
         ins = ",".join([i.name for i in self.inputs])
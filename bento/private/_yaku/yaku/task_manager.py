@@ -1,4 +1,5 @@
 import os
+import time
 
 from yaku.environment \
     import \
@@ -141,12 +142,151 @@ class TaskManager(object):
                 return 1
         return 0
 
+class TaskGraph(object):
+    """Per-task dependency graph, used to schedule tasks as soon as their own
+    inputs are available.
+
+    A task depends on every task producing one of its inputs or explicit
+    dependencies (as given by build_dag), as well as on every task whose class
+    name appears in its before list."""
+    def __init__(self, tasks):
+        self.tasks = tasks
+
+        # task -> number of prerequisites not yet done
+        self.npending = {}
+        # task -> list of tasks waiting on it
+        self.dependents = {}
+        self.make_graph()
+
+    def make_graph(self):
+        tuid_to_task = dict([(t.get_uid(), t) for t in self.tasks])
+        task_deps, output_to_tuid = build_dag(self.tasks)
+
+        by_class = {}
+        for t in self.tasks:
+            name = t.__class__.__name__
+            if name in by_class:
+                by_class[name].append(t)
+            else:
+                by_class[name] = [t]
+
+        for t in self.tasks:
+            self.dependents[t] = []
+        for t in self.tasks:
+            prereqs = set()
+            for n in t.inputs + t.deps:
+                if n in output_to_tuid:
+                    prereqs.add(tuid_to_task[output_to_tuid[n]])
+            for name in t.before:
+                if name != t.__class__.__name__:
+                    prereqs.update(by_class.get(name, []))
+            prereqs.discard(t)
+
+            self.npending[t] = len(prereqs)
+            for p in prereqs:
+                self.dependents[p].append(t)
+
+    def ready_tasks(self):
+        """Return the tasks which do not depend on any other task."""
+        return [t for t in self.tasks if self.npending[t] == 0]
+
+    def task_done(self, task):
+        """Mark task as done, and return the list of tasks which became ready
+        as a consequence."""
+        ready = []
+        for t in self.dependents[task]:
+            self.npending[t] -= 1
+            if self.npending[t] == 0:
+                ready.append(t)
+        return ready
+
+    def remaining_tasks(self):
+        return [t for t in self.tasks if self.npending[t] > 0]
+
+    def bottom_levels(self, duration):
+        """Return a dict task -> duration of the longest path from the task
+        (included) to the end of the build, duration(task) being the expected
+        duration of task.
+
+        Tasks on a dependency cycle only count for their own duration."""
+        npending = dict([(t, 0) for t in self.tasks])
+        for t in self.tasks:
+            for d in self.dependents[t]:
+                npending[d] += 1
+        order = [t for t in self.tasks if npending[t] == 0]
+        for t in order:
+            for d in self.dependents[t]:
+                npending[d] -= 1
+                if npending[d] == 0:
+                    order.append(d)
+
+        levels = {}
+        for t in self.tasks:
+            levels[t] = duration(t)
+        for t in reversed(order):
+            below = [levels[d] for d in self.dependents[t]]
+            if below:
+                levels[t] += max(below)
+        return levels
+
+    def critical_path(self, duration):
+        """Return the (longest) chain of dependent tasks which bounds the
+        build time, as a list of tasks."""
+        levels = self.bottom_levels(duration)
+        if not levels:
+            return []
+        path = []
+        current = max(self.tasks, key=lambda t: levels[t])
+        while current is not None and not current in path:
+            path.append(current)
+            dependents = self.dependents[current]
+            if dependents:
+                current = max(dependents, key=lambda t: levels[t])
+            else:
+                current = None
+        return path
+
+def scan_tasks(ctx, tasks):
+    """Add the dependencies found by the task scanners (e.g. included
+    headers) to the tasks deps, using the context include scanner."""
+    scanner = getattr(ctx, "include_scanner", None)
+    if scanner is None:
+        return
+
+    outputs = set()
+    for t in tasks:
+        outputs.update(t.outputs)
+    for t in tasks:
+        if t.scan is not None:
+            for n in t.scan(scanner, outputs):
+                if not n in t.deps:
+                    t.deps.append(n)
+
 def run_task(ctx, task):
     def _run(t):
-        t.run()
+        tracer = getattr(ctx, "tracer", None)
+        if tracer is not None:
+            span = tracer.begin(t.name, "task",
+                    {"inputs": [n.bldpath() for n in t.inputs],
+                     "outputs": [n.bldpath() for n in t.outputs]})
+        timings = getattr(ctx, "timings", None)
+        start = time.time()
+        status = 1
+        try:
+            t.run()
+            status = 0
+        finally:
+            if timings is not None:
+                if status and t.returncode:
+                    status = t.returncode
+                timings.record(t, start, time.time(), status)
+            if tracer is not None:
+                tracer.end(span)
         ctx.cache[tuid] = t.signature()
 
     tuid = task.get_uid()
+    if task.node_sigs is None:
+        task.node_sigs = getattr(ctx, "node_sigs", None)
     # XXX: there may be a better way to do this without stating output
     # (we want to know if the task has already been executed in a
     # previous run)
@@ -234,6 +374,8 @@ class CompiledTaskGen(TaskGen):
         self.object_tasks = []
         self.link_task = None
         self.has_cxx = False
+        # Directory nodes searched for headers, set by apply_cpppath
+        self.include_dirs = []
 
     def add_objects(self, tasks):
         """Add new object tasks, assuming the link task has already
@@ -0,0 +1,80 @@
+from yaku.tests.test_helpers \
+    import \
+        TmpContextBase
+from yaku.context \
+    import \
+        get_cfg
+from yaku.conftests \
+    import \
+        check_header, check_type, check_type_size, run_checks_parallel
+
+class TestParallelChecks(TmpContextBase):
+    def _read_log(self, ctx, build_path):
+        log = open(ctx.log.name)
+        try:
+            return log.read().replace(build_path, "")
+        finally:
+            log.close()
+
+    def _configure(self, build_path, run):
+        ctx = get_cfg(build_path=build_path)
+        ctx.use_tools(["ctasks"])
+        start = len(ctx.conf_results)
+        ret = run(ctx)
+        results = ctx.conf_results[start:]
+        ctx.store()
+        return ret, results, self._read_log(ctx, build_path)
+
+    def test_same_results(self):
+        """Check parallel checks give the same results and log as serial
+        ones."""
+        checks = [(check_header, "stdio.h"),
+                  (check_type_size, "int"),
+                  (check_header, "yaku_no_such_header.h"),
+                  (check_type, "size_t", ["stddef.h"])]
+
+        def _serial(ctx):
+            return [check[0](ctx, *check[1:]) for check in checks]
+        def _parallel(ctx):
+            return run_checks_parallel(ctx, checks, 4)
+
+        serial = self._configure("build-serial", _serial)
+        parallel = self._configure("build-parallel", _parallel)
+        self.assertEqual(parallel[0], serial[0])
+        self.assertEqual(parallel[1], serial[1])
+        self.assertEqual(parallel[2], serial[2])
+        self.assertEqual(parallel[0][2], False)
+        self.assertEqual(len(parallel[1]), 4)
+
+    def test_invalid_check(self):
+        ctx = get_cfg()
+        ctx.use_tools(["ctasks"])
+        self.assertRaises(ValueError, run_checks_parallel, ctx,
+                          [(len, "foo")])
+
+class TestCheckCache(TmpContextBase):
+    def _configure(self, cflags=None, header="stdio.h"):
+        ctx = get_cfg()
+        ctx.use_tools(["ctasks"])
+        if cflags is not None:
+            ctx.env.append("CFLAGS", cflags)
+        ret = check_header(ctx, header)
+        ctx.store()
+        log = open(ctx.log.name)
+        try:
+            return ret, "---> Cached result" in log.read().split("Checking for header %s" % header)[-1]
+        finally:
+            log.close()
+
+    def test_reused(self):
+        self.assertEqual(self._configure(), (True, False))
+        self.assertEqual(self._configure(), (True, True))
+
+    def test_flags_changed(self):
+        self._configure()
+        self.assertEqual(self._configure("-DYAKU_FOO"), (True, False))
+        self.assertEqual(self._configure("-DYAKU_FOO"), (True, True))
+
+    def test_failure_not_cached(self):
+        self.assertEqual(self._configure(header="yaku_missing.h"), (False, False))
+        self.assertEqual(self._configure(header="yaku_missing.h"), (False, False))
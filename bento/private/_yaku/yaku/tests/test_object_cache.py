@@ -0,0 +1,80 @@
+import os
+import time
+
+from yaku.tests.test_helpers \
+    import \
+        TmpContextBase
+from yaku.object_cache \
+    import \
+        ObjectCache
+
+class TestObjectCache(TmpContextBase):
+    def setUp(self):
+        super(TestObjectCache, self).setUp()
+        self.cache_dir = os.path.join(self.d, "cache")
+
+    def _write(self, filename, content):
+        fid = open(filename, "w")
+        try:
+            fid.write(content)
+        finally:
+            fid.close()
+
+    def _read(self, filename):
+        fid = open(filename)
+        try:
+            return fid.read()
+        finally:
+            fid.close()
+
+    def test_store_fetch(self):
+        cache = ObjectCache(self.cache_dir)
+        target = os.path.join(self.d, "foo.o")
+
+        self.assertEqual(cache.fetch("abcdef", target), None)
+        self._write(target, "object")
+        cache.store("abcdef", target, "some warning")
+
+        os.remove(target)
+        self.assertEqual(cache.fetch("abcdef", target), "some warning")
+        self.assertEqual(self._read(target), "object")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_hardlink(self):
+        cache = ObjectCache(self.cache_dir, hardlink=True)
+        target = os.path.join(self.d, "foo.o")
+        self._write(target, "object")
+        cache.store("abcdef", target, "")
+
+        self.assertEqual(cache.fetch("abcdef", target), "")
+        self.assertEqual(self._read(target), "object")
+        # A miss must not leave a link to a cached object as target
+        self.assertEqual(cache.fetch("123456", target), None)
+        self.assertFalse(os.path.exists(target))
+        self.assertEqual(cache.fetch("abcdef", os.path.join(self.d, "bar.o")), "")
+
+    def test_evict(self):
+        cache = ObjectCache(self.cache_dir, max_size=10)
+        target = os.path.join(self.d, "foo.o")
+
+        now = time.time()
+        for i, key in enumerate(["aaaa", "bbbb", "cccc"]):
+            self._write(target, "12345")
+            cache.store(key, target, "")
+            # oldest first
+            t = now - 100 + i
+            os.utime(os.path.join(self.cache_dir, key[:2], key[2:]), (t, t))
+
+        self.assertEqual(cache.evict(), 10)
+        self.assertEqual(cache.fetch("aaaa", target), None)
+        self.assertEqual(cache.fetch("bbbb", target), "")
+        self.assertEqual(cache.fetch("cccc", target), "")
+
+    def test_stats(self):
+        cache = ObjectCache(self.cache_dir)
+        cache.fetch("abcdef", os.path.join(self.d, "foo.o"))
+        cache.flush()
+        cache.fetch("abcdef", os.path.join(self.d, "foo.o"))
+        cache.flush()
+
+        self.assertEqual(ObjectCache(self.cache_dir).read_stats(), (0, 2))
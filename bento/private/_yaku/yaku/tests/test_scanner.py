@@ -0,0 +1,92 @@
+from yaku.tests.test_helpers \
+    import \
+        TmpContextBase
+from yaku.context \
+    import \
+        create_top_nodes
+from yaku.signature \
+    import \
+        NodeSignatures
+from yaku.scanner \
+    import \
+        IncludeScanner
+
+class TestIncludeScanner(TmpContextBase):
+    def setUp(self):
+        super(TestIncludeScanner, self).setUp()
+        self.src_root, self.bld_root = create_top_nodes(self.d, self.d + "/build")
+
+        self.include = self.src_root.make_node("include")
+        self.include.mkdir()
+        self.src = self.src_root.make_node("src")
+        self.src.mkdir()
+
+        self.foo_c = self._write(self.src, "foo.c", """\
+#include "foo.h"
+#include <bar.h>
+#include <stdio.h>
+""")
+        self.foo_h = self._write(self.src, "foo.h", "#define FOO 1\n")
+        self.bar_h = self._write(self.include, "bar.h", '#include "baz.h"\n')
+        self.baz_h = self._write(self.include, "baz.h", "#define BAZ 1\n")
+
+    def _write(self, parent, name, content):
+        node = parent.make_node(name)
+        node.write(content)
+        return node
+
+    def test_simple(self):
+        scanner = IncludeScanner(NodeSignatures())
+        deps = scanner.scan(self.foo_c, [self.include], set())
+        self.assertEqual(deps, [self.foo_h, self.bar_h, self.baz_h])
+
+    def test_angle_brackets(self):
+        """Check <> includes are not looked up in the including file directory."""
+        self._write(self.src, "bar.h", "")
+        scanner = IncludeScanner(NodeSignatures())
+        deps = scanner.scan(self.foo_c, [self.include], set())
+        self.assertEqual(deps, [self.foo_h, self.bar_h, self.baz_h])
+
+    def test_cached(self):
+        scanner = IncludeScanner(NodeSignatures())
+        scanner.scan(self.foo_c, [self.include], set())
+
+        key = (self.foo_c.abspath(), (self.include.abspath(),))
+        sig, headers, missing = scanner.entries[key]
+        self.assertEqual(missing, [("<", "stdio.h")])
+        scanner.entries[key] = (sig, [self.foo_h.abspath()], [])
+        deps = scanner.scan(self.foo_c, [self.include], set())
+        self.assertEqual(deps, [self.foo_h])
+
+    def test_include_dirs_changed(self):
+        scanner = IncludeScanner(NodeSignatures())
+        scanner.scan(self.foo_c, [self.include], set())
+
+        deps = scanner.scan(self.foo_c, [], set())
+        self.assertEqual(deps, [self.foo_h])
+
+    def test_generated(self):
+        """Check headers declared as outputs are found before they exist."""
+        config_h = self.bld_root.make_node("include").make_node("config.h")
+        self._write(self.src, "bar.c", '#include "config.h"\n')
+        bar_c = self.src.find_node("bar.c")
+
+        scanner = IncludeScanner(NodeSignatures())
+        deps = scanner.scan(bar_c, [config_h.parent], set())
+        self.assertEqual(deps, [])
+
+        deps = scanner.scan(bar_c, [config_h.parent], set([config_h]))
+        self.assertEqual(deps, [config_h])
+
+    def test_generated_source(self):
+        """Check a generated source which does not exist yet is not scanned."""
+        foo_c = self.bld_root.make_node("src").make_node("foo.c")
+
+        scanner = IncludeScanner(NodeSignatures())
+        deps = scanner.scan(foo_c, [self.include], set([foo_c]))
+        self.assertEqual(deps, [])
+
+        foo_c.parent.mkdir()
+        foo_c.write('#include <bar.h>\n')
+        deps = scanner.scan(foo_c, [self.include], set([foo_c]))
+        self.assertEqual(deps, [self.bar_h, self.baz_h])
@@ -0,0 +1,197 @@
+import os
+import threading
+
+from yaku.tests.test_helpers \
+    import \
+        TmpContextBase
+from yaku.context \
+    import \
+        create_top_nodes
+from yaku.task \
+    import \
+        task_factory
+from yaku.task_manager \
+    import \
+        TaskManager, TaskGraph
+from yaku.scheduler \
+    import \
+        ParallelRunner
+import yaku.errors
+
+class _FakeContext(object):
+    def __init__(self):
+        self.cache = {}
+
+class _RecordingTracer(object):
+    def __init__(self):
+        self.spans = []
+
+    def begin(self, name, cat, args=None):
+        return (name, cat, args, threading.current_thread().name)
+
+    def end(self, span):
+        self.spans.append(span)
+
+def _make_task(name, inputs, outputs, func):
+    task = task_factory(name)(inputs=inputs, outputs=outputs, func=func)
+    task.env_vars = []
+    task.env = {}
+    return task
+
+def _copy(task):
+    content = "".join([i.read() for i in task.inputs])
+    for o in task.outputs:
+        o.write(content)
+
+class TestTaskGraph(TmpContextBase):
+    def setUp(self):
+        super(TestTaskGraph, self).setUp()
+        self.src_root, self.bld_root = create_top_nodes(self.d, self.d)
+
+    def _sources(self, names):
+        nodes = []
+        for name in names:
+            n = self.src_root.make_node(name)
+            n.write(name)
+            nodes.append(n)
+        return nodes
+
+    def test_simple(self):
+        a, b = self._sources(["a.c", "b.c"])
+        a_o = self.bld_root.declare("a.o")
+        b_o = self.bld_root.declare("b.o")
+        lib = self.bld_root.declare("foo.so")
+
+        t_a = _make_task("cc", [a], [a_o], _copy)
+        t_b = _make_task("cc", [b], [b_o], _copy)
+        t_link = _make_task("link", [a_o, b_o], [lib], _copy)
+
+        graph = TaskGraph([t_link, t_a, t_b])
+        self.assertEqual(graph.ready_tasks(), [t_a, t_b])
+        self.assertEqual(graph.task_done(t_a), [])
+        self.assertEqual(graph.remaining_tasks(), [t_link])
+        self.assertEqual(graph.task_done(t_b), [t_link])
+        self.assertEqual(graph.remaining_tasks(), [])
+
+    def test_explicit_deps(self):
+        a, h_in = self._sources(["a.c", "a.h.in"])
+        h = self.bld_root.declare("a.h")
+        a_o = self.bld_root.declare("a.o")
+
+        t_subst = _make_task("subst", [h_in], [h], _copy)
+        t_a = _make_task("cc", [a], [a_o], _copy)
+        t_a.deps.append(h)
+
+        graph = TaskGraph([t_a, t_subst])
+        self.assertEqual(graph.ready_tasks(), [t_subst])
+        self.assertEqual(graph.task_done(t_subst), [t_a])
+
+    def test_no_group_barrier(self):
+        """Check a link task may start while unrelated compilations are still
+        running."""
+        a, b = self._sources(["a.c", "b.c"])
+        a_o = self.bld_root.declare("a.o")
+        b_o = self.bld_root.declare("b.o")
+        lib = self.bld_root.declare("a.so")
+
+        linked = threading.Event()
+        waited = []
+        def _slow(task):
+            # Only finishes once the link task of the other extension ran
+            linked.wait(10)
+            waited.append(linked.is_set())
+            _copy(task)
+        def _link(task):
+            _copy(task)
+            linked.set()
+
+        t_a = _make_task("cc", [a], [a_o], _copy)
+        t_b = _make_task("cc", [b], [b_o], _slow)
+        t_link = _make_task("link", [a_o], [lib], _link)
+
+        ctx = _FakeContext()
+        runner = ParallelRunner(ctx, TaskManager([t_b, t_a, t_link]), 2)
+        runner.start()
+        runner.run()
+
+        self.assertEqual(waited, [True])
+        self.assertEqual(lib.read(), "a.c")
+        self.assertEqual(len(ctx.cache), 3)
+
+    def test_failure(self):
+        a, b = self._sources(["a.c", "b.c"])
+        a_o = self.bld_root.declare("a.o")
+        b_o = self.bld_root.declare("b.o")
+        lib = self.bld_root.declare("foo.so")
+
+        def _fail(task):
+            raise yaku.errors.TaskRunFailure(["cc", "a.c"], "boom")
+        ran = []
+        def _link(task):
+            ran.append(task)
+
+        t_a = _make_task("cc", [a], [a_o], _fail)
+        t_b = _make_task("cc", [b], [b_o], _copy)
+        t_link = _make_task("link", [a_o, b_o], [lib], _link)
+
+        runner = ParallelRunner(_FakeContext(), TaskManager([t_a, t_b, t_link]), 4)
+        runner.start()
+        self.assertRaises(yaku.errors.TaskRunFailure, runner.run)
+        self.assertEqual(ran, [])
+
+    def test_keep_going(self):
+        """Check tasks independent of a failed task are still run."""
+        a, b = self._sources(["a.c", "b.c"])
+        a_o = self.bld_root.declare("a.o")
+        b_o = self.bld_root.declare("b.o")
+        a_lib = self.bld_root.declare("a.so")
+        b_lib = self.bld_root.declare("b.so")
+
+        def _fail(task):
+            raise yaku.errors.TaskRunFailure(["cc", "a.c"], "boom")
+
+        t_a = _make_task("cc", [a], [a_o], _fail)
+        t_b = _make_task("cc", [b], [b_o], _copy)
+        t_a_link = _make_task("link", [a_o], [a_lib], _copy)
+        t_b_link = _make_task("link", [b_o], [b_lib], _copy)
+
+        runner = ParallelRunner(_FakeContext(),
+                TaskManager([t_a, t_b, t_a_link, t_b_link]), 4, keep_going=True)
+        runner.start()
+        runner.run()
+        self.assertEqual(runner.failures, [t_a])
+        self.assertEqual(t_a.error_cmd, ["cc", "a.c"])
+        self.assertEqual(b_lib.read(), "b.c")
+        self.assertFalse(os.path.exists(a_lib.abspath()))
+
+    def test_tracer(self):
+        a, b = self._sources(["a.c", "b.c"])
+        a_o = self.bld_root.declare("a.o")
+        b_o = self.bld_root.declare("b.o")
+        lib = self.bld_root.declare("foo.so")
+
+        t_a = _make_task("cc", [a], [a_o], _copy)
+        t_b = _make_task("cc", [b], [b_o], _copy)
+        t_link = _make_task("link", [a_o, b_o], [lib], _copy)
+
+        ctx = _FakeContext()
+        ctx.tracer = _RecordingTracer()
+        runner = ParallelRunner(ctx, TaskManager([t_a, t_b, t_link]), 2)
+        runner.start()
+        runner.run()
+
+        spans = ctx.tracer.spans
+        self.assertEqual(sorted([(name, cat) for name, cat, args, thread in spans]),
+                         [("cc", "task"), ("cc", "task"), ("link", "task")])
+        self.assertEqual(spans[-1][2], {"inputs": [a_o.bldpath(), b_o.bldpath()],
+                                        "outputs": [lib.bldpath()]})
+        # Tasks are run by the worker threads
+        for span in spans:
+            self.assertNotEqual(span[3], threading.current_thread().name)
+
+        # Up to date tasks are not traced
+        ctx.tracer = _RecordingTracer()
+        runner = ParallelRunner(ctx, TaskManager([t_a, t_b, t_link]), 2)
+        runner.start()
+        runner.run()
+        self.assertEqual(ctx.tracer.spans, [])
@@ -0,0 +1,71 @@
+import os
+import time
+
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5
+
+from yaku.tests.test_helpers \
+    import \
+        TmpContextBase
+from yaku.context \
+    import \
+        create_top_nodes
+from yaku.signature \
+    import \
+        NodeSignatures, stat_key
+
+class TestNodeSignatures(TmpContextBase):
+    def setUp(self):
+        super(TestNodeSignatures, self).setUp()
+        self.src_root, self.bld_root = create_top_nodes(self.d, self.d)
+
+        self.node = self.src_root.make_node("foo.c")
+        self._write(self.node, "int foo;")
+
+    def _write(self, node, content):
+        node.write(content)
+        # Make the file old enough not to be considered racy
+        t = time.time() - 3600
+        os.utime(node.abspath(), (t, t))
+
+    def _digest(self, content):
+        return md5(content.encode()).digest()
+
+    def test_simple(self):
+        sigs = NodeSignatures()
+        self.assertEqual(sigs.get(self.node), self._digest("int foo;"))
+        self.assertTrue(self.node.abspath() in sigs.entries)
+
+    def test_unchanged_stat(self):
+        """Check content is not rehashed if stat metadata did not change."""
+        sigs = NodeSignatures()
+        sigs.get(self.node)
+
+        key = stat_key(os.stat(self.node.abspath()))
+        sigs.entries[self.node.abspath()] = (key, "cached")
+        self.assertEqual(sigs.get(self.node), "cached")
+
+    def test_changed(self):
+        sigs = NodeSignatures()
+        sigs.get(self.node)
+
+        self._write(self.node, "int foobar;")
+        self.assertEqual(sigs.get(self.node), self._digest("int foobar;"))
+
+    def test_paranoid(self):
+        sigs = NodeSignatures()
+        sigs.get(self.node)
+
+        key = stat_key(os.stat(self.node.abspath()))
+        sigs.entries[self.node.abspath()] = (key, "cached")
+        sigs.paranoid = True
+        self.assertEqual(sigs.get(self.node), self._digest("int foo;"))
+
+    def test_racy(self):
+        """Check recently modified files are not cached."""
+        sigs = NodeSignatures()
+        self.node.write("int bar;")
+        self.assertEqual(sigs.get(self.node), self._digest("int bar;"))
+        self.assertFalse(self.node.abspath() in sigs.entries)
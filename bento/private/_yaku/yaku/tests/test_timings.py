@@ -0,0 +1,143 @@
+from yaku.tests.test_helpers \
+    import \
+        TmpContextBase
+from yaku.tests.test_scheduler \
+    import \
+        _FakeContext, _make_task, _copy
+from yaku.context \
+    import \
+        create_top_nodes, get_cfg, get_bld
+from yaku.task_manager \
+    import \
+        TaskManager, TaskGraph
+from yaku.scheduler \
+    import \
+        ParallelRunner
+from yaku.timings \
+    import \
+        TaskTimings, report
+import yaku.errors
+
+class _TimingsTestCase(TmpContextBase):
+    def setUp(self):
+        super(_TimingsTestCase, self).setUp()
+        self.src_root, self.bld_root = create_top_nodes(self.d, self.d)
+
+    def _sources(self, names):
+        nodes = []
+        for name in names:
+            n = self.src_root.make_node(name)
+            n.write(name)
+            nodes.append(n)
+        return nodes
+
+    def _tasks(self):
+        """Two extensions, the first one made of two sources."""
+        a, b, c = self._sources(["a.c", "b.c", "c.c"])
+        a_o = self.bld_root.declare("a.o")
+        b_o = self.bld_root.declare("b.o")
+        c_o = self.bld_root.declare("c.o")
+        ab = self.bld_root.declare("ab.so")
+        c_so = self.bld_root.declare("c.so")
+
+        t_a = _make_task("cc", [a], [a_o], _copy)
+        t_b = _make_task("cc", [b], [b_o], _copy)
+        t_c = _make_task("cc", [c], [c_o], _copy)
+        t_ab = _make_task("link", [a_o, b_o], [ab], _copy)
+        t_c_link = _make_task("link", [c_o], [c_so], _copy)
+        return t_a, t_b, t_c, t_ab, t_c_link
+
+class TestTaskGraphPaths(_TimingsTestCase):
+    def test_bottom_levels(self):
+        t_a, t_b, t_c, t_ab, t_c_link = tasks = self._tasks()
+        durations = {t_a: 1.0, t_b: 3.0, t_c: 2.0, t_ab: 0.5, t_c_link: 2.0}
+        levels = TaskGraph(list(tasks)).bottom_levels(lambda t: durations[t])
+        self.assertEqual(levels, {t_a: 1.5, t_b: 3.5, t_c: 4.0, t_ab: 0.5, t_c_link: 2.0})
+
+    def test_critical_path(self):
+        t_a, t_b, t_c, t_ab, t_c_link = tasks = self._tasks()
+        durations = {t_a: 1.0, t_b: 3.0, t_c: 2.0, t_ab: 0.5, t_c_link: 0.5}
+        path = TaskGraph(list(tasks)).critical_path(lambda t: durations[t])
+        self.assertEqual(path, [t_b, t_ab])
+
+        self.assertEqual(TaskGraph([]).critical_path(lambda t: 0), [])
+
+class TestTaskTimings(_TimingsTestCase):
+    def test_record(self):
+        t_a, t_b, t_c, t_ab, t_c_link = self._tasks()
+        ctx = _FakeContext()
+        ctx.timings = TaskTimings()
+        runner = ParallelRunner(ctx, TaskManager([t_a, t_b, t_ab]), 2)
+        runner.start()
+        runner.run()
+
+        timings = ctx.timings
+        self.assertEqual(len(timings.runs), 3)
+        duration, status, size = timings.entries[t_ab.get_uid()]
+        self.assertTrue(duration >= 0)
+        self.assertEqual(status, 0)
+        self.assertEqual(size, len("a.cb.c"))
+        self.assertTrue(timings.duration(t_c) is None)
+        self.assertEqual(timings.duration(t_c, 1.0), 1.0)
+
+    def test_failure(self):
+        t_a = self._tasks()[0]
+        def _fail(task):
+            raise yaku.errors.TaskRunFailure(["cc", "a.c"], "boom")
+        t_a.func = _fail
+
+        ctx = _FakeContext()
+        ctx.timings = TaskTimings()
+        runner = ParallelRunner(ctx, TaskManager([t_a]), 1)
+        runner.start()
+        self.assertRaises(yaku.errors.TaskRunFailure, runner.run)
+        self.assertEqual(ctx.timings.entries[t_a.get_uid()][1:], (1, 0))
+
+    def test_longest_first(self):
+        """Check the ready tasks on the longest path are started first."""
+        t_a, t_b, t_c, t_ab, t_c_link = tasks = self._tasks()
+        ctx = _FakeContext()
+        ctx.timings = TaskTimings()
+        for t, duration in [(t_a, 1.0), (t_b, 3.0), (t_c, 2.0), (t_ab, 0.5), (t_c_link, 2.0)]:
+            ctx.timings.entries[t.get_uid()] = (duration, 0, 0)
+
+        # Schedule the tasks as a single worker would, without any worker
+        # thread to race with
+        runner = ParallelRunner(ctx, TaskManager(list(tasks)), 1)
+        graph = TaskGraph(list(tasks))
+        runner._set_priorities(graph)
+        order = []
+        running = runner._push_tasks(graph.ready_tasks())
+        while running > 0:
+            task = runner.worker_queue.get_nowait()[-1]
+            order.append(task)
+            running += runner._push_tasks(graph.task_done(task)) - 1
+        self.assertEqual(order, [t_c, t_b, t_c_link, t_a, t_ab])
+
+    def test_report(self):
+        t_a, t_b, t_c, t_ab, t_c_link = tasks = self._tasks()
+        timings = TaskTimings()
+        timings.runs = [(t_a, 0.0, 1.0), (t_b, 0.0, 3.0), (t_ab, 3.0, 3.5)]
+
+        lines = report(timings, list(tasks), 2)
+        self.assertEqual(lines[0], "3 tasks run in 3.50s (4.50s of task time)")
+        self.assertEqual(lines[1], "Achieved parallelism: 1.29 (-j 2)")
+        self.assertEqual(lines[2], "Slowest tasks:")
+        self.assertTrue(lines[3].strip().startswith("3.00s  cc"))
+        i = lines.index("Critical path (3.50s):")
+        self.assertEqual(len(lines), i + 3)
+        self.assertTrue("b.c" in lines[i + 1])
+
+        self.assertEqual(report(TaskTimings(), list(tasks), 2), ["No task was run"])
+
+class TestTimingsCache(TmpContextBase):
+    def test_load_store(self):
+        ctx = get_cfg()
+        ctx.store()
+
+        ctx = get_bld()
+        ctx.timings.entries["uid"] = (1.0, 0, 10)
+        ctx.store()
+
+        ctx = get_bld()
+        self.assertEqual(ctx.timings.entries, {"uid": (1.0, 0, 10)})
@@ -0,0 +1,79 @@
+import os
+import threading
+
+from yaku.task_manager \
+    import \
+        TaskGraph
+
+class TaskTimings(object):
+    """Timing database of the build tasks.
+
+    entries maps a task uid to the (wall time, exit status, outputs size) of
+    its last run, and is kept from one build to the next so that the
+    scheduler may start the longest tasks first. runs contains the (task,
+    start, end) of the tasks run in the current build only."""
+    def __init__(self, entries=None):
+        if entries is None:
+            entries = {}
+        self.entries = entries
+        self.runs = []
+        self._lock = threading.Lock()
+
+    def record(self, task, start, end, status):
+        size = 0
+        for o in task.outputs:
+            try:
+                size += os.stat(o.abspath()).st_size
+            except OSError:
+                pass
+        self._lock.acquire()
+        try:
+            self.entries[task.get_uid()] = (end - start, status, size)
+            self.runs.append((task, start, end))
+        finally:
+            self._lock.release()
+
+    def duration(self, task, default=None):
+        """Return the recorded wall time of task, or default if the task was
+        never run."""
+        try:
+            return self.entries[task.get_uid()][0]
+        except KeyError:
+            return default
+
+    def mean_duration(self):
+        if not self.entries:
+            return 0.0
+        return sum([e[0] for e in self.entries.values()]) / len(self.entries)
+
+def _describe(task):
+    ins = " ".join([n.bldpath() for n in task.inputs])
+    return "%-12s%s" % (task.name, ins)
+
+def report(timings, tasks, jobs, n_slowest=10):
+    """Return the lines of the summary of the current build: slowest tasks,
+    critical path through the task graph and achieved parallelism."""
+    if not timings.runs:
+        return ["No task was run"]
+
+    runs = timings.runs
+    durations = dict([(t, end - start) for t, start, end in runs])
+    busy = sum(durations.values())
+    elapsed = max([end for t, start, end in runs]) - min([start for t, start, end in runs])
+
+    lines = ["%d tasks run in %.2fs (%.2fs of task time)" % (len(runs), elapsed, busy)]
+    if elapsed > 0:
+        lines.append("Achieved parallelism: %.2f (-j %d)" % (busy / elapsed, jobs))
+
+    lines.append("Slowest tasks:")
+    slowest = sorted(durations.items(), key=lambda item: -item[1])[:n_slowest]
+    for task, duration in slowest:
+        lines.append("    %8.2fs  %s" % (duration, _describe(task)))
+
+    graph = TaskGraph(tasks)
+    path = [t for t in graph.critical_path(lambda t: durations.get(t, 0.0)) \
+            if t in durations]
+    lines.append("Critical path (%.2fs):" % sum([durations[t] for t in path]))
+    for task in path:
+        lines.append("    %8.2fs  %s" % (durations[task], _describe(task)))
+    return lines
@@ -16,7 +16,7 @@ from yaku.scheduler \
         run_tasks
 from yaku.conf \
     import \
-        with_conf_blddir, create_file, write_log
+        with_conf_blddir, create_file, write_log, check_key
 from yaku.utils \
     import \
         get_exception
@@ -76,7 +76,10 @@ class Builder(object):
         outputs = tasks[0].outputs[:]
         return outputs
 
-def try_task_maker(conf, task_maker, name, body, headers, env=None):
+def create_try_tasks(conf, task_maker, name, body, headers, env=None):
+    """Create the tasks of a configuration test, without running them.
+
+    Return the list of tasks and the tested code."""
     if headers:
         head = "\n".join(["#include <%s>" % h for h in headers])
     else:
@@ -95,6 +98,17 @@ def try_task_maker(conf, task_maker, name, body, headers, env=None):
     for t in tasks:
         t.disable_output = True
         t.log = conf.log
+    return tasks, code
+
+def try_task_maker(conf, task_maker, name, body, headers, env=None):
+    tasks, code = create_try_tasks(conf, task_maker, name, body, headers, env)
+
+    key = check_key(tasks, code)
+    if key in conf.check_cache:
+        succeed, explanation = conf.check_cache[key]
+        conf.log.write("---> Cached result\n")
+        write_log(conf, conf.log, tasks, code, succeed, explanation)
+        return succeed
 
     succeed = False
     explanation = None
@@ -108,6 +122,10 @@ def try_task_maker(conf, task_maker, name, body, headers, env=None):
             #raise
     finally:
         write_log(conf, conf.log, tasks, code, succeed, explanation)
+    # Failures are not cached: they may be fixed by installing the missing
+    # header or library, which the key does not cover
+    if succeed:
+        conf.check_cache[key] = (succeed, explanation)
     return succeed
 
 def _merge_env(_env, new_env):
@@ -12,7 +12,10 @@ from yaku.task_manager \
         extension, CompiledTaskGen, set_extension_hook
 from yaku.utils \
     import \
-        find_deps, ensure_dir
+        ensure_dir
+from yaku.scanner \
+    import \
+        include_dirs, include_scan
 from yaku.compiled_fun \
     import \
         compile_fun
@@ -54,6 +57,8 @@ def ccompile_task(self, node):
     task = task_factory("cc")(inputs=[node], outputs=[target], func=ccompile, env=self.env)
     task.gen = self
     task.env_vars = cc_vars
+    task.scan = include_scan(node, self.include_dirs)
+    task.cacheable = True
     return [task]
 
 def shared_c_hook(self, node):
@@ -69,6 +74,8 @@ def shared_ccompile_task(self, node):
     task = task_factory("shcc")(inputs=[node], outputs=[target], func=shccompile, env=self.env)
     task.gen = self
     task.env_vars = cc_vars
+    task.scan = include_scan(node, self.include_dirs)
+    task.cacheable = True
     return [task]
 
 def shlink_task(self, name):
@@ -133,6 +140,7 @@ def apply_cpppath(task_gen):
     task_gen.env["INCPATH"] = [
             task_gen.env["CPPPATH_FMT"] % p
             for p in cpppaths]
+    task_gen.include_dirs = include_dirs(task_gen, task_gen.env["CPPPATH"])
 
 def apply_libs(task_gen):
     libs = task_gen.env["LIBS"]
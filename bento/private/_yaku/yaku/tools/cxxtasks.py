@@ -12,7 +12,10 @@ from yaku.task_manager \
         extension, CompiledTaskGen
 from yaku.utils \
     import \
-        find_deps, ensure_dir, get_exception
+        ensure_dir, get_exception
+from yaku.scanner \
+    import \
+        include_scan
 from yaku.compiled_fun \
     import \
         compile_fun
@@ -39,9 +42,7 @@ def cxxcompile_task(self, node):
     task = task_factory("cxx")(inputs=[node], outputs=[target])
     task.gen = self
     task.env_vars = cxx_vars
-    #print find_deps("foo.c", ["."])
-    #task.scan = lambda : find_deps(node, ["."])
-    #task.deps.extend(task.scan())
+    task.scan = include_scan(node, self.include_dirs)
     task.env = self.env
     task.func = cxxcompile
     return [task]
@@ -27,6 +27,9 @@ from yaku.task \
 from yaku.utils \
     import \
         ensure_dir, get_exception
+from yaku.scanner \
+    import \
+        include_dirs, include_scan
 from yaku.environment \
     import \
         Environment
@@ -155,6 +158,8 @@ def pycc_task(self, node):
     task.env_vars = pycc_vars
     task.env = self.env
     task.func = pycc
+    task.scan = include_scan(node, self.include_dirs)
+    task.cacheable = True
     return [task]
 
 def pycxx_hook(self, node):
@@ -173,6 +178,8 @@ def pycxx_task(self, node):
     task.env_vars = pycxx_vars
     task.env = self.env
     task.func = pycxx
+    task.scan = include_scan(node, self.include_dirs)
+    task.cacheable = True
     return [task]
 
 def pylink_task(self, name):
@@ -536,3 +543,4 @@ def apply_cpppath(task_gen):
     task_gen.env["PYEXT_INCPATH"] = [
             task_gen.env["PYEXT_CPPPATH_FMT"] % p
             for p in cpppaths]
+    task_gen.include_dirs = include_dirs(task_gen, task_gen.env["PYEXT_CPPPATH"])
@@ -45,7 +45,12 @@ def extract_include(txt, defs):
     return None, None
 
 def lines_includes(filename):
-    code = open(filename).read()
+    fid = open(filename, "rb")
+    try:
+        # latin-1 never fails to decode, and we only care about ascii parts
+        code = fid.read().decode("latin-1")
+    finally:
+        fid.close()
     #if use_trigraphs:
     #   for (a, b) in trig_def: code = code.split(a).join(b)
     code = re_nl.sub('', code)
@@ -104,6 +109,21 @@ def find_program(program, path_list=None):
 
     return None
 
+def program_identity(program):
+    """Return a string identifying the given program executable, as found in
+    the PATH.
+
+    The identity changes whenever the executable is replaced (e.g. the
+    compiler is upgraded), without having to run the program."""
+    path = find_program(program)
+    if path is None:
+        path = program
+    try:
+        st = os.stat(path)
+        return "%s:%d:%d" % (path, st.st_size, st.st_mtime)
+    except OSError:
+        return program
+
 if sys.version_info[0] < 3:
     from yaku._utils_py2 import join_bytes, function_code
     def is_string(s):
@@ -132,3 +152,20 @@ def extract_exception():
             e = extract_exception()
     """
     return sys.exc_info()[1]
+
+def cpu_count():
+    """Return the number of CPUs in the system (1 if it cannot be found)."""
+    if sys.platform == "win32":
+        try:
+            num = int(os.environ["NUMBER_OF_PROCESSORS"])
+        except (ValueError, KeyError):
+            num = 0
+    else:
+        try:
+            num = os.sysconf("SC_NPROCESSORS_ONLN")
+        except (ValueError, OSError, AttributeError):
+            num = 0
+    if num >= 1:
+        return num
+    else:
+        return 1
@@ -14,8 +14,8 @@ from py_compile \
 if sys.version_info[0] < 3:
     from _bytecode_2 \
         import \
-            bcompile
+            bcompile, MAGIC
 else:
     from bento.private._bytecode_3 \
         import \
-            bcompile
+            bcompile, MAGIC
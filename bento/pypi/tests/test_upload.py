@@ -1,11 +1,12 @@
 import os
+import socket
 import shutil
+import hashlib
 import tempfile
+import threading
 
 import os.path as op
 
-import mock
-
 import bento.errors
 import six
 
@@ -17,7 +18,8 @@ from bento.pypi.register_utils \
         PyPIConfig
 from bento.pypi.upload_utils \
     import \
-        build_upload_post_data, build_request, upload
+        build_upload_post_data, build_request, upload, MultipartBody, \
+        FileContent, UploadConnection, CHUNK_SIZE
 
 from bento.compat.api import moves
 
@@ -26,34 +28,72 @@ from six \
         PY3
 
 if PY3:
-    from urllib.request \
+    from http.server \
         import \
-            HTTPPasswordMgr, urlparse, HTTPError, URLError
+            HTTPServer, BaseHTTPRequestHandler
 else:
-    from urllib2 \
+    from BaseHTTPServer \
         import \
-            Request, urlparse, HTTPError, URLError
+            HTTPServer, BaseHTTPRequestHandler
+
+class _UploadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((self.client_address, self.path, body))
+        if self.server.status is None:
+            # Connection closed without any response
+            self.close_connection = True
+            return
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        if self.server.drop:
+            # Connection closed without telling the client
+            self.close_connection = True
+
+    def log_message(self, *a):
+        pass
 
-# FIXME: there has to be a simpler way to do this
-class MockedResult(object):
-    def __init__(self, code, msg):
-        self._code = code
-        self.msg = msg
+class _HTTPServer(HTTPServer):
+    def shutdown_request(self, request):
+        HTTPServer.shutdown_request(self, request)
+        self.closed.set()
 
-    def getcode(self):
-        return self._code
+class _UploadServer(object):
+    """Local stand-in for a PyPI server (or proxy), recording the requests it
+    gets.
 
-#def raise_error_factory(url=None, code=200, msg=""):
-#    if url is None:
-#        url = "http://example.com"
-#    def f(request):
-#        raise urllib2.HTTPError(url, code, msg, {}, six.moves.StringIO())
-#    return f
+    If status is None, connections are closed without answering. If drop is
+    True, they are closed after the response, without telling the client."""
+    def __init__(self, status=200, drop=False):
+        self.server = _HTTPServer(("127.0.0.1", 0), _UploadHandler)
+        self.server.requests = []
+        self.server.status = status
+        self.server.drop = drop
+        self.server.closed = threading.Event()
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
 
-def my_urlopen_factory(exception):
-    def my_urlopen(request):
-        raise exception
-    return my_urlopen
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d/pypi" % self.server.server_address[1]
+
+    @property
+    def closed(self):
+        """Event set whenever the server closed a connection."""
+        return self.server.closed
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
 
 class TestUpload(moves.unittest.TestCase):
     def setUp(self):
@@ -83,7 +123,9 @@ Name: foo
     def test_upload_post_data(self):
         post_data = build_upload_post_data("foo.bin", "bdist_dumb", self.package)
         self.assertEqual(post_data[":action"], "file_upload")
-        self.assertEqual(post_data["content"], ("foo.bin", six.b("garbage")))
+        filename, content = post_data["content"]
+        self.assertEqual(filename, "foo.bin")
+        self.assertEqual(six.b("").join(content), six.b("garbage"))
 
     def test_signing(self):
         self.assertRaises(NotImplementedError, build_upload_post_data, "foo.bin", "bdist_dumb", self.package, True)
@@ -94,27 +136,129 @@ Name: foo
         request = build_request(repository, post_data, "dummy_auth")
         r_headers = {
                 "Content-type": six.b("multipart/form-data; boundary=--------------GHSKFJDLGDS7543FJKLFHRE75642756743254"),
-                "Content-length": "2229",
+                "Content-length": "2407",
                 "Authorization": "dummy_auth"}
         self.assertEqual(request.headers, r_headers)
 
-    @mock.patch("bento.pypi.upload_utils.urlopen", lambda request: MockedResult(200, ""))
+    def test_multipart_body(self):
+        body = MultipartBody([("name", "foo")], [("content", "foo.bin", FileContent("foo.bin"))])
+        data = six.b("").join(body)
+        self.assertEqual(len(data), len(body))
+        self.assertTrue(hashlib.md5(six.b("garbage")).hexdigest().encode("ascii") in data)
+        self.assertTrue(hashlib.sha256(six.b("garbage")).hexdigest().encode("ascii") in data)
+
+    def test_multipart_body_streamed(self):
+        fp = open("big.bin", "wb")
+        try:
+            fp.write(six.b("x") * (10 * CHUNK_SIZE + 3))
+        finally:
+            fp.close()
+        body = MultipartBody([], [("content", "big.bin", FileContent("big.bin"))])
+        size = 0
+        for chunk in body:
+            self.assertTrue(len(chunk) <= CHUNK_SIZE)
+            size += len(chunk)
+        self.assertEqual(size, len(body))
+
     def test_upload(self):
-        config = PyPIConfig("john", "password", repository="http://localhost")
-        upload("foo.bin", "bdist_dumb", self.package, config)
+        server = _UploadServer()
+        try:
+            config = PyPIConfig("john", "password", repository=server.url)
+            upload("foo.bin", "bdist_dumb", self.package, config)
+        finally:
+            server.close()
+        self.assertEqual(len(server.requests), 1)
+        address, path, body = server.requests[0]
+        self.assertEqual(path, "/pypi")
+        self.assertTrue(six.b("garbage") in body)
+        self.assertTrue(hashlib.md5(six.b("garbage")).hexdigest().encode("ascii") in body)
+
+    def test_upload_connection_reuse(self):
+        server = _UploadServer()
+        try:
+            config = PyPIConfig("john", "password", repository=server.url)
+            connection = UploadConnection(config.repository)
+            try:
+                upload("foo.bin", "bdist_dumb", self.package, config, connection=connection)
+                upload("foo.bin", "sdist", self.package, config, connection=connection)
+            finally:
+                connection.close()
+        finally:
+            server.close()
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(server.requests[0][0], server.requests[1][0])
+
+    def test_upload_connection_dropped(self):
+        server = _UploadServer(drop=True)
+        try:
+            config = PyPIConfig("john", "password", repository=server.url)
+            connection = UploadConnection(config.repository)
+            try:
+                upload("foo.bin", "bdist_dumb", self.package, config, connection=connection)
+                server.closed.wait(10)
+                upload("foo.bin", "sdist", self.package, config, connection=connection)
+            finally:
+                connection.close()
+        finally:
+            server.close()
+        self.assertEqual(len(server.requests), 2)
+        self.assertNotEqual(server.requests[0][0], server.requests[1][0])
+
+    def test_upload_no_retry_once_sent(self):
+        """Check an upload is not sent again on a new connection when the
+        connection was lost after sending it."""
+        server = _UploadServer()
+        try:
+            config = PyPIConfig("john", "password", repository=server.url)
+            connection = UploadConnection(config.repository)
+            try:
+                upload("foo.bin", "bdist_dumb", self.package, config, connection=connection)
+                server.server.status = None
+                self.assertRaises(bento.errors.PyPIError, upload, "foo.bin", "sdist",
+                                  self.package, config, connection=connection)
+            finally:
+                connection.close()
+        finally:
+            server.close()
+        self.assertEqual(len(server.requests), 2)
+
+    def test_upload_proxy(self):
+        server = _UploadServer()
+        old_environ = dict(os.environ)
+        try:
+            for name in ["no_proxy", "NO_PROXY"]:
+                os.environ.pop(name, None)
+            os.environ["http_proxy"] = "http://127.0.0.1:%d" % server.server.server_address[1]
+            config = PyPIConfig("john", "password", repository="http://pypi.invalid/pypi")
+            upload("foo.bin", "bdist_dumb", self.package, config)
+        finally:
+            os.environ.clear()
+            os.environ.update(old_environ)
+            server.close()
+        self.assertEqual(len(server.requests), 1)
+        address, path, body = server.requests[0]
+        self.assertEqual(path, "http://pypi.invalid/pypi")
+        self.assertTrue(six.b("garbage") in body)
 
-    @mock.patch("bento.pypi.upload_utils.urlopen", my_urlopen_factory(
-        HTTPError("", 404, "url not found", {}, six.moves.StringIO())))
     def test_upload_error_404(self):
-        config = PyPIConfig("john", "password", repository="http://localhost")
-        self.assertRaises(bento.errors.PyPIError, upload, "foo.bin", "bdist_dumb", self.package, config)
+        server = _UploadServer(404)
+        try:
+            config = PyPIConfig("john", "password", repository=server.url)
+            self.assertRaises(bento.errors.PyPIError, upload, "foo.bin", "bdist_dumb", self.package, config)
+        finally:
+            server.close()
 
-    @mock.patch("bento.pypi.upload_utils.urlopen", my_urlopen_factory(URLError("dummy")))
     def test_upload_error_no_host(self):
-        config = PyPIConfig("john", "password", repository="http://llocalhost")
+        # Port nothing listens to
+        s = socket.socket()
+        try:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        finally:
+            s.close()
+        config = PyPIConfig("john", "password", repository="http://127.0.0.1:%d" % port)
         self.assertRaises(bento.errors.PyPIError, upload, "foo.bin", "bdist_dumb", self.package, config)
 
-    @mock.patch("bento.pypi.upload_utils.urlopen", lambda request: MockedResult(200, ""))
     def test_upload_auth(self):
         config = PyPIConfig("john", "password", repository="http://localhost")
         self.assertRaises(NotImplementedError, upload, "foo.bin", "bdist_dumb", self.package, config, True)
@@ -5,7 +5,7 @@ import os.path as op
 
 from bento.pypi.register_utils \
     import \
-        encode_multipart, _BOUNDARY
+        _BOUNDARY
 from bento.conv \
     import \
         pkg_to_distutils_meta_pkg_info
@@ -23,43 +23,136 @@ from six \
 import six
 
 try:
-    from hashlib import md5
+    from hashlib import md5, sha256
 except ImportError:
     from md5 import md5
+    sha256 = None
 
+import socket
+import select
 
-
+from six.moves \
+    import \
+        http_client
 
 if PY3:
     from urllib.request \
         import \
-            Request, HTTPBasicAuthHandler, HTTPError, URLError, urlparse, urlopen
+            Request, urlparse, build_opener, getproxies, proxy_bypass, \
+            HTTPError, URLError
 else:
     from urllib2 \
         import \
-            Request, HTTPBasicAuthHandler, HTTPError, URLError, urlopen
+            Request, build_opener, HTTPError, URLError
+    from urllib \
+        import \
+            getproxies, proxy_bypass
     from urlparse \
         import \
             urlparse
 
+# Size of the chunks uploaded files are read and sent by
+CHUNK_SIZE = 2 ** 16
+
+class FileContent(object):
+    """Content of a file to upload, only read by chunks while it is sent."""
+    def __init__(self, filename):
+        self.filename = filename
+        self.size = op.getsize(filename)
+
+    def __iter__(self):
+        f = open(self.filename, "rb")
+        try:
+            while True:
+                data = f.read(CHUNK_SIZE)
+                if not data:
+                    break
+                yield data
+        finally:
+            f.close()
+
+class MultipartBody(object):
+    """multipart/form-data body, generated by chunks while it is sent.
+
+    Same as encode_multipart, except that file values may be FileContent
+    instances. For those, the md5_digest and sha256_digest fields PyPI expects
+    are computed while the file is read, and sent right after it. The body
+    length is known beforehand, so that it can be sent with a
+    Content-Length header."""
+    def __init__(self, fields, files, boundary=None):
+        if boundary is None:
+            boundary = _BOUNDARY
+        self.boundary = boundary
+        self.content_type = six.b('multipart/form-data; boundary=') + boundary
+
+        # Each element is a bytes string, a FileContent instance or a
+        # (digest name, hash object factory) pair, the elements being
+        # separated by CRLF
+        self._elements = []
+        for key, values in fields:
+            if not isinstance(values, (tuple, list)):
+                values = [values]
+            for value in values:
+                self._add_part(('Content-Disposition: form-data; name="%s"' % key).encode("utf-8"),
+                               value.encode("utf-8"))
+
+        for key, filename, value in files:
+            self._add_part(('Content-Disposition: form-data; name="%s"; filename="%s"' %
+                            (key, filename)).encode("utf-8"), value)
+            if isinstance(value, FileContent):
+                for name, factory in [("md5_digest", md5), ("sha256_digest", sha256)]:
+                    if factory is not None:
+                        self._add_part(('Content-Disposition: form-data; name="%s"' % name).encode("utf-8"),
+                                       (name, factory))
+
+        self._elements.append(six.b('--') + boundary + six.b('--'))
+        self._elements.append(six.b(''))
+
+    def _add_part(self, disposition, value):
+        self._elements.extend([six.b('--') + self.boundary, disposition, six.b(''), value])
+
+    def __len__(self):
+        size = 2 * (len(self._elements) - 1)
+        for element in self._elements:
+            if isinstance(element, FileContent):
+                size += element.size
+            elif isinstance(element, tuple):
+                size += 2 * element[1]().digest_size
+            else:
+                size += len(element)
+        return size
+
+    def __iter__(self):
+        crlf = six.b('\r\n')
+        digests = {}
+        for i, element in enumerate(self._elements):
+            if i > 0:
+                yield crlf
+            if isinstance(element, FileContent):
+                hashes = [(name, factory()) for name, factory in \
+                          [("md5_digest", md5), ("sha256_digest", sha256)] if factory is not None]
+                for chunk in element:
+                    for name, h in hashes:
+                        h.update(chunk)
+                    yield chunk
+                for name, h in hashes:
+                    digests[name] = h.hexdigest().encode("ascii")
+            elif isinstance(element, tuple):
+                yield digests[element[0]]
+            else:
+                yield element
+
 def build_upload_post_data(filename, dist_type, package, sign=False, comment=""):
     pyversion = ".".join(str(i) for i in sys.version_info[:2])
 
-    f = open(filename,'rb')
-    try:
-        content = f.read()
-    finally:
-        f.close()
-
     data = pkg_to_distutils_meta_pkg_info(package)
     data[":action"] = "file_upload"
     data["protocol_version"] = "1"
     data.update({
-        # file content
-        'content': (op.basename(filename), content),
+        # file content (and digests, see MultipartBody)
+        'content': (op.basename(filename), FileContent(filename)),
         'filetype': dist_type,
         'pyversion': pyversion,
-        'md5_digest': md5(content).hexdigest(),
 
         # additional meta-data
         'metadata_version' : '1.0',
@@ -80,21 +173,142 @@ def build_request(repository, post_data, auth):
         if key in post_data:
             filename_, value = post_data.pop(key)
             files.append((key, filename_, value))
-    content_type, body = encode_multipart(post_data.items(), files)
+    body = MultipartBody(post_data.items(), files)
 
-    headers = {'Content-type': content_type,
+    headers = {'Content-type': body.content_type,
                'Content-length': str(len(body)),
                'Authorization': auth}
 
     return Request(repository, data=body, headers=headers)
 
-def upload(dist_filename, dist_type, package, config, sign=False):
-    schema, netloc, url, params, query, fragments = urlparse(config.repository)
-    if params or query or fragments:
-        raise InvalidRepository("Incompatible url %s" % config.repository)
+def _is_dropped(connection):
+    """Return True if the given idle connection cannot be used anymore: the
+    server sends nothing between two requests, except when closing it."""
+    sock = connection.sock
+    if sock is None:
+        return True
+    try:
+        return bool(select.select([sock], [], [], 0)[0])
+    except (select.error, ValueError):
+        return True
+
+class UploadConnection(object):
+    """HTTP connection to a repository, kept alive across the uploads of one
+    session.
+
+    If a proxy is configured for the repository (http_proxy and https_proxy
+    environment variables), requests go through urllib instead, one
+    connection per request."""
+    def __init__(self, repository):
+        schema, netloc, url, params, query, fragments = urlparse(repository)
+        if params or query or fragments:
+            raise InvalidRepository("Incompatible url %s" % repository)
+        if schema not in ('http', 'https'):
+            raise InvalidRepository("unsupported schema " + schema)
+
+        self.repository = repository
+        self._schema = schema
+        self._netloc = netloc
+        self._path = url or "/"
+        self._connection = None
+        self._proxied = schema in getproxies() and not proxy_bypass(netloc)
+
+    def _connect(self):
+        if self._schema == "https":
+            return http_client.HTTPSConnection(self._netloc)
+        else:
+            return http_client.HTTPConnection(self._netloc)
+
+    def _send(self, request):
+        connection = self._connection
+        connection.putrequest("POST", self._path)
+        for name, value in request.header_items():
+            connection.putheader(name, value)
+        connection.endheaders()
+        for chunk in request.data:
+            connection.send(chunk)
+
+    def _post(self, request):
+        if self._connection is not None and _is_dropped(self._connection):
+            self.close()
+        reused = self._connection is not None
+        if not reused:
+            self._connection = self._connect()
+        try:
+            self._send(request)
+        except (socket.error, http_client.HTTPException):
+            self.close()
+            if not reused:
+                raise
+            # The server closed the connection before getting the whole
+            # request, so it cannot have handled it: try once more with a new
+            # one. Failures once the request was written are not retried, as
+            # the upload may have been done.
+            self._connection = self._connect()
+            self._send(request)
+
+        response = self._connection.getresponse()
+        try:
+            response.read()
+        finally:
+            response.close()
+        if response.will_close:
+            self.close()
+        return response.status, response.reason
 
-    if schema not in ('http', 'https'):
-        raise InvalidRepository("unsupported schema " + schema)
+    def _post_proxied(self, request):
+        if not PY3:
+            # urllib2 cannot send an iterable body
+            request = Request(request.get_full_url(), six.b("").join(request.data),
+                              dict(request.header_items()))
+        # A new opener, for the proxies to be read from the current
+        # environment
+        try:
+            response = build_opener().open(request)
+        except HTTPError:
+            e = extract_exception()
+            return e.code, e.msg
+        except URLError:
+            e = extract_exception()
+            raise PyPIError(
+                    "Could not upload to repository %r - error %s" \
+                    % (self.repository, e.reason))
+        try:
+            response.read()
+        finally:
+            response.close()
+        return response.getcode(), response.msg
+
+    def post(self, request):
+        """Send the given request, and return the (status, reason) of the
+        response."""
+        try:
+            if self._proxied:
+                return self._post_proxied(request)
+            return self._post(request)
+        except (socket.error, http_client.HTTPException):
+            e = extract_exception()
+            self.close()
+            raise PyPIError(
+                    "Could not upload to repository %r - error %s" \
+                    % (self.repository, e))
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+def upload(dist_filename, dist_type, package, config, sign=False, connection=None):
+    """Upload the given distribution file.
+
+    connection is the UploadConnection to config.repository to use, a new one
+    being created (and closed) if not given."""
+    if connection is None:
+        connection = UploadConnection(config.repository)
+        try:
+            return upload(dist_filename, dist_type, package, config, sign, connection)
+        finally:
+            connection.close()
 
     if sign:
         raise NotImplementedError()
@@ -104,21 +318,7 @@ def upload(dist_filename, dist_type, package, config, sign=False):
     auth = six.b("Basic ") + base64.standard_b64encode(userpass)
     request = build_request(config.repository, data, auth)
 
-    try:
-        result = urlopen(request)
-        status = result.getcode()
-        reason = result.msg
-    except HTTPError:
-        e = extract_exception()
-        status = e.code
-        reason = e.msg
-    except URLError:
-        e = extract_exception()
-        reason = e.reason
-        raise PyPIError(
-                "Could not upload to repository %r - error %s" \
-                % (config.repository, reason))
-
+    status, reason = connection.post(request)
     if status != 200:
         raise PyPIError(
                 "Could not upload to repository %r - error %s (server answered '%s')" \
@@ -2,6 +2,8 @@ import os
 import tempfile
 import shutil
 
+import mock
+
 from six.moves import StringIO
 
 from bento.compat.api \
@@ -19,6 +21,9 @@ from bento.testing.misc \
 from bento.installed_package_description \
     import \
         BuildManifest, InstalledSection, iter_files
+from bento.utils.utils \
+    import \
+        file_checksum
 
 class TestInstalledSection(unittest.TestCase):
     def test_simple(self):
@@ -94,3 +99,35 @@ class TestIterFiles(unittest.TestCase):
                ("pythonfiles", os.path.join(self.top_node.abspath(), "source", "scripts", "foo.py"),
                                os.path.join(target_dir, "scripts", "foo.py"))]
         self.assertEqual(res, ref)
+
+    def test_same_target(self):
+        """Check a target installed from several sections with the same
+        content is only installed once, and each source read once at most."""
+        sources = []
+        for i in range(3):
+            n = self.top_node.make_node("dup%d.py" % i)
+            n.write("dup")
+            sources.append(n)
+        target = self.top_node.make_node("target/dup.py")
+        sections = {"pythonfiles": dict([("s%d" % i, [(source, target)])
+                                         for i, source in enumerate(sources)])}
+
+        p = mock.patch("bento.installed_package_description.file_checksum",
+                       mock.Mock(side_effect=file_checksum))
+        mocked = p.start()
+        try:
+            res = list(iter_files(sections))
+        finally:
+            p.stop()
+        self.assertEqual(len(res), 1)
+        checksummed = [args[0] for args, kw in mocked.call_args_list]
+        self.assertEqual(len(checksummed), len(set(checksummed)))
+
+    def test_conflicting_target(self):
+        target = self.top_node.make_node("target/dup.py")
+        sections = {"pythonfiles": {}}
+        for i, content in enumerate(["dup", "dup", "dop"]):
+            n = self.top_node.make_node("dup%d.py" % i)
+            n.write(content)
+            sections["pythonfiles"]["s%d" % i] = [(n, target)]
+        self.assertRaises(IOError, lambda: list(iter_files(sections)))
@@ -0,0 +1,289 @@
+"""Compression helpers where the compression itself is done from several
+threads (zlib and lzma release the GIL while compressing)."""
+import os
+import stat
+import time
+import zlib
+import struct
+import hashlib
+
+import six
+
+from bento.utils.utils \
+    import \
+        threaded_map, MODE_755
+
+import bento.compat.api as compat
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+MODE_644 = stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH
+
+# Size of the chunks files are read by
+CHUNK_SIZE = 2 ** 16
+
+# Number of items compressed concurrently for each job: the compressed
+# content of a batch is kept in memory until written
+_BATCH_PER_JOB = 4
+
+def iter_file_chunks(filename):
+    fid = open(filename, "rb")
+    try:
+        while True:
+            data = fid.read(CHUNK_SIZE)
+            if not data:
+                break
+            yield data
+    finally:
+        fid.close()
+
+def deflate_chunks(chunks):
+    """Return (sha256 digest, size, crc32, raw deflated content) of the data
+    in the given chunks, computed in a single pass."""
+    m = hashlib.sha256()
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    crc = 0
+    size = 0
+    deflated = []
+    for chunk in chunks:
+        m.update(chunk)
+        crc = zlib.crc32(chunk, crc)
+        size += len(chunk)
+        deflated.append(compressor.compress(chunk))
+    deflated.append(compressor.flush())
+    return m.digest(), size, crc & 0xffffffff, six.b("").join(deflated)
+
+def normalized_mode(mode):
+    """Return 755 for executable files, 644 otherwise."""
+    if mode & stat.S_IXUSR:
+        return MODE_755
+    else:
+        return MODE_644
+
+def _date_time(mtime, utc=False):
+    # zip cannot represent dates before 1980
+    mtime = max(mtime, 315532800)
+    if utc:
+        return time.gmtime(mtime)[:6]
+    else:
+        return time.localtime(mtime)[:6]
+
+class ParallelZipFile(object):
+    """Zip archive opened for writing, whose members may be deflated from
+    several threads.
+
+    Only write_files with jobs > 1 deflates members in threads, appending
+    their compressed content through private ZipFile attributes (see
+    write_deflated). Everything else goes through the public ZipFile API.
+
+    If mtime is given, every member gets this modification time (as UTC) and
+    a normalized mode (see normalized_mode), for reproducible archives."""
+    def __init__(self, filename, mtime=None):
+        self.filename = filename
+        self.mtime = mtime
+        self._zid = compat.ZipFile(filename, "w", compat.ZIP_DEFLATED)
+
+    def _zip_info(self, arcname, mode, mtime):
+        if self.mtime is None:
+            date_time = _date_time(mtime)
+        else:
+            date_time = _date_time(self.mtime, utc=True)
+            mode = normalized_mode(mode)
+
+        zinfo = compat.ZipInfo(arcname, date_time)
+        zinfo.compress_type = compat.ZIP_DEFLATED
+        zinfo.external_attr = (mode & 0xFFFF) << 16
+        return zinfo
+
+    def write_data(self, arcname, mode, mtime, data):
+        """Add a member with the given binary content."""
+        self._zid.writestr(self._zip_info(arcname, mode, mtime), data)
+
+    def write_deflated(self, arcname, mode, mtime, deflated):
+        """Add a member from its deflate_chunks result.
+
+        ZipFile has no public API to add already compressed data, so this
+        does what ZipFile.write does once the data is compressed, using
+        ZipFile private attributes."""
+        digest, size, crc, data = deflated
+        zinfo = self._zip_info(arcname, mode, mtime)
+        zinfo.file_size = size
+        zinfo.compress_size = len(data)
+        zinfo.CRC = crc
+
+        zid = self._zid
+        zid._writecheck(zinfo)
+        zid._didModify = True
+        if hasattr(zid, "start_dir"):
+            zid.fp.seek(zid.start_dir)
+        zinfo.header_offset = zid.fp.tell()
+        zid.fp.write(zinfo.FileHeader())
+        zid.fp.write(data)
+        zid.filelist.append(zinfo)
+        zid.NameToInfo[zinfo.filename] = zinfo
+        if hasattr(zid, "start_dir"):
+            zid.start_dir = zid.fp.tell()
+
+    def write_files(self, files, jobs=1):
+        """Add the given (filename, arcname) files, deflating them from up to
+        jobs threads. Each file is read once."""
+        if jobs <= 1:
+            for filename, arcname in files:
+                st = os.stat(filename)
+                data = six.b("").join(iter_file_chunks(filename))
+                self.write_data(arcname, st.st_mode, st.st_mtime, data)
+            return
+
+        def _deflate_file(item):
+            return deflate_chunks(iter_file_chunks(item[0]))
+
+        files = list(files)
+        batch_size = jobs * _BATCH_PER_JOB
+        for i in range(0, len(files), batch_size):
+            batch = files[i:i+batch_size]
+            for (filename, arcname), deflated in zip(batch, threaded_map(_deflate_file, batch, jobs)):
+                st = os.stat(filename)
+                self.write_deflated(arcname, st.st_mode, st.st_mtime, deflated)
+
+    def writestr(self, arcname, data):
+        """Add a member with the given content (text is encoded as utf-8)."""
+        if not isinstance(data, six.binary_type):
+            data = data.encode("utf-8")
+        self.write_data(arcname, MODE_644, time.time(), data)
+
+    def close(self):
+        self._zid.close()
+
+class _ParallelBlockWriter(object):
+    """Write-only file object compressing the data written into it by blocks,
+    from several threads, into fileobj (which is not closed)."""
+    block_size = 2 ** 20
+
+    def __init__(self, fileobj, jobs=1):
+        self.fileobj = fileobj
+        self.jobs = max(jobs, 1)
+        self._buffer = []
+        self._buffered = 0
+        # Last uncompressed block written, as some formats use it to prime
+        # the compression of the next one
+        self._previous = six.b("")
+        self._started = False
+        self.closed = False
+
+    def write(self, data):
+        if not self._started:
+            self.fileobj.write(self._header())
+            self._started = True
+        self._update(data)
+        self._buffer.append(data)
+        self._buffered += len(data)
+        if self._buffered > self.block_size * self.jobs:
+            self._flush_blocks(last=False)
+
+    def _flush_blocks(self, last):
+        data = six.b("").join(self._buffer)
+        n = len(data) // self.block_size
+        if last:
+            # The last block is never empty, unless there is no data at all
+            if len(data) % self.block_size or n == 0:
+                n += 1
+        blocks = [data[i*self.block_size:(i+1)*self.block_size] for i in range(n)]
+        rest = data[n*self.block_size:]
+
+        items = []
+        previous = self._previous
+        for i, block in enumerate(blocks):
+            items.append((block, previous, last and i == len(blocks) - 1))
+            previous = block
+        for compressed in threaded_map(lambda item: self._compress(*item), items, self.jobs):
+            self.fileobj.write(compressed)
+
+        self._previous = previous
+        self._buffer = [rest]
+        self._buffered = len(rest)
+
+    def close(self):
+        if self.closed:
+            return
+        if not self._started:
+            self.fileobj.write(self._header())
+            self._started = True
+        self._flush_blocks(last=True)
+        self.fileobj.write(self._trailer())
+        self.closed = True
+
+    def _update(self, data):
+        pass
+
+    def _header(self):
+        return six.b("")
+
+    def _trailer(self):
+        return six.b("")
+
+    def _compress(self, block, previous, last):
+        raise NotImplementedError()
+
+class ParallelGzipWriter(_ParallelBlockWriter):
+    """pigz-like gzip compression: the blocks are compressed independently,
+    each one primed with the end of the previous block, and concatenated
+    into a single gzip member."""
+    block_size = 2 ** 17
+
+    def __init__(self, fileobj, jobs=1, compresslevel=9, mtime=None):
+        super(ParallelGzipWriter, self).__init__(fileobj, jobs)
+        self.compresslevel = compresslevel
+        if mtime is None:
+            mtime = time.time()
+        self.mtime = int(mtime)
+        self._crc = 0
+        self._size = 0
+
+    def _update(self, data):
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+
+    def _header(self):
+        if self.compresslevel == 9:
+            xfl = 2
+        else:
+            xfl = 0
+        # magic, deflate method, no flag, mtime, extra flags, unknown OS
+        return struct.pack("<BBBBIBB", 0x1f, 0x8b, 8, 0, self.mtime & 0xffffffff, xfl, 255)
+
+    def _trailer(self):
+        return struct.pack("<II", self._crc & 0xffffffff, self._size & 0xffffffff)
+
+    def _compress(self, block, previous, last):
+        dictionary = previous[-2 ** 15:]
+        try:
+            compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED,
+                    -zlib.MAX_WBITS, 8, zlib.Z_DEFAULT_STRATEGY, dictionary)
+        except TypeError:
+            # No preset dictionary before python 3.3
+            compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED,
+                    -zlib.MAX_WBITS)
+        if last:
+            mode = zlib.Z_FINISH
+        else:
+            # Sync flush ends the block on a byte boundary without marking it
+            # as the final one, so that the next block can be appended
+            mode = zlib.Z_SYNC_FLUSH
+        return compressor.compress(block) + compressor.flush(mode)
+
+class ParallelXzWriter(_ParallelBlockWriter):
+    """Compress each block as a separate xz stream, xz files made of
+    concatenated streams being valid."""
+    block_size = 2 ** 23
+
+    def __init__(self, fileobj, jobs=1, preset=None):
+        if lzma is None:
+            raise ValueError("xz compression requires the lzma module")
+        super(ParallelXzWriter, self).__init__(fileobj, jobs)
+        self.preset = preset
+
+    def _compress(self, block, previous, last):
+        return lzma.compress(block, format=lzma.FORMAT_XZ, preset=self.preset)
@@ -0,0 +1,43 @@
+"""Records kept by the incremental commands (install, sdist) of what they
+produced, and from which files."""
+import os
+import sys
+
+if sys.version_info[0] < 3:
+    import cPickle as pickle
+else:
+    import pickle
+
+from bento.utils.utils \
+    import \
+        pprint
+import bento.utils.io2
+import bento.utils.path
+
+def output_signature(filename):
+    """Return the (size, mtime) of a file produced by a command, to detect
+    whether it was modified since (links are not followed)."""
+    st = os.lstat(filename)
+    return (st.st_size, st.st_mtime)
+
+class PickledRecord(object):
+    """Dictionary of records (records attribute) pickled into filename.
+
+    The records are empty if filename does not exist or cannot be read."""
+    def __init__(self, filename):
+        self.filename = filename
+        self.records = {}
+        if os.path.exists(filename):
+            fid = open(filename, "rb")
+            try:
+                try:
+                    self.records = pickle.load(fid)
+                except Exception:
+                    pprint("YELLOW", "Ignoring invalid record %s" % filename)
+            finally:
+                fid.close()
+
+    def write(self):
+        bento.utils.path.ensure_dir(self.filename)
+        bento.utils.io2.safe_write(self.filename,
+                                   lambda fd: pickle.dump(self.records, fd))
@@ -0,0 +1,136 @@
+import os
+import gzip
+import shutil
+import zipfile
+import tempfile
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+import six
+import mock
+
+from bento.compat.api.moves \
+    import \
+        unittest
+from bento.core.testing \
+    import \
+        skip_if
+from bento.utils.compress \
+    import \
+        ParallelGzipWriter, ParallelXzWriter, ParallelZipFile
+
+def _data(size):
+    # Compressible, but not trivially
+    return six.b("").join([six.b("%d," % (i * 7919 % 10007)) for i in range(size)])[:size]
+
+class _TestWriter(object):
+    writer_class = None
+
+    def _compress(self, data, jobs, block_size=None):
+        fid = six.BytesIO()
+        writer = self.writer_class(fid, jobs)
+        if block_size is not None:
+            writer.block_size = block_size
+        # Written by small chunks, as tarfile does
+        for i in range(0, len(data), 10000):
+            writer.write(data[i:i+10000])
+        writer.close()
+        return fid.getvalue()
+
+    def test_roundtrip(self):
+        for size in [0, 1, 4096, 4096 * 3, 100001]:
+            data = _data(size)
+            for jobs in [1, 3]:
+                compressed = self._compress(data, jobs, block_size=4096)
+                self.assertEqual(self.decompress(compressed), data)
+
+class TestParallelGzipWriter(_TestWriter, unittest.TestCase):
+    writer_class = ParallelGzipWriter
+
+    def decompress(self, data):
+        fid = gzip.GzipFile(fileobj=six.BytesIO(data))
+        try:
+            return fid.read()
+        finally:
+            fid.close()
+
+    def test_jobs_independent(self):
+        data = _data(100001)
+        self.assertEqual(self._compress(data, 1, 4096), self._compress(data, 4, 4096))
+
+class TestParallelXzWriter(_TestWriter, unittest.TestCase):
+    writer_class = ParallelXzWriter
+
+    def decompress(self, data):
+        return lzma.decompress(data)
+
+    @skip_if(lzma is None, "lzma not available")
+    def test_roundtrip(self):
+        super(TestParallelXzWriter, self).test_roundtrip()
+
+class TestParallelZipFile(unittest.TestCase):
+    def setUp(self):
+        self.d = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.d)
+
+    def _files(self):
+        files = []
+        for i in range(20):
+            f = os.path.join(self.d, "f%d.txt" % i)
+            fid = open(f, "wb")
+            try:
+                fid.write(_data(i * 1000))
+            finally:
+                fid.close()
+            files.append((f, "foo/f%d.txt" % i))
+        return files
+
+    def _write_files(self, files, jobs, mtime=None):
+        archive = os.path.join(self.d, "foo-%d.zip" % jobs)
+        zid = ParallelZipFile(archive, mtime=mtime)
+        try:
+            zid.write_files(files, jobs=jobs)
+            zid.writestr("foo/PKG_INFO", "Name: foo\n")
+        finally:
+            zid.close()
+        return archive
+
+    def _read(self, archive):
+        fid = open(archive, "rb")
+        try:
+            return fid.read()
+        finally:
+            fid.close()
+
+    def test_write_files(self):
+        files = self._files()
+        for jobs in [1, 4]:
+            archive = self._write_files(files, jobs)
+            z = zipfile.ZipFile(archive)
+            try:
+                self.assertEqual(z.testzip(), None)
+                self.assertEqual(z.namelist(), [arcname for f, arcname in files] + ["foo/PKG_INFO"])
+                for i in range(20):
+                    self.assertEqual(z.read("foo/f%d.txt" % i), _data(i * 1000))
+            finally:
+                z.close()
+
+    def test_serial(self):
+        """Check ZipFile internals are only used for parallel compression."""
+        p = mock.patch.object(ParallelZipFile, "write_deflated")
+        mocked = p.start()
+        try:
+            self._write_files(self._files(), 1)
+        finally:
+            p.stop()
+        self.assertFalse(mocked.called)
+
+    def test_jobs_independent(self):
+        files = self._files()
+        self.assertEqual(self._read(self._write_files(files, 1, mtime=0)),
+                         self._read(self._write_files(files, 4, mtime=0)))
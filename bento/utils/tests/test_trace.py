@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+import time
+import threading
+
+from bento.compat.api \
+    import \
+        json
+from bento.compat.api.moves \
+    import \
+        unittest
+from bento.utils.trace \
+    import \
+        Tracer, get_tracer, set_tracer, begin, end
+
+class TestTracer(unittest.TestCase):
+    def test_nested(self):
+        tracer = Tracer()
+        outer = tracer.begin("build", "command", {"argv": []})
+        inner = tracer.begin("pre_build", "pre_hook")
+        tracer.end(inner)
+        tracer.end(outer)
+
+        events = tracer.trace_events()
+        self.assertEqual([e["ph"] for e in events], ["M", "X", "X"])
+        self.assertEqual(events[0]["args"], {"name": threading.current_thread().name})
+        build, hook = events[1:]
+        self.assertEqual((build["name"], build["cat"]), ("build", "command"))
+        self.assertEqual(build["args"], {"argv": []})
+        self.assertEqual((hook["name"], hook["cat"]), ("pre_build", "pre_hook"))
+        self.assertFalse("args" in hook)
+        self.assertTrue(build["ts"] <= hook["ts"])
+        self.assertTrue(hook["ts"] + hook["dur"] <= build["ts"] + build["dur"])
+        for e in events:
+            self.assertEqual(e["pid"], os.getpid())
+            self.assertEqual(e["tid"], threading.current_thread().ident)
+
+    def test_threads(self):
+        tracer = Tracer()
+        # Keep the threads alive together, so that they do not share ids
+        lock = threading.Lock()
+        started = []
+        release = threading.Event()
+        def _work():
+            span = tracer.begin("cc", "task")
+            lock.acquire()
+            try:
+                started.append(span)
+            finally:
+                lock.release()
+            release.wait(10)
+            tracer.end(span)
+        threads = [threading.Thread(target=_work) for i in range(3)]
+        for t in threads:
+            t.start()
+        while len(started) < 3:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+        events = tracer.trace_events()
+        names = dict([(e["tid"], e["args"]["name"]) for e in events if e["ph"] == "M"])
+        spans = [e for e in events if e["ph"] == "X"]
+        self.assertEqual(len(spans), 3)
+        self.assertEqual(sorted([names[e["tid"]] for e in spans]),
+                         sorted([t.name for t in threads]))
+
+    def test_async(self):
+        tracer = Tracer()
+        tracer.async_begin("Checking for header foo.h", "check", 1)
+        tracer.async_begin("Checking for header bar.h", "check", 2)
+        tracer.async_end("Checking for header foo.h", "check", 1)
+        tracer.async_end("Checking for header bar.h", "check", 2)
+        events = [e for e in tracer.trace_events() if e["ph"] != "M"]
+        self.assertEqual([(e["ph"], e["id"]) for e in events],
+                         [("b", 1), ("b", 2), ("e", 1), ("e", 2)])
+
+    def test_write(self):
+        d = tempfile.mkdtemp()
+        try:
+            tracer = Tracer()
+            tracer.end(tracer.begin("build", "command"))
+            filename = os.path.join(d, "trace.json")
+            tracer.write(filename)
+
+            fid = open(filename)
+            try:
+                data = json.load(fid)
+            finally:
+                fid.close()
+            self.assertEqual(data["displayTimeUnit"], "ms")
+            self.assertEqual([e["name"] for e in data["traceEvents"]], ["thread_name", "build"])
+        finally:
+            shutil.rmtree(d)
+
+class TestGlobalTracer(unittest.TestCase):
+    def setUp(self):
+        self.old_tracer = set_tracer(None)
+
+    def tearDown(self):
+        set_tracer(self.old_tracer)
+
+    def test_disabled(self):
+        span = begin("build", "command")
+        self.assertTrue(span is None)
+        end(span)
+
+    def test_enabled(self):
+        tracer = Tracer()
+        set_tracer(tracer)
+        self.assertTrue(get_tracer() is tracer)
+        end(begin("build", "command"))
+        self.assertEqual([e["name"] for e in tracer.events], ["build"])
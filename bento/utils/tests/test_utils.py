@@ -21,8 +21,8 @@ from bento.compat.api.moves \
 
 from bento.utils.utils \
     import subst_vars, to_camel_case, explode_path, same_content, \
-        cmd_is_runnable, memoized, comma_list_split, cpu_count, pprint, \
-        virtualenv_prefix
+        cmd_is_runnable, memoized, comma_list_split, cpu_count, pprint, threaded_map, \
+        virtualenv_prefix, file_signature, check_file_signature
 from bento.utils.io2 \
     import \
         safe_write
@@ -110,6 +110,44 @@ class TestSameFile(unittest.TestCase):
         finally:
             os.remove(f1.name)
 
+    def _write(self, data):
+        f = NamedTemporaryFile("wt", delete=False)
+        try:
+            f.write(data)
+        finally:
+            f.close()
+        self._files.append(f.name)
+        return f.name
+
+    def setUp(self):
+        self._files = []
+
+    def tearDown(self):
+        for f in self._files:
+            os.remove(f)
+
+    def test_different_size(self):
+        f1 = self._write("fofo")
+        f2 = self._write("fofofo")
+        p = mock.patch("bento.utils.utils.open", create=True)
+        mocked_open = p.start()
+        try:
+            self.assertFalse(same_content(f1, f2))
+        finally:
+            p.stop()
+        self.assertFalse(mocked_open.called)
+
+    def test_different_late(self):
+        data = "a" * (3 * 2 ** 16 + 7)
+        f1 = self._write(data)
+        f2 = self._write(data[:-1] + "b")
+        self.assertFalse(same_content(f1, f2))
+        self.assertTrue(same_content(f1, self._write(data)))
+
+    def test_same_file(self):
+        f1 = self._write("fofo")
+        self.assertTrue(same_content(f1, f1))
+
 class TestMisc(unittest.TestCase):
     def test_cmd_is_runnable(self):
         st = cmd_is_runnable(["python", "-c", "''"])
@@ -265,3 +303,62 @@ class TestCpuCount(unittest.TestCase):
     @mock.patch("os.popen", lambda s: StringIO("3"))
     def test_bsd(self):
         self.assertEqual(cpu_count(), 3)
+
+class TestThreadedMap(unittest.TestCase):
+    def test_simple(self):
+        self.assertEqual(threaded_map(lambda x: 2 * x, range(50), 4),
+                         [2 * x for x in range(50)])
+        self.assertEqual(threaded_map(lambda x: 2 * x, [], 4), [])
+
+    def test_error(self):
+        def f(x):
+            if x == 10:
+                raise ValueError("yo")
+            return x
+        self.assertRaises(ValueError, lambda: threaded_map(f, range(50), 4))
+
+class TestFileSignature(unittest.TestCase):
+    def setUp(self):
+        self.d = tempfile.mkdtemp()
+        self.filename = op.join(self.d, "foo.txt")
+        self._write("foo")
+        # Old enough for stat metadata to be trusted
+        os.utime(self.filename, (0, 1000))
+
+    def tearDown(self):
+        shutil.rmtree(self.d)
+
+    def _write(self, content):
+        fid = open(self.filename, "w")
+        try:
+            fid.write(content)
+        finally:
+            fid.close()
+
+    def test_racy(self):
+        self._write("bar")
+        self.assertEqual(file_signature(self.filename)[1], None)
+
+    def test_unchanged(self):
+        signature = file_signature(self.filename)
+        p = mock.patch("bento.utils.utils.file_checksum")
+        mocked = p.start()
+        try:
+            self.assertTrue(check_file_signature(self.filename, signature) is signature)
+        finally:
+            p.stop()
+        self.assertFalse(mocked.called)
+
+    def test_touched(self):
+        signature = file_signature(self.filename)
+        os.utime(self.filename, (0, 2000))
+        new_signature = check_file_signature(self.filename, signature)
+        self.assertEqual(new_signature, (3, 2000, signature[2]))
+
+    def test_changed(self):
+        signature = file_signature(self.filename)
+        self._write("bar")
+        os.utime(self.filename, (0, 2000))
+        self.assertEqual(check_file_signature(self.filename, signature), None)
+        os.remove(self.filename)
+        self.assertEqual(check_file_signature(self.filename, signature), None)
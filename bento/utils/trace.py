@@ -0,0 +1,131 @@
+"""Build profiler, recording where the time goes in a bentomaker run as
+Chrome trace-event JSON (to be loaded in chrome://tracing or Perfetto).
+
+Spans are recorded with begin/end pairs::
+
+    span = begin("build", "command")
+    try:
+        ...
+    finally:
+        end(span)
+
+which do nothing unless a Tracer has been installed with set_tracer."""
+import os
+import time
+import threading
+
+from bento.compat.api \
+    import \
+        json
+from bento.utils.io2 \
+    import \
+        safe_write
+
+try:
+    _clock = time.perf_counter
+except AttributeError:
+    _clock = time.time
+
+_TRACER = None
+
+class Span(object):
+    def __init__(self, name, cat, tid, start, args):
+        self.name = name
+        self.cat = cat
+        self.tid = tid
+        self.start = start
+        self.args = args
+
+class Tracer(object):
+    """Collect trace events, from any thread.
+
+    Spans begun and ended from the same thread are recorded as complete
+    events, and nest as the calls do. Asynchronous spans (async_begin and
+    async_end) may overlap each other, and be ended from another thread."""
+    def __init__(self):
+        self.pid = os.getpid()
+        self.events = []
+        # thread id -> thread name
+        self.threads = {}
+        self._origin = _clock()
+        self._lock = threading.Lock()
+
+    def _now(self):
+        # Trace timestamps are in microseconds
+        return (_clock() - self._origin) * 1e6
+
+    def _tid(self):
+        thread = threading.current_thread()
+        tid = thread.ident
+        if not tid in self.threads:
+            self._lock.acquire()
+            try:
+                self.threads[tid] = thread.name
+            finally:
+                self._lock.release()
+        return tid
+
+    def _add(self, event):
+        self._lock.acquire()
+        try:
+            self.events.append(event)
+        finally:
+            self._lock.release()
+
+    def begin(self, name, cat, args=None):
+        return Span(name, cat, self._tid(), self._now(), args)
+
+    def end(self, span):
+        event = {"name": span.name, "cat": span.cat, "ph": "X",
+                 "ts": span.start, "dur": self._now() - span.start,
+                 "pid": self.pid, "tid": span.tid}
+        if span.args:
+            event["args"] = span.args
+        self._add(event)
+
+    def async_begin(self, name, cat, id, args=None):
+        event = {"name": name, "cat": cat, "ph": "b", "id": id,
+                 "ts": self._now(), "pid": self.pid, "tid": self._tid()}
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    def async_end(self, name, cat, id):
+        self._add({"name": name, "cat": cat, "ph": "e", "id": id,
+                   "ts": self._now(), "pid": self.pid, "tid": self._tid()})
+
+    def trace_events(self):
+        """Return the list of events, thread names first, then sorted by
+        timestamp (enclosing spans before the ones they contain)."""
+        events = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+                   "args": {"name": name}} for tid, name in sorted(self.threads.items())]
+        def _key(event):
+            return (event["ts"], -event.get("dur", 0))
+        events.extend(sorted(self.events, key=_key))
+        return events
+
+    def write(self, filename):
+        data = json.dumps({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"})
+        def _writer(fid):
+            fid.write(data)
+        safe_write(filename, _writer, mode="w")
+
+def get_tracer():
+    return _TRACER
+
+def set_tracer(tracer):
+    """Install the given tracer (None to disable tracing), and return the
+    previous one."""
+    global _TRACER
+    old = _TRACER
+    _TRACER = tracer
+    return old
+
+def begin(name, cat, args=None):
+    if _TRACER is None:
+        return None
+    return _TRACER.begin(name, cat, args)
+
+def end(span):
+    if span is not None and _TRACER is not None:
+        _TRACER.end(span)
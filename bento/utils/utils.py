@@ -2,11 +2,15 @@ import os
 import sys
 import stat
 import re
+import time
 import glob
 import shutil
 import errno
 import subprocess
 import shlex
+import threading
+
+import six
 
 from six.moves \
     import \
@@ -161,13 +165,132 @@ def cpu_count():
         return 1
         #raise NotImplementedError('cannot determine number of cpus')
 
+def threaded_map(func, items, jobs):
+    """Return [func(item) for item in items], calling func from up to jobs
+    threads.
+
+    If func raises, no new item is processed, and the first exception is
+    raised again once every thread is done."""
+    items = list(items)
+    jobs = min(jobs, len(items))
+    if jobs <= 1:
+        return [func(item) for item in items]
+
+    results = [None] * len(items)
+    errors = []
+    state = {"next": 0}
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                i = state["next"]
+                if errors or i >= len(items):
+                    return
+                state["next"] = i + 1
+            finally:
+                lock.release()
+            try:
+                results[i] = func(items[i])
+            except Exception:
+                lock.acquire()
+                try:
+                    errors.append(sys.exc_info())
+                finally:
+                    lock.release()
+
+    threads = [threading.Thread(target=worker) for i in range(jobs)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        six.reraise(*errors[0])
+    return results
+
+# Size of the chunks files are read by
+_CHUNK_SIZE = 2 ** 16
+
+def file_checksum(filename):
+    """Return the md5 hexdigest of the given file content, reading it by
+    chunks."""
+    m = md5()
+    fid = open(filename, "rb")
+    try:
+        while True:
+            data = fid.read(_CHUNK_SIZE)
+            if not data:
+                break
+            m.update(data)
+    finally:
+        fid.close()
+    return m.hexdigest()
+
+# A file modified less than RACY_DELAY seconds before its signature was taken
+# may be modified again without any change in its stat metadata
+RACY_DELAY = 2
+
+def file_signature(filename, st=None):
+    """Return the (size, mtime, md5 hexdigest) signature of the given file,
+    st being its stat result if already known.
+
+    mtime is None if the file was modified too recently for its stat metadata
+    to be trusted, so that its content is always checked by
+    check_file_signature."""
+    if st is None:
+        st = os.stat(filename)
+    checksum = file_checksum(filename)
+    if time.time() - st.st_mtime < RACY_DELAY:
+        mtime = None
+    else:
+        mtime = st.st_mtime
+    return (st.st_size, mtime, checksum)
+
+def check_file_signature(filename, signature, st=None):
+    """Return the up to date signature of the given file if its content
+    matches signature (as returned by file_signature), None otherwise.
+
+    The file is only read if its stat metadata changed: signature is returned
+    as is if they did not."""
+    size, mtime, checksum = signature
+    if st is None:
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+    if st.st_size != size:
+        return None
+    if mtime is not None and st.st_mtime == mtime:
+        return signature
+    new_signature = file_signature(filename, st)
+    if new_signature[2] != checksum:
+        return None
+    return new_signature
+
 def same_content(f1, f2):
-    """Return true if files in f1 and f2 has the same content."""
+    """Return true if files in f1 and f2 has the same content.
+
+    Sizes are compared first, and content is then compared by chunks, stopping
+    at the first difference."""
+    st1 = os.stat(f1)
+    st2 = os.stat(f2)
+    if st1.st_size != st2.st_size:
+        return False
+    if (st1.st_dev, st1.st_ino) == (st2.st_dev, st2.st_ino) and st1.st_ino:
+        return True
+
     fid1 = open(f1, "rb")
     try:
         fid2 = open(f2, "rb")
         try:
-            return md5(fid1.read()).digest() == md5(fid2.read()).digest()
+            while True:
+                data1 = fid1.read(_CHUNK_SIZE)
+                data2 = fid2.read(_CHUNK_SIZE)
+                if data1 != data2:
+                    return False
+                if not data1:
+                    return True
         finally:
             fid2.close()
     finally:
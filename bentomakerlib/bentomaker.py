@@ -22,21 +22,6 @@ from bento.compat.api \
         defaultdict, input
 import bento.core.node
 
-from bento.commands.build \
-    import \
-        BuildCommand
-from bento.commands.build_egg \
-    import \
-        BuildEggCommand
-from bento.commands.build_pkg_info \
-    import \
-        BuildPkgInfoCommand
-from bento.commands.build_wininst \
-    import \
-        BuildWininstCommand
-from bento.commands.configure \
-    import \
-        ConfigureCommand
 from bento.commands.core \
     import \
         HelpCommand
@@ -46,28 +31,12 @@ from bento.commands.dependency \
 from bento.commands.hooks \
     import \
         find_pre_hooks, find_post_hooks, find_startup_hooks, \
-        find_shutdown_hooks, find_options_hooks, find_command_hooks
-from bento.commands.install \
-    import \
-        InstallCommand
-from bento.commands.parse \
-    import \
-        ParseCommand
-from bento.commands.register \
-    import \
-        RegisterPyPI
+        find_shutdown_hooks, find_options_hooks, find_command_hooks, \
+        create_hook_module
 from bento.commands.registries \
     import \
-        CommandRegistry, ContextRegistry, OptionsRegistry
-from bento.commands.sdist \
-    import \
-        SdistCommand
-from bento.commands.sphinx_command \
-    import \
-        SphinxCommand
-from bento.commands.upload \
-    import \
-        UploadPyPI
+        CommandRegistry, ContextRegistry, OptionsRegistry, Lazy, lazy_command, \
+        lazy_class
 from bento.commands.options \
     import \
         OptionsContext, Option
@@ -75,9 +44,6 @@ from bento.commands.options \
 from bento.backends.utils \
     import \
         load_backend
-from bento.backends.yaku_backend \
-    import \
-        BuildYakuContext, ConfigureYakuContext
 from bento.commands.command_contexts \
     import \
         HelpContext, SdistContext, ContextWithBuildDirectory
@@ -87,10 +53,8 @@ from bento.commands.wrapper_utils \
 from bento.commands.contexts \
     import \
         GlobalContext
-from bento.convert \
-    import \
-        ConvertCommand, DetectTypeCommand
 import bento.errors
+import bento.utils.trace
 import bento.warnings
 
 from bentomakerlib.package_cache \
@@ -112,7 +76,8 @@ CMD_DATA_DUMP = os.path.join(_SUB_BUILD_DIR, "cmd_data.db")
 
 class GlobalOptions(object):
     def __init__(self, cmd_name, cmd_argv, show_usage, build_directory,
-            bento_info, show_version, show_full_version, disable_autoconfigure):
+            bento_info, show_version, show_full_version, disable_autoconfigure,
+            trace=None):
         self.cmd_name = cmd_name
         self.cmd_argv = cmd_argv
         self.show_usage = show_usage
@@ -121,47 +86,82 @@ class GlobalOptions(object):
         self.show_version = show_version
         self.show_full_version = show_full_version
         self.disable_autoconfigure = disable_autoconfigure
+        self.trace = trace
 
 #================================
 #   Create the command line UI
 #================================
 def register_commands(global_context):
+    # Command modules are only imported when the command is retrieved, so
+    # that running a command does not import every other one. Their short
+    # description is given here, for help to list them without importing them
     global_context.register_command("help", HelpCommand())
-    global_context.register_command("configure", ConfigureCommand())
-    global_context.register_command("build", BuildCommand())
-    global_context.register_command("install", InstallCommand())
-    global_context.register_command("convert", ConvertCommand())
-    global_context.register_command("sdist", SdistCommand())
-    global_context.register_command("build_egg", BuildEggCommand())
-    global_context.register_command("build_wininst", BuildWininstCommand())
-    global_context.register_command("sphinx", SphinxCommand())
-    global_context.register_command("register_pypi", RegisterPyPI())
-    global_context.register_command("upload_pypi", UploadPyPI())
-
-    global_context.register_command("build_pkg_info", BuildPkgInfoCommand(), public=False)
-    global_context.register_command("parse", ParseCommand(), public=False)
-    global_context.register_command("detect_type", DetectTypeCommand(), public=False)
+    global_context.register_command("configure",
+            lazy_command("bento.commands.configure", "ConfigureCommand",
+                         "configure the project."))
+    global_context.register_command("build",
+            lazy_command("bento.commands.build", "BuildCommand",
+                         "build the project."))
+    global_context.register_command("install",
+            lazy_command("bento.commands.install", "InstallCommand",
+                         "install the project."))
+    global_context.register_command("convert",
+            lazy_command("bento.convert", "ConvertCommand",
+                         "convert distutils/setuptools project to bento."))
+    global_context.register_command("sdist",
+            lazy_command("bento.commands.sdist", "SdistCommand",
+                         "create a tarball."))
+    global_context.register_command("build_egg",
+            lazy_command("bento.commands.build_egg", "BuildEggCommand",
+                         "build egg."))
+    global_context.register_command("build_wheel",
+            lazy_command("bento.commands.build_wheel", "BuildWheelCommand",
+                         "build wheel."))
+    global_context.register_command("build_wininst",
+            lazy_command("bento.commands.build_wininst", "BuildWininstCommand",
+                         "build wininst."))
+    global_context.register_command("sphinx",
+            lazy_command("bento.commands.sphinx_command", "SphinxCommand",
+                         "build the project sphinx documentation."))
+    global_context.register_command("register_pypi",
+            lazy_command("bento.commands.register", "RegisterPyPI",
+                         "register packages to pypi."))
+    global_context.register_command("upload_pypi",
+            lazy_command("bento.commands.upload", "UploadPyPI",
+                         "register packages to pypi."))
+
+    global_context.register_command("build_pkg_info",
+            lazy_command("bento.commands.build_pkg_info", "BuildPkgInfoCommand",
+                         "generate PKG-INFO file."), public=False)
+    global_context.register_command("parse",
+            lazy_command("bento.commands.parse", "ParseCommand",
+                         "parse the package description file."), public=False)
+    global_context.register_command("detect_type",
+            lazy_command("bento.convert", "DetectTypeCommand",
+                         "detect extension type."), public=False)
  
     if sys.platform == "darwin":
-        import bento.commands.build_mpkg
         global_context.register_command("build_mpkg",
-            bento.commands.build_mpkg.BuildMpkgCommand(), public=False)
+            lazy_command("bento.commands.build_mpkg", "BuildMpkgCommand",
+                         "build mpkg."), public=False)
         global_context.set_before("build_mpkg", "build")
 
     if sys.platform == "win32":
-        from bento.commands.build_msi \
-            import \
-                BuildMsiCommand
-        global_context.register_command("build_msi", BuildMsiCommand())
+        global_context.register_command("build_msi",
+            lazy_command("bento.commands.build_msi", "BuildMsiCommand",
+                         "build msi."))
         global_context.set_before("build_msi", "build")
 
 def register_options(global_context, cmd_name):
-    """Register options for the given command."""
-    cmd = global_context.retrieve_command(cmd_name)
-    context = OptionsContext.from_command(cmd)
+    """Register options for the given command.
+
+    The options context (and the command) is only created when the options
+    context is retrieved."""
+    def _create():
+        return OptionsContext.from_command(global_context.retrieve_command(cmd_name))
 
     if not global_context.is_options_context_registered(cmd_name):
-        global_context.register_options_context(cmd_name, context)
+        global_context.register_options_context(cmd_name, Lazy(_create))
 
 def register_options_special(global_context):
     # Register options for special topics not attached to a "real" command
@@ -184,9 +184,10 @@ def register_command_contexts(global_context):
    # global_context.register_default_context(CmdContext)
     default_mapping = defaultdict(lambda: ContextWithBuildDirectory)
     default_mapping.update(dict([
-            ("configure", ConfigureYakuContext),
-            ("build", BuildYakuContext),
+            ("configure", lazy_class("bento.backends.yaku_backend", "ConfigureYakuContext")),
+            ("build", lazy_class("bento.backends.yaku_backend", "BuildYakuContext")),
             ("build_egg", ContextWithBuildDirectory),
+            ("build_wheel", ContextWithBuildDirectory),
             ("build_wininst", ContextWithBuildDirectory),
             ("build_mpkg", ContextWithBuildDirectory),
             ("install", ContextWithBuildDirectory),
@@ -203,7 +204,7 @@ def register_stuff(global_context):
     register_options_special(global_context)
     register_command_contexts(global_context)
 
-def main(argv=None):
+def confirm_root_usage():
     if hasattr(os, "getuid"):
         if os.getuid() == 0:
             pprint("RED", "Using bentomaker under root/sudo is *strongly* discouraged - do you want to continue ? y/N")
@@ -211,14 +212,21 @@ def main(argv=None):
             if not ans.lower() in ["y", "yes"]:
                 raise bento.errors.UsageException("bentomaker execution canceld (not using bentomaker with admin privileges)")
 
+def main(argv=None, confirm_root=True, resident_cache=None):
+    """Run bentomaker with the given command line arguments.
+
+    resident_cache is the ResidentCache of a resident bentomaker server, which
+    keeps the package descriptions and hook modules from one run to the next
+    (see bentomakerlib.server)."""
+    if confirm_root:
+        confirm_root_usage()
+
     if argv is None:
         argv = sys.argv[1:]
 
     options_context = create_global_options_context()
     popts = parse_global_options(options_context, argv)
 
-    cmd_name = popts.cmd_name
-
     if popts.show_version:
         print(bento.__version__)
         return
@@ -227,6 +235,22 @@ def main(argv=None):
         print(bento.__version__ + "git" + bento.__git_revision__)
         return
 
+    if not popts.trace:
+        return _run_main(options_context, popts, resident_cache)
+
+    tracer = bento.utils.trace.Tracer()
+    old_tracer = bento.utils.trace.set_tracer(tracer)
+    span = tracer.begin(SCRIPT_NAME, "main", {"argv": argv})
+    try:
+        return _run_main(options_context, popts, resident_cache)
+    finally:
+        tracer.end(span)
+        bento.utils.trace.set_tracer(old_tracer)
+        tracer.write(popts.trace)
+
+def _run_main(options_context, popts, resident_cache=None):
+    cmd_name = popts.cmd_name
+
     source_root = os.path.join(os.getcwd(), os.path.dirname(popts.bento_info))
     build_root = os.path.join(os.getcwd(), popts.build_directory)
 
@@ -244,11 +268,13 @@ def main(argv=None):
     if not popts.disable_autoconfigure:
         global_context.set_before("build", "configure")
     global_context.set_before("build_egg", "build")
+    global_context.set_before("build_wheel", "build")
     global_context.set_before("build_wininst", "build")
     global_context.set_before("install", "build")
 
     if cmd_name and cmd_name not in ["convert"]:
-        return _wrapped_main(global_context, popts, run_node, top_node, build_node)
+        return _wrapped_main(global_context, popts, run_node, top_node, build_node,
+                             resident_cache)
     else:
         # XXX: is cached package necessary here ?
         cached_package = None
@@ -257,16 +283,26 @@ def main(argv=None):
             register_options(global_context, cmd_name)
         return _main(global_context, cached_package, popts, run_node, top_node, build_node)
 
-def _wrapped_main(global_context, popts, run_node, top_node, build_node):
+def _wrapped_main(global_context, popts, run_node, top_node, build_node,
+                  resident_cache=None):
     # Some commands work without a bento description file (convert, help)
     # FIXME: this should not be called here then - clearly separate commands
     # which require bento.info from the ones who do not
     bento_info_node = top_node.find_node(BENTO_SCRIPT)
     if bento_info_node is not None:
         db_node = build_node.make_node(DB_FILE)
-        cached_package = CachedPackage(db_node)
-        package = cached_package.get_package(bento_info_node)
-        package_options = cached_package.get_options(bento_info_node)
+        if resident_cache is None:
+            cached_package = CachedPackage(db_node)
+            create_module = create_hook_module
+        else:
+            cached_package = resident_cache.get_cached_package(db_node)
+            create_module = resident_cache.get_hook_module
+        span = bento.utils.trace.begin("load_package", "package_cache")
+        try:
+            package = cached_package.get_package(bento_info_node)
+            package_options = cached_package.get_options(bento_info_node)
+        finally:
+            bento.utils.trace.end(span)
 
         if package.use_backends:
             if len(package.use_backends) > 1:
@@ -276,7 +312,11 @@ def _wrapped_main(global_context, popts, run_node, top_node, build_node):
                 global_context.backend = load_backend(package.use_backends[0])()
         global_context.register_package_options(package_options)
 
-        mods = set_main(package, top_node, build_node)
+        span = bento.utils.trace.begin("set_main", "hook_import")
+        try:
+            mods = set_main(package, top_node, build_node, create_module)
+        finally:
+            bento.utils.trace.end(span)
 
     else:
         warnings.warn("No %r file in current directory - only generic options "
@@ -345,6 +385,10 @@ def create_global_options_context():
 Do not automatically run configure before build. In this mode, the user is
 expected to know what he is doing. This is mainly useful for developers, to
 avoid running configure everytime (default: '%default')."""))
+    context.add_option(Option("--trace", dest="trace", metavar="FILE",
+                              help="Profile the run, and write the timings of " \
+                                   "commands, hooks, configure checks and build tasks " \
+                                   "into FILE as Chrome trace-event JSON (--trace=FILE)"))
     context.add_option(Option("-h", "--help", dest="show_help", action="store_true",
                               help="Display help and exit"))
     context.parser.set_defaults(show_version=False, show_full_version=False, show_help=False,
@@ -379,7 +423,7 @@ def parse_global_options(context, argv):
 
     global_options = GlobalOptions(cmd_name, cmd_argv, show_usage,
             build_directory, bento_info, show_version, show_full_version,
-            o.disable_autoconfigure)
+            o.disable_autoconfigure, o.trace)
     return global_options
 
 def _main(global_context, cached_package, popts, run_node, top_node, build_node):
@@ -465,13 +509,23 @@ def run_cmd(global_context, cached_package, cmd_name, cmd_argv, run_node, top_no
     if bento_info is None:
         raise bento.errors.UsageException("Error: no %s found !" % os.path.join(top_node.abspath(), BENTO_SCRIPT))
 
-    running_package = get_running_package(global_context, cached_package, bento_info)
+    span = bento.utils.trace.begin("get_running_package", "package_cache")
+    try:
+        running_package = get_running_package(global_context, cached_package, bento_info)
+    finally:
+        bento.utils.trace.end(span)
     run_with_dependencies(global_context, cmd_name, cmd_argv, run_node, top_node, running_package)
 
-    global_context.save_command_argv(cmd_name, cmd_argv)
+    cmd = global_context.retrieve_command(cmd_name)
+    global_context.save_command_argv(cmd_name, cmd.stored_argv(cmd_argv))
     global_context.store()
 
 def noexc_main(argv=None):
+    noexc_call(main, argv)
+
+def noexc_call(func, *args):
+    """Call func with the given arguments, exiting with an error message if a
+    bento error or any other exception is raised (as bentomaker does)."""
     def _print_debug():
         if BENTOMAKER_DEBUG:
             tb = sys.exc_info()[2]
@@ -483,7 +537,7 @@ def noexc_main(argv=None):
                           "BENTOMAKER_DEBUG=1 environment variable)")
 
     try:
-        main(argv)
+        func(*args)
     except bento.errors.BentoError:
         _print_debug()
         e = extract_exception()
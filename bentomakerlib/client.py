@@ -0,0 +1,210 @@
+"""Thin client of the resident bentomaker server (see server.py).
+
+Usage::
+
+    python -m bentomakerlib.client [bentomaker arguments]
+
+The arguments, current directory and environment are sent to the server,
+which runs bentomaker and sends its output and exit status back. If no server
+is listening, bentomaker is run in the client process instead.
+
+The server first sends a digest of each variable of its own environment, and
+only the variables which differ are sent to it. Nothing is sent to a socket
+which is not owned by the current user.
+
+Only the standard library is imported here, so that the client starts fast.
+"""
+import os
+import sys
+import stat
+import errno
+import socket
+import struct
+import hashlib
+
+try:
+    import json
+except ImportError:
+    from bento.compat.api \
+        import \
+            json
+
+# Frame kinds of the server messages
+STDOUT = "o".encode("ascii")
+STDERR = "e".encode("ascii")
+EXIT = "x".encode("ascii")
+# Digests of the server environment variables, sent to every new client
+ENVIRON = "v".encode("ascii")
+
+_HEADER = struct.Struct(">cI")
+_SIZE = struct.Struct(">I")
+# struct ucred (pid, uid, gid), see SO_PEERCRED
+_PEERCRED = struct.Struct("3i")
+
+class UntrustedSocketError(Exception):
+    pass
+
+def default_socket_path():
+    """Return the socket path given in the BENTOMAKER_SOCKET environment
+    variable, or the default one for the current user: in XDG_RUNTIME_DIR if
+    set, in a bentomaker-UID directory of TMPDIR otherwise (created by the
+    server, see Server.bind)."""
+    path = os.environ.get("BENTOMAKER_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "bentomaker.sock")
+    tmpdir = os.environ.get("TMPDIR", "/tmp")
+    return os.path.join(tmpdir, "bentomaker-%d" % os.getuid(), "bentomaker.sock")
+
+def _digest(value):
+    if not isinstance(value, bytes):
+        value = value.encode("utf-8", "surrogateescape")
+    return hashlib.sha256(value).hexdigest()
+
+def environ_digests(environ):
+    return dict([(name, _digest(value)) for name, value in environ.items()])
+
+def environ_changes(environ, digests):
+    """Return the (changed, removed) variables of environ, compared to the
+    environment whose digests are given: changed is a dictionary of the new
+    or modified variables, removed the list of the missing ones."""
+    changed = dict([(name, value) for name, value in environ.items()
+                    if digests.get(name) != _digest(value)])
+    removed = [name for name in digests if not name in environ]
+    return changed, removed
+
+def recv_exactly(sock, n):
+    """Read n bytes from sock, or return None if the connection is closed
+    before."""
+    chunks = []
+    while n > 0:
+        data = sock.recv(n)
+        if not data:
+            return None
+        chunks.append(data)
+        n -= len(data)
+    return "".encode("ascii").join(chunks)
+
+def send_request(sock, request):
+    """Send the request (a dictionary) as size-prefixed JSON."""
+    data = json.dumps(request).encode("utf-8")
+    sock.sendall(_SIZE.pack(len(data)) + data)
+
+def recv_request(sock):
+    header = recv_exactly(sock, _SIZE.size)
+    if header is None:
+        return None
+    data = recv_exactly(sock, _SIZE.unpack(header)[0])
+    if data is None:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+def send_frame(sock, kind, data):
+    sock.sendall(_HEADER.pack(kind, len(data)) + data)
+
+def recv_frame(sock):
+    """Return the next (kind, data) frame sent by the server, or None if the
+    connection is closed."""
+    header = recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    kind, size = _HEADER.unpack(header)
+    data = recv_exactly(sock, size)
+    if data is None:
+        return None
+    return kind, data
+
+def connect(socket_path):
+    """Return a socket connected to the server, or None if no server is
+    listening at socket_path.
+
+    UntrustedSocketError is raised if socket_path is not a socket owned by
+    the current user, or if the server runs as another user."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        st = os.lstat(socket_path)
+    except OSError:
+        e = sys.exc_info()[1]
+        if e.errno == errno.ENOENT:
+            return None
+        raise
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        raise UntrustedSocketError("%s is not a socket owned by the current user" % socket_path)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except socket.error:
+        e = sys.exc_info()[1]
+        sock.close()
+        if e.args[0] in (errno.ENOENT, errno.ECONNREFUSED):
+            return None
+        raise
+    # The socket may have been replaced since it was checked
+    if hasattr(socket, "SO_PEERCRED"):
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size)
+        pid, uid, gid = _PEERCRED.unpack(creds)
+        if uid != os.getuid():
+            sock.close()
+            raise UntrustedSocketError("%s is served by another user" % socket_path)
+    return sock
+
+def _binary_stream(stream):
+    return getattr(stream, "buffer", stream)
+
+def run_remote(sock, argv, cwd, environ, stdout=None, stderr=None):
+    """Ask the server to run bentomaker with the given arguments, directory
+    and environment, write the output of the run into the given binary
+    streams, and return its exit status."""
+    if stdout is None:
+        stdout = _binary_stream(sys.stdout)
+    if stderr is None:
+        stderr = _binary_stream(sys.stderr)
+
+    # The server first sends the digests of its environment variables
+    frame = recv_frame(sock)
+    if frame is not None and frame[0] == ENVIRON:
+        changed, removed = environ_changes(environ, json.loads(frame[1].decode("utf-8")))
+        send_request(sock, {"argv": argv, "cwd": cwd, "env": changed, "unset": removed})
+        frame = recv_frame(sock)
+    while frame is not None:
+        kind, data = frame
+        if kind == STDOUT:
+            stdout.write(data)
+            stdout.flush()
+        elif kind == STDERR:
+            stderr.write(data)
+            stderr.flush()
+        elif kind == EXIT:
+            return int(data.decode("ascii"))
+        frame = recv_frame(sock)
+    stderr.write("bentomaker server closed the connection\n".encode("ascii"))
+    return 1
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    try:
+        sock = connect(default_socket_path())
+    except UntrustedSocketError:
+        e = sys.exc_info()[1]
+        sys.stderr.write("Not using the bentomaker server: %s\n" % e)
+        sock = None
+    if sock is None:
+        from bentomakerlib.bentomaker \
+            import \
+                noexc_main
+        noexc_main(argv)
+        return 0
+
+    try:
+        return run_remote(sock, argv, os.getcwd(), os.environ)
+    finally:
+        sock.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,8 +12,7 @@ def get_usage(global_context):
     commands = []
     cmd_names = sorted(global_context.command_names())
     for name in cmd_names:
-        v = global_context.retrieve_command(name)
-        doc = v.short_descr
+        doc = global_context.retrieve_command_short_descr(name)
         if doc is None:
             doc = "undocumented"
         header = "  %s" % name
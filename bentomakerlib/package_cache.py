@@ -3,12 +3,21 @@ Cache version 1
 
 db["version"] : version number
 db["magic"]   : "BENTOMAGIC"
-db["bento_checkums"] : pickled dictionary {filename: checksum(filename)} for
-                       each bento.info (including subentos)
-db["package_description"] : pickled PackageDescription instance
-db["user_flags"] : pickled user_flags dict
+db["bentos_checksums"] : pickled dictionary {filename: signature} for each
+                        bento.info (including subentos) and hook file, the
+                        signature being the (size, mtime, checksum) returned
+                        by bento.utils.utils.file_signature.
+db["packages"] : pickled list [(flags key, pickled PackageDescription)] of
+                 the packages evaluated for the most recently used user flags
+                 values, most recent last (see PACKAGES_CACHE_SIZE). The flags
+                 key is None for default flags, and the sorted (name, value)
+                 items of user_flags otherwise.
 db["parsed_dict"]: pickled raw parsed dictionary (as returned by
                    raw_parse, before having been seen by the visitor)
+db["subentos_parsed"]: pickled dictionary {filename: (signature, raw parsed
+                       dictionary)} for each subento bento.info, signature
+                       being as in bentos_checksums. Subentos are only parsed
+                       again when their own content changes.
 """
 import os
 import sys
@@ -19,11 +28,11 @@ from bento.parser.misc \
         raw_parse
 from bento.core.package \
     import \
-        raw_to_pkg_kw, PackageDescription
+        raw_to_pkg_kw, raw_parse_files, PackageDescription
 from bento.core.options \
     import \
         raw_to_options_kw, PackageOptions
-from bento.utils.utils import extract_exception
+from bento.utils.utils import extract_exception, file_signature, check_file_signature
 import bento.utils.path
 import bento.utils.io2
 
@@ -32,32 +41,60 @@ if sys.version_info[0] < 3:
 else:
     import pickle
 
-try:
-    from hashlib import md5
-except ImportError:
-    from md5 import md5
 
+# Maximum number of evaluated package descriptions kept in the cache
+PACKAGES_CACHE_SIZE = 8
 
 class CachedPackage(object):
+    """Cached package description and options of a bento.info.
+
+    The cache db is loaded once for the lifetime of the instance, and only
+    written back when its content changed."""
     def __init__(self, db_node):
         self._db_location = db_node
+        self._cache = None
+        # stat metadata of the db file when last loaded or written
+        self._db_stat = None
+
+    def _get_cache(self):
+        if self._cache is None:
+            self._cache = _CachedPackageImpl(self._db_location.abspath())
+            self._db_stat = _db_stat(self._db_location.abspath())
+        return self._cache
+
+    def _close(self, cache):
+        try:
+            cache.close()
+        finally:
+            self._db_stat = _db_stat(self._db_location.abspath())
 
     def get_package(self, bento_info, user_flags=None):
-        cache = _CachedPackageImpl(self._db_location.abspath())
+        cache = self._get_cache()
         try:
             return cache.get_package(bento_info, user_flags)
         finally:
-            cache.close()
+            self._close(cache)
 
     def get_options(self, bento_info):
-        cache = _CachedPackageImpl(self._db_location.abspath())
+        cache = self._get_cache()
         try:
             return cache.get_options(bento_info)
         finally:
-            cache.close()
+            self._close(cache)
+
+    def revalidate(self):
+        """Check again the files the cache depends on at the next access, for
+        instances kept from one bentomaker run to the next (resident
+        bentomaker). The db is loaded again if it was modified by another
+        process in the meantime."""
+        if self._cache is not None:
+            if _db_stat(self._db_location.abspath()) != self._db_stat:
+                self._cache = None
+            else:
+                self._cache._validated = False
 
 class _CachedPackageImpl(object):
-    __version__ = "2"
+    __version__ = "6"
     __magic__ = "CACHED_PACKAGE_BENTOMAGIC"
 
     def _has_valid_magic(self, db):
@@ -75,6 +112,9 @@ class _CachedPackageImpl(object):
         self.db["magic"] = self.__magic__
         self.db["version"] = self.__version__
         self._first_time = True
+        self._validated = False
+        self._dirty = True
+        self._subentos_parser = None
 
     def _load_existing_cache(self, db_location):
         fid = open(db_location, "rb")
@@ -83,6 +123,7 @@ class _CachedPackageImpl(object):
             if not self._has_valid_magic(db):
                 warnings.warn("Resetting invalid cached db")
                 self._reset()
+                return self.db
         finally:
             fid.close()
 
@@ -90,12 +131,19 @@ class _CachedPackageImpl(object):
         if version != self.__version__:
             warnings.warn("Resetting invalid version of cached db")
             self._reset()
+            return self.db
 
         return db
 
     def __init__(self, db_location):
         self._location = db_location
         self._first_time = False
+        # True once the files the cache depends on have been checked in this
+        # session
+        self._validated = False
+        # True if db needs to be written back
+        self._dirty = False
+        self._subentos_parser = None
         if not os.path.exists(db_location):
             bento.utils.path.ensure_dir(db_location)
             self._reset()
@@ -108,16 +156,52 @@ class _CachedPackageImpl(object):
                 self._reset()
 
     def _has_invalidated_cache(self):
+        if self._validated:
+            return False
         if "bentos_checksums" in self.db:
             r_checksums = pickle.loads(self.db["bentos_checksums"])
-            for f in r_checksums:
-                checksum = md5(open(f, "rb").read()).hexdigest()
-                if checksum != r_checksums[f]:
+            updated = False
+            for f, signature in r_checksums.items():
+                new_signature = check_file_signature(f, signature)
+                if new_signature is None:
                     return True
+                elif new_signature is not signature:
+                    # Same content: only refresh the stat metadata
+                    r_checksums[f] = new_signature
+                    updated = True
+            if updated:
+                self.db["bentos_checksums"] = pickle.dumps(r_checksums)
+                self._dirty = True
+            self._validated = True
             return False
         else:
             return True
 
+    def _get_subentos_parser(self):
+        if self._subentos_parser is None:
+            if "subentos_parsed" in self.db:
+                cached = pickle.loads(self.db["subentos_parsed"])
+            else:
+                cached = {}
+            self._subentos_parser = _CachedSubentosParser(cached)
+        return self._subentos_parser
+
+    def _raw_to_pkg(self, raw, user_flags, bento_info):
+        parser = self._get_subentos_parser()
+        ret = _raw_to_pkg(raw, user_flags, bento_info, parser)
+        if parser.updated:
+            self.db["subentos_parsed"] = pickle.dumps(parser.used_entries())
+            parser.updated = False
+            self._dirty = True
+        return ret
+
+    def _create_objects(self, bento_info, user_flags):
+        ret = _create_objects_no_cached(bento_info, user_flags, self.db,
+                                        self._raw_to_pkg)
+        self._validated = True
+        self._dirty = True
+        return ret
+
     def get_package(self, bento_info, user_flags=None):
         try:
             return self._get_package(bento_info, user_flags)
@@ -130,21 +214,27 @@ class _CachedPackageImpl(object):
     def _get_package(self, bento_info, user_flags=None):
         if self._first_time:
             self._first_time = False
-            return _create_package_nocached(bento_info, user_flags, self.db)
+            return self._create_objects(bento_info, user_flags)[0]
         else:
             if self._has_invalidated_cache():
-                return _create_package_nocached(bento_info, user_flags, self.db)
+                return self._create_objects(bento_info, user_flags)[0]
             else:
-                r_user_flags = pickle.loads(self.db["user_flags"])
-                if user_flags is None:
-                    # FIXME: this case is wrong
-                    return pickle.loads(self.db["package_description"])
-                elif r_user_flags != user_flags:
-                    return _create_package_nocached(bento_info, user_flags, self.db)
-                else:
-                    raw = pickle.loads(self.db["parsed_dict"])
-                    pkg, files = _raw_to_pkg(raw, user_flags, bento_info)
-                    return pkg
+                key = _flags_key(user_flags)
+                packages = pickle.loads(self.db["packages"])
+                for i, (k, pickled_pkg) in enumerate(packages):
+                    if k == key:
+                        if i != len(packages) - 1:
+                            packages.append(packages.pop(i))
+                            self.db["packages"] = pickle.dumps(packages)
+                            self._dirty = True
+                        return pickle.loads(pickled_pkg)
+
+                raw = pickle.loads(self.db["parsed_dict"])
+                pkg, files = self._raw_to_pkg(raw, user_flags, bento_info)
+                packages.append((key, pickle.dumps(pkg)))
+                self.db["packages"] = pickle.dumps(packages[-PACKAGES_CACHE_SIZE:])
+                self._dirty = True
+                return pkg
 
     def get_options(self, bento_info):
         try:
@@ -158,49 +248,98 @@ class _CachedPackageImpl(object):
     def _get_options(self, bento_info):
         if self._first_time:
             self._first_time = False
-            return _create_options_nocached(bento_info, {}, self.db)
+            return self._create_objects(bento_info, {})[1]
         else:
             if self._has_invalidated_cache():
-                return _create_options_nocached(bento_info, {}, self.db)
+                return self._create_objects(bento_info, {})[1]
             else:
                 raw = pickle.loads(self.db["parsed_dict"])
                 return _raw_to_options(raw)
 
     def close(self):
-        bento.utils.io2.safe_write(self._location, lambda fd: pickle.dump(self.db, fd))
+        if self._dirty:
+            bento.utils.io2.safe_write(self._location, lambda fd: pickle.dump(self.db, fd))
+            self._dirty = False
+
+def _db_stat(filename):
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return (st.st_mtime, st.st_size, st.st_ino)
+
+def _flags_key(user_flags):
+    if user_flags is None:
+        return None
+    else:
+        items = list(user_flags.items())
+        items.sort()
+        return tuple(items)
+
+class _CachedSubentosParser(object):
+    """Parse subentos bento.info files, reusing the cached raw parsed
+    dictionaries of the files whose content did not change."""
+    def __init__(self, cached):
+        # {filename: (signature, raw parsed dictionary)}
+        self.cached = cached
+        # True if entries have been added or updated since last checked
+        self.updated = False
+        self._used = set()
+
+    def __call__(self, filenames):
+        ret = {}
+        missing = []
+        for f in filenames:
+            self._used.add(f)
+            if f in self.cached:
+                signature, raw = self.cached[f]
+                new_signature = check_file_signature(f, signature)
+                if new_signature is not None:
+                    if new_signature is not signature:
+                        self.cached[f] = (new_signature, raw)
+                        self.updated = True
+                    ret[f] = raw
+                    continue
+            missing.append(f)
 
-def _create_package_nocached(bento_info, user_flags, db):
-    pkg, options = _create_objects_no_cached(bento_info, user_flags, db)
-    return pkg
+        if missing:
+            # Signatures are taken before parsing, so that a file modified
+            # while being parsed is parsed again next time
+            signatures = [file_signature(f) for f in missing]
+            for f, signature, raw in zip(missing, signatures, raw_parse_files(missing)):
+                self.cached[f] = (signature, raw)
+                ret[f] = raw
+            self.updated = True
+        return [ret[f] for f in filenames]
 
-def _create_options_nocached(bento_info, user_flags, db):
-    pkg, options = _create_objects_no_cached(bento_info, user_flags, db)
-    return options
+    def used_entries(self):
+        """Return the cached entries of the files parsed so far, so that
+        removed subentos are not kept in the cache forever."""
+        return dict([(f, self.cached[f]) for f in self._used])
 
 def _raw_to_options(raw):
     kw = raw_to_options_kw(raw)
     return PackageOptions(**kw)
 
-def _raw_to_pkg(raw, user_flags, bento_info):
-    kw, files = raw_to_pkg_kw(raw, user_flags, bento_info)
+def _raw_to_pkg(raw, user_flags, bento_info, parse_files=None):
+    kw, files = raw_to_pkg_kw(raw, user_flags, bento_info, parse_files)
     pkg = PackageDescription(**kw)
     return pkg, files
 
-def _create_objects_no_cached(bento_info, user_flags, db):
+def _create_objects_no_cached(bento_info, user_flags, db, raw_to_pkg=_raw_to_pkg):
     d = os.path.dirname(bento_info.abspath())
     info_file = open(bento_info.abspath(), 'r')
     try:
         data = info_file.read()
         raw = raw_parse(data, bento_info.abspath())
 
-        pkg, files = _raw_to_pkg(raw, user_flags, bento_info)
+        pkg, files = raw_to_pkg(raw, user_flags, bento_info)
         files = [os.path.join(d, f) for f in files]
         options = _raw_to_options(raw)
 
-        checksums = [md5(open(f, "rb").read()).hexdigest() for f in files]
+        checksums = [file_signature(f) for f in files]
         db["bentos_checksums"] = pickle.dumps(dict(zip(files, checksums)))
-        db["package_description"] = pickle.dumps(pkg)
-        db["user_flags"] = pickle.dumps(user_flags)
+        db["packages"] = pickle.dumps([(_flags_key(user_flags), pickle.dumps(pkg))])
         db["parsed_dict"] = pickle.dumps(raw)
 
         return pkg, options
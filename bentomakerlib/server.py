@@ -0,0 +1,359 @@
+"""Resident bentomaker server, running the bentomaker commands sent by
+bentomakerlib.client over a Unix socket.
+
+Usage::
+
+    python -m bentomakerlib.server [--socket PATH] [--idle-timeout SECONDS]
+    python -m bentomakerlib.server --stop
+
+The server process keeps the modules imported by bentomaker and its commands,
+the cached package description of every project (see
+CachedPackage.revalidate) and their hook modules, so that a command run
+through the client costs little more than the command itself. bento.info
+files (including subentos) and hook files are checked at each run, and loaded
+again when they changed; the modules imported by hook files are not.
+
+Commands are run one at a time, in the directory and with the environment of
+the client. The directory of the socket is created only accessible to the
+current user if it does not exist, and must not be writable by other users
+otherwise.
+"""
+import os
+import sys
+import stat
+import errno
+import socket
+import threading
+
+try:
+    import json
+except ImportError:
+    from bento.compat.api \
+        import \
+            json
+
+from optparse \
+    import \
+        OptionParser
+
+import bento
+
+from bento.commands.hooks \
+    import \
+        create_hook_module
+from bento.utils.utils \
+    import \
+        pprint, extract_exception
+import bento.errors
+
+import six
+
+from bentomakerlib.bentomaker \
+    import \
+        main as bentomaker_main, noexc_call, confirm_root_usage, SCRIPT_NAME
+from bentomakerlib.client \
+    import \
+        STDOUT, STDERR, EXIT, ENVIRON, UntrustedSocketError, default_socket_path, \
+        connect, send_request, recv_request, send_frame, recv_frame, environ_digests
+from bentomakerlib.package_cache \
+    import \
+        CachedPackage
+
+class ResidentCache(object):
+    """Cached package descriptions and hook modules, kept from one run to the
+    next."""
+    def __init__(self):
+        # db filename -> CachedPackage
+        self._packages = {}
+        # hook filename -> (content, module)
+        self._hook_modules = {}
+
+    def get_cached_package(self, db_node):
+        filename = db_node.abspath()
+        cached_package = self._packages.get(filename)
+        if cached_package is None:
+            cached_package = CachedPackage(db_node)
+            self._packages[filename] = cached_package
+        else:
+            cached_package.revalidate()
+        return cached_package
+
+    def get_hook_module(self, filename):
+        """Return the hook module of the given file, created again only if the
+        file content changed."""
+        fid = open(filename, "rb")
+        try:
+            content = fid.read()
+        finally:
+            fid.close()
+
+        entry = self._hook_modules.get(filename)
+        if entry is not None and entry[0] == content:
+            return entry[1]
+        module = create_hook_module(filename)
+        self._hook_modules[filename] = (content, module)
+        return module
+
+class _ClientOutput(object):
+    """File-like object replacing sys.stdout or sys.stderr in the server.
+
+    While a request is handled, what is written into it (possibly from
+    several threads) is sent to the client as frames of the given kind, and
+    into the original stream otherwise."""
+    def __init__(self, kind, stream):
+        self.kind = kind
+        self.stream = stream
+        self._connection = None
+        # True if the client went away during the current request
+        self._lost = False
+        self._lock = threading.Lock()
+
+    def attach(self, connection):
+        self._connection = connection
+        self._lost = False
+
+    def detach(self):
+        self._connection = None
+
+    def write(self, data):
+        connection = self._connection
+        if connection is None:
+            self.stream.write(data)
+            return
+        if isinstance(data, six.text_type):
+            data = data.encode("utf-8")
+        self._lock.acquire()
+        try:
+            if not self._lost:
+                try:
+                    send_frame(connection, self.kind, data)
+                except socket.error:
+                    # Finish the run anyway, its output being discarded
+                    self._lost = True
+        finally:
+            self._lock.release()
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if self._connection is None:
+            self.stream.flush()
+
+    def isatty(self):
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+def _set_environ(env):
+    os.environ.clear()
+    os.environ.update(env)
+
+def _check_socket_dir(dirname):
+    """Create dirname only accessible to the current user if it does not
+    exist, and check that no other user may add or remove files in it
+    otherwise."""
+    try:
+        os.mkdir(dirname, stat.S_IRWXU)
+    except OSError:
+        e = extract_exception()
+        if e.errno != errno.EEXIST:
+            raise
+    st = os.stat(dirname)
+    if st.st_uid not in (os.getuid(), 0) or \
+            (st.st_mode & (stat.S_IWGRP | stat.S_IWOTH) and not st.st_mode & stat.S_ISVTX):
+        raise bento.errors.UsageException("Unsafe socket directory %r: it should be " \
+                                          "owned by the current user, and only " \
+                                          "writable by them" % dirname)
+
+def _exit_status(code):
+    # Same conventions as sys.exit
+    if code is None:
+        return 0
+    elif isinstance(code, int):
+        return code
+    else:
+        sys.stderr.write("%s\n" % code)
+        return 1
+
+class Server(object):
+    def __init__(self, socket_path, idle_timeout=None):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.cache = ResidentCache()
+        # Environment the client environments are sent relatively to
+        self.environ = dict(os.environ)
+        self._environ_digests = json.dumps(environ_digests(self.environ)).encode("utf-8")
+        self._sock = None
+        self._stopped = False
+
+    def bind(self):
+        _check_socket_dir(os.path.dirname(os.path.abspath(self.socket_path)))
+        if os.path.exists(self.socket_path):
+            try:
+                sock = connect(self.socket_path)
+            except UntrustedSocketError:
+                e = extract_exception()
+                raise bento.errors.UsageException(str(e))
+            if sock is not None:
+                sock.close()
+                raise bento.errors.UsageException("A bentomaker server is already " \
+                                                  "listening on %r" % self.socket_path)
+            # Left over by a server which did not exit cleanly
+            os.remove(self.socket_path)
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the current user may connect
+        old_umask = os.umask(stat.S_IRWXG | stat.S_IRWXO)
+        try:
+            sock.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        sock.listen(5)
+        self._sock = sock
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def serve_forever(self):
+        """Handle requests until a stop request is received, or for
+        idle_timeout seconds without any request."""
+        if self._sock is None:
+            self.bind()
+        self._sock.settimeout(self.idle_timeout)
+
+        stdout = _ClientOutput(STDOUT, sys.stdout)
+        stderr = _ClientOutput(STDERR, sys.stderr)
+        old_streams = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = stdout, stderr
+        try:
+            while not self._stopped:
+                try:
+                    connection, address = self._sock.accept()
+                except socket.timeout:
+                    break
+                connection.settimeout(None)
+                try:
+                    try:
+                        self.handle(connection, stdout, stderr)
+                    except socket.error:
+                        # The client went away
+                        pass
+                finally:
+                    connection.close()
+        finally:
+            sys.stdout, sys.stderr = old_streams
+            self.close()
+
+    def handle(self, connection, stdout, stderr):
+        send_frame(connection, ENVIRON, self._environ_digests)
+        request = recv_request(connection)
+        if request is None:
+            return
+        if request.get("stop"):
+            self._stopped = True
+            send_frame(connection, EXIT, "0".encode("ascii"))
+            return
+
+        stdout.attach(connection)
+        stderr.attach(connection)
+        try:
+            status = self.run(request)
+        finally:
+            stdout.detach()
+            stderr.detach()
+        send_frame(connection, EXIT, str(status).encode("ascii"))
+
+    def run(self, request):
+        """Run bentomaker as requested, and return its exit status."""
+        old_cwd = os.getcwd()
+        old_environ = dict(os.environ)
+        old_argv = sys.argv
+        try:
+            try:
+                os.chdir(request["cwd"])
+                environ = dict(self.environ)
+                environ.update(request["env"])
+                for name in request["unset"]:
+                    environ.pop(name, None)
+                _set_environ(environ)
+                # For the program name of the usage and error messages
+                sys.argv = [SCRIPT_NAME] + request["argv"]
+                noexc_call(bentomaker_main, request["argv"], False, self.cache)
+            except SystemExit:
+                return _exit_status(extract_exception().code)
+            except OSError:
+                e = extract_exception()
+                pprint("RED", "Could not run bentomaker in %r: %s" % (request["cwd"], e))
+                return 1
+            return 0
+        finally:
+            sys.argv = old_argv
+            _set_environ(old_environ)
+            os.chdir(old_cwd)
+
+def stop_server(socket_path):
+    """Stop the server listening at socket_path, and return False if there
+    was none."""
+    sock = connect(socket_path)
+    if sock is None:
+        return False
+    try:
+        send_request(sock, {"stop": True})
+        while True:
+            frame = recv_frame(sock)
+            if frame is None or frame[0] == EXIT:
+                break
+    finally:
+        sock.close()
+    return True
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("--socket", dest="socket_path", default=default_socket_path(),
+                      help="Path of the server socket (default: %default, or the " \
+                           "BENTOMAKER_SOCKET environment variable)")
+    parser.add_option("--idle-timeout", dest="idle_timeout", type="float",
+                      help="Exit after this many seconds without any request")
+    parser.add_option("--stop", action="store_true", default=False,
+                      help="Stop the running server")
+    o, a = parser.parse_args(argv)
+
+    if o.stop:
+        try:
+            stopped = stop_server(o.socket_path)
+        except UntrustedSocketError:
+            e = extract_exception()
+            pprint("RED", str(e))
+            return 2
+        if not stopped:
+            pprint("RED", "No bentomaker server listening on %r" % o.socket_path)
+            return 1
+        return 0
+
+    server = Server(o.socket_path, o.idle_timeout)
+    try:
+        confirm_root_usage()
+        server.bind()
+    except bento.errors.BentoError:
+        e = extract_exception()
+        pprint("RED", str(e))
+        return 2
+    pprint("GREEN", "bentomaker server listening on %r" % o.socket_path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,7 +16,7 @@ from bento.core.node \
         create_base_nodes
 from bento.utils.utils \
     import \
-        extract_exception
+        extract_exception, read_or_create_dict
 from bento.commands.contexts \
     import \
         GlobalContext
@@ -32,13 +32,15 @@ from bento.errors \
 
 import bentomakerlib.bentomaker
 import bento.commands.build_yaku
+import bento.utils.trace
 from bento.compat.dist \
     import \
         DistributionMetadata
 
 from bentomakerlib.bentomaker \
     import \
-        main, noexc_main, _wrapped_main, parse_global_options, create_global_options_context
+        main, noexc_main, _wrapped_main, parse_global_options, create_global_options_context, \
+        register_commands, CMD_DATA_DUMP
 
 # FIXME: nose is broken - needed to make it happy
 if sys.platform == "darwin":
@@ -88,6 +90,15 @@ class TestSpecialCommands(Common):
     def test_command_help(self):
         main(["configure", "--help"])
 
+    def test_short_descriptions(self):
+        """Check the short descriptions given when registering the commands
+        are the ones of the commands."""
+        global_context = GlobalContext(None)
+        register_commands(global_context)
+        for cmd_name in global_context.command_names(public_only=False):
+            short_descr = global_context.retrieve_command_short_descr(cmd_name)
+            self.assertEqual(short_descr, global_context.retrieve_command(cmd_name).short_descr)
+
 class TestMain(Common):
     def test_no_bento(self):
         main([])
@@ -231,6 +242,14 @@ Name: foo
         self.assertEqual(q.get(timeout=1), ["--prefix=/fubar"])
         p.join()
 
+    def test_one_shot_options(self):
+        """Check build --report is not stored for the next builds."""
+        self.top_node.make_node("bento.info").write("Name: foo\n")
+        main(["build", "--report", "-j", "2"], False)
+
+        cmd_data_store = read_or_create_dict(self.build_node.find_node(CMD_DATA_DUMP).abspath())
+        self.assertEqual(cmd_data_store["build"], ["-j", "2"])
+
     def test_flags(self):
         """Test that flag value specified on the command line are correctly
         stored between run."""
@@ -304,6 +323,61 @@ class TestBentomakerError(Common):
             finally:
                 bentomakerlib.bentomaker.main = old_main
 
+class TestTrace(Common):
+    def setUp(self):
+        super(TestTrace, self).setUp()
+
+        bento_info = """\
+Name: foo
+
+HookFile: bscript
+"""
+        self.top_node.make_node("bento.info").write(bento_info)
+        bscript = """\
+from bento.commands import hooks
+
+@hooks.pre_build
+def pre_build(context):
+    pass
+
+@hooks.post_configure
+def post_configure(context):
+    pass
+"""
+        self.top_node.make_node("bscript").write(bscript)
+
+    def test_option(self):
+        options_context = create_global_options_context()
+        popts = parse_global_options(options_context, ["--trace=trace.json", "build"])
+        self.assertEqual(popts.trace, "trace.json")
+        self.assertEqual(popts.cmd_name, "build")
+
+        popts = parse_global_options(options_context, ["build"])
+        self.assertTrue(popts.trace is None)
+
+    def test_simple(self):
+        global_context = GlobalContext(self.build_node.make_node("cmd_data.db"))
+        global_context.set_before("build", "configure")
+        options_context = create_global_options_context()
+        popts = parse_global_options(options_context, ["build"])
+
+        tracer = bento.utils.trace.Tracer()
+        old_tracer = bento.utils.trace.set_tracer(tracer)
+        try:
+            _wrapped_main(global_context, popts, self.run_node, self.top_node,
+                    self.build_node)
+        finally:
+            bento.utils.trace.set_tracer(old_tracer)
+
+        spans = [(e["cat"], e["name"]) for e in tracer.trace_events() if e["ph"] == "X"]
+        for span in [("command", "configure"), ("command", "build"),
+                     ("post_hook", "post_configure"), ("pre_hook", "pre_build"),
+                     ("package_cache", "load_package"), ("hook_import", "set_main"),
+                     ("package_cache", "get_running_package")]:
+            self.assertTrue(span in spans, "%r not traced" % (span,))
+        self.assertTrue(spans.index(("command", "configure")) < spans.index(("post_hook", "post_configure")))
+        self.assertTrue(spans.index(("command", "build")) < spans.index(("pre_hook", "pre_build")))
+
 class TestStartupHook(Common):
     def setUp(self):
         super(TestStartupHook, self).setUp()
@@ -0,0 +1,242 @@
+import os
+import sys
+import tempfile
+import shutil
+import time
+
+import mock
+
+from bento.compat.api.moves \
+    import \
+        unittest
+from bento.core.node \
+    import \
+        create_base_nodes
+
+from bentomakerlib.package_cache \
+    import \
+        CachedPackage
+import bentomakerlib.package_cache as package_cache
+
+if sys.version_info[0] < 3:
+    import cPickle as pickle
+else:
+    import pickle
+
+BENTO_INFO = """\
+Name: foo
+Version: 1.0
+
+Flag: debug
+    Description: debug flag
+    Default: false
+
+Library:
+    Modules: foo
+"""
+
+class _CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.d = tempfile.mkdtemp()
+        self.top_node, self.build_node, self.run_node = \
+            create_base_nodes(self.d, os.path.join(self.d, "build"), self.d)
+
+        self.bento_info = self.top_node.make_node("bento.info")
+        self.bento_info.write(BENTO_INFO)
+        # Old enough for stat metadata to be trusted
+        t = time.time() - 3600
+        os.utime(self.bento_info.abspath(), (t, t))
+        self.db_node = self.build_node.make_node("cache.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.d)
+
+class TestCachedPackage(_CacheTestCase):
+    def test_single_load(self):
+        cached_package = CachedPackage(self.db_node)
+        load = pickle.load
+        mocked_load = mock.Mock(side_effect=load)
+        cached_package.get_package(self.bento_info)
+        cached_package.get_options(self.bento_info)
+
+        cached_package = CachedPackage(self.db_node)
+        p = mock.patch("bentomakerlib.package_cache.pickle.load", mocked_load)
+        p.start()
+        try:
+            pkg = cached_package.get_package(self.bento_info)
+            options = cached_package.get_options(self.bento_info)
+        finally:
+            p.stop()
+        self.assertEqual(mocked_load.call_count, 1)
+        self.assertEqual(pkg.name, "foo")
+        self.assertTrue("debug" in options.flag_options)
+
+    def test_no_write_if_unchanged(self):
+        CachedPackage(self.db_node).get_package(self.bento_info)
+
+        cached_package = CachedPackage(self.db_node)
+        p = mock.patch("bento.utils.io2.safe_write")
+        mocked_write = p.start()
+        try:
+            cached_package.get_package(self.bento_info)
+            cached_package.get_options(self.bento_info)
+        finally:
+            p.stop()
+        self.assertFalse(mocked_write.called)
+
+    def test_stat_validation(self):
+        CachedPackage(self.db_node).get_package(self.bento_info)
+
+        p = mock.patch("bento.utils.utils.file_checksum")
+        mocked_checksum = p.start()
+        try:
+            CachedPackage(self.db_node).get_options(self.bento_info)
+        finally:
+            p.stop()
+        self.assertFalse(mocked_checksum.called)
+
+    def test_invalidated(self):
+        CachedPackage(self.db_node).get_package(self.bento_info)
+
+        self.bento_info.write(BENTO_INFO.replace("1.0", "2.0"))
+        pkg = CachedPackage(self.db_node).get_package(self.bento_info)
+        self.assertEqual(pkg.version, "2.0")
+
+    def test_touched(self):
+        """Check a file with new stat metadata but same content does not
+        invalidate the cache."""
+        CachedPackage(self.db_node).get_package(self.bento_info)
+        t = time.time() - 1800
+        os.utime(self.bento_info.abspath(), (t, t))
+
+        cached_package = CachedPackage(self.db_node)
+        p = mock.patch("bentomakerlib.package_cache._create_objects_no_cached")
+        mocked = p.start()
+        try:
+            pkg = cached_package.get_package(self.bento_info)
+        finally:
+            p.stop()
+        self.assertFalse(mocked.called)
+        self.assertEqual(pkg.name, "foo")
+
+class TestRevalidate(_CacheTestCase):
+    def test_no_reload(self):
+        cached_package = CachedPackage(self.db_node)
+        cached_package.get_package(self.bento_info)
+
+        cached_package.revalidate()
+        load = pickle.load
+        mocked_load = mock.Mock(side_effect=load)
+        p = mock.patch("bentomakerlib.package_cache.pickle.load", mocked_load)
+        p.start()
+        try:
+            pkg = cached_package.get_package(self.bento_info)
+        finally:
+            p.stop()
+        self.assertFalse(mocked_load.called)
+        self.assertEqual(pkg.version, "1.0")
+
+    def test_bento_info_changed(self):
+        cached_package = CachedPackage(self.db_node)
+        cached_package.get_package(self.bento_info)
+
+        self.bento_info.write(BENTO_INFO.replace("1.0", "2.0"))
+        cached_package.revalidate()
+        self.assertEqual(cached_package.get_package(self.bento_info).version, "2.0")
+
+    def test_db_changed(self):
+        cached_package = CachedPackage(self.db_node)
+        cached_package.get_package(self.bento_info)
+
+        # db updated by another bentomaker process
+        self.bento_info.write(BENTO_INFO.replace("1.0", "2.0"))
+        CachedPackage(self.db_node).get_package(self.bento_info)
+
+        cached_package.revalidate()
+        p = mock.patch("bentomakerlib.package_cache._create_objects_no_cached")
+        mocked = p.start()
+        try:
+            pkg = cached_package.get_package(self.bento_info)
+        finally:
+            p.stop()
+        self.assertFalse(mocked.called)
+        self.assertEqual(pkg.version, "2.0")
+
+class TestPackagesMemoization(_CacheTestCase):
+    def _get_package(self, user_flags):
+        return CachedPackage(self.db_node).get_package(self.bento_info, user_flags)
+
+    def _raw_to_pkg_calls(self, user_flags_list):
+        p = mock.patch("bentomakerlib.package_cache._raw_to_pkg",
+                       mock.Mock(side_effect=package_cache._raw_to_pkg))
+        mocked = p.start()
+        try:
+            for user_flags in user_flags_list:
+                self._get_package(user_flags)
+        finally:
+            p.stop()
+        return mocked.call_count
+
+    def test_alternating_flags(self):
+        self._get_package({"debug": "false"})
+        self._get_package({"debug": "true"})
+        self.assertEqual(self._raw_to_pkg_calls([{"debug": "false"},
+            {"debug": "true"}, {"debug": "false"}]), 0)
+
+    def test_default_flags(self):
+        """Check default flags are not mixed up with the last flags used."""
+        self._get_package({"debug": "true"})
+        self.assertEqual(self._raw_to_pkg_calls([None, None]), 1)
+
+    def test_lru(self):
+        flags = [{"debug": str(i)} for i in range(package_cache.PACKAGES_CACHE_SIZE + 1)]
+        for user_flags in flags:
+            self._get_package(user_flags)
+        # The first flags are the least recently used ones
+        self.assertEqual(self._raw_to_pkg_calls(flags[-1:]), 0)
+        self.assertEqual(self._raw_to_pkg_calls(flags[:1]), 1)
+
+class TestSubentosCache(_CacheTestCase):
+    def setUp(self):
+        super(TestSubentosCache, self).setUp()
+        self.bento_info.write(BENTO_INFO + "\nRecurse: foo, bar\n")
+        self.subentos = []
+        for name in ["foo", "bar"]:
+            n = self.top_node.make_node("%s/bento.info" % name)
+            n.parent.mkdir()
+            n.write("Library:\n    Packages: %s\n" % name)
+            self.subentos.append(n)
+        t = time.time() - 3600
+        for n in [self.bento_info] + self.subentos:
+            os.utime(n.abspath(), (t, t))
+
+    def _parsed_files(self):
+        p = mock.patch("bentomakerlib.package_cache.raw_parse_files",
+                       mock.Mock(side_effect=package_cache.raw_parse_files))
+        mocked = p.start()
+        try:
+            pkg = CachedPackage(self.db_node).get_package(self.bento_info)
+        finally:
+            p.stop()
+        parsed = []
+        for args, kw in mocked.call_args_list:
+            parsed.extend([os.path.basename(os.path.dirname(f)) for f in args[0]])
+        return pkg, parsed
+
+    def test_top_changed(self):
+        CachedPackage(self.db_node).get_package(self.bento_info)
+        self.bento_info.write(BENTO_INFO.replace("1.0", "2.0") + "\nRecurse: foo, bar\n")
+
+        pkg, parsed = self._parsed_files()
+        self.assertEqual(parsed, [])
+        self.assertEqual(pkg.version, "2.0")
+        self.assertEqual(pkg.subpackages["foo/bento.info"].packages, ["foo"])
+
+    def test_subento_changed(self):
+        CachedPackage(self.db_node).get_package(self.bento_info)
+        self.subentos[1].write("Library:\n    Packages: bar, bar2\n")
+
+        pkg, parsed = self._parsed_files()
+        self.assertEqual(parsed, ["bar"])
+        self.assertEqual(pkg.subpackages["bar/bento.info"].packages, ["bar", "bar2"])
+        self.assertEqual(pkg.subpackages["foo/bento.info"].packages, ["foo"])
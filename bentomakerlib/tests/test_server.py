@@ -0,0 +1,211 @@
+import io
+import os
+import sys
+import stat
+import shutil
+import socket
+import tempfile
+import threading
+
+import mock
+
+import bento
+import bento.errors
+
+from bento.compat.api.moves \
+    import \
+        unittest
+from bento.core.node \
+    import \
+        create_base_nodes
+from bento.core.testing \
+    import \
+        skip_if
+
+from bentomakerlib.client \
+    import \
+        connect, run_remote, default_socket_path, environ_digests, environ_changes, \
+        UntrustedSocketError
+from bentomakerlib.server \
+    import \
+        ResidentCache, Server, stop_server
+
+BENTO_INFO = """\
+Name: foo
+Version: %s
+
+Library:
+    Modules: foo
+"""
+
+HOOK = """\
+from bento.commands import hooks
+
+VALUE = %d
+
+@hooks.pre_build
+def pre_build(context):
+    pass
+"""
+
+class TestResidentCache(unittest.TestCase):
+    def setUp(self):
+        self.d = tempfile.mkdtemp()
+        self.top_node, self.build_node, self.run_node = \
+            create_base_nodes(self.d, os.path.join(self.d, "build"), self.d)
+        self.cache = ResidentCache()
+
+    def tearDown(self):
+        shutil.rmtree(self.d)
+
+    def test_hook_module(self):
+        hook = self.top_node.make_node("bscript")
+        hook.write(HOOK % 1)
+
+        module = self.cache.get_hook_module(hook.abspath())
+        self.assertEqual(module.VALUE, 1)
+        self.assertTrue(self.cache.get_hook_module(hook.abspath()) is module)
+
+        hook.write(HOOK % 2)
+        module = self.cache.get_hook_module(hook.abspath())
+        self.assertEqual(module.VALUE, 2)
+
+    def test_cached_package(self):
+        bento_info = self.top_node.make_node("bento.info")
+        bento_info.write(BENTO_INFO % "1.0")
+        db_node = self.build_node.make_node("cache.db")
+
+        cached_package = self.cache.get_cached_package(db_node)
+        self.assertEqual(cached_package.get_package(bento_info).version, "1.0")
+
+        bento_info.write(BENTO_INFO % "2.0")
+        self.assertTrue(self.cache.get_cached_package(db_node) is cached_package)
+        self.assertEqual(cached_package.get_package(bento_info).version, "2.0")
+
+@skip_if(not hasattr(socket, "AF_UNIX"), "The bentomaker server requires Unix sockets")
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.d = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.d, "bentomaker.sock")
+
+        # Replaced by the server while it runs
+        self.stdout = sys.stdout
+        self.server = Server(self.socket_path)
+        self.server.bind()
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        try:
+            if self.thread.is_alive():
+                stop_server(self.socket_path)
+                self.thread.join()
+        finally:
+            shutil.rmtree(self.d)
+
+    def _run(self, argv, environ=None):
+        if environ is None:
+            environ = os.environ
+        stdout, stderr = io.BytesIO(), io.BytesIO()
+        sock = connect(self.socket_path)
+        try:
+            status = run_remote(sock, argv, self.d, environ, stdout, stderr)
+        finally:
+            sock.close()
+        return status, stdout.getvalue().decode(), stderr.getvalue().decode()
+
+    def test_run(self):
+        status, out, err = self._run(["--version"])
+        self.assertEqual(status, 0)
+        self.assertEqual(out, bento.__version__ + "\n")
+
+        # Several requests are handled by the same server
+        status, out, err = self._run(["--version"])
+        self.assertEqual(status, 0)
+
+    def test_error(self):
+        status, out, err = self._run(["foo"])
+        self.assertEqual(status, 2)
+        self.assertTrue("unknown command 'foo'" in err)
+
+    def test_environ(self):
+        environs = []
+        def _main(argv, *a):
+            environs.append(dict(os.environ))
+
+        environ = dict(os.environ)
+        environ["BENTOMAKER_TEST"] = "1"
+        removed = list(environ.keys())[0]
+        del environ[removed]
+        p = mock.patch("bentomakerlib.server.bentomaker_main", _main)
+        p.start()
+        try:
+            status, out, err = self._run(["--version"], environ)
+        finally:
+            p.stop()
+        self.assertEqual(status, 0)
+        self.assertEqual(environs, [environ])
+        self.assertEqual(os.environ.get("BENTOMAKER_TEST"), None)
+
+    def test_stop(self):
+        self.assertTrue(stop_server(self.socket_path))
+        self.thread.join()
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertTrue(sys.stdout is self.stdout)
+        self.assertFalse(stop_server(self.socket_path))
+
+class TestEnvironChanges(unittest.TestCase):
+    def test_changes(self):
+        digests = environ_digests({"A": "1", "B": "2", "C": "3"})
+        changed, removed = environ_changes({"A": "1", "B": "4", "D": "5"}, digests)
+        self.assertEqual(changed, {"B": "4", "D": "5"})
+        self.assertEqual(removed, ["C"])
+
+class TestSocketPath(unittest.TestCase):
+    def setUp(self):
+        self.old_environ = dict(os.environ)
+        for name in ["BENTOMAKER_SOCKET", "XDG_RUNTIME_DIR"]:
+            os.environ.pop(name, None)
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.old_environ)
+
+    def test_runtime_dir(self):
+        os.environ["XDG_RUNTIME_DIR"] = "/run/user/1000"
+        self.assertEqual(default_socket_path(), "/run/user/1000/bentomaker.sock")
+
+    def test_tmpdir(self):
+        os.environ["TMPDIR"] = "/tmp"
+        self.assertEqual(default_socket_path(),
+                         "/tmp/bentomaker-%d/bentomaker.sock" % os.getuid())
+
+@skip_if(not hasattr(socket, "AF_UNIX"), "The bentomaker server requires Unix sockets")
+class TestSocketSafety(unittest.TestCase):
+    def setUp(self):
+        self.d = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.d)
+
+    def test_not_a_socket(self):
+        path = os.path.join(self.d, "bentomaker.sock")
+        fid = open(path, "w")
+        fid.close()
+        self.assertRaises(UntrustedSocketError, connect, path)
+        self.assertRaises(bento.errors.UsageException, Server(path).bind)
+
+    def test_private_dir(self):
+        path = os.path.join(self.d, "bentomaker-0", "bentomaker.sock")
+        server = Server(path)
+        server.bind()
+        try:
+            st = os.stat(os.path.dirname(path))
+            self.assertEqual(stat.S_IMODE(st.st_mode), stat.S_IRWXU)
+        finally:
+            server.close()
+
+    def test_unsafe_dir(self):
+        os.chmod(self.d, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
+        server = Server(os.path.join(self.d, "bentomaker.sock"))
+        self.assertRaises(bento.errors.UsageException, server.bind)
@@ -0,0 +1,77 @@
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+
+from bento.compat.api.moves \
+    import \
+        unittest
+
+# Maximum time to import bentomaker, in seconds (may be raised on slow
+# machines)
+IMPORT_BUDGET = float(os.environ.get("BENTOMAKER_IMPORT_BUDGET", 0.25))
+
+# Modules only needed by some commands, which should not be imported before
+# one of those commands is run
+DEFERRED_MODULES = ["yaku", "bento.backends.yaku_backend", "bento.convert",
+                    "bento.commands.build_egg", "bento.commands.build_wheel",
+                    "bento.commands.build_wininst", "bento.commands.register",
+                    "bento.commands.sphinx_command", "bento.commands.upload",
+                    "distutils", "urllib2", "urllib.request", "httplib", "http.client"]
+
+_SCRIPT = """\
+import sys
+import time
+start = time.time()
+import bentomakerlib.bentomaker
+duration = time.time() - start
+argv = sys.argv[1:]
+if argv:
+    import warnings
+    warnings.simplefilter("ignore")
+    # Output of the command sent to stderr, not to be mixed with ours
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        bentomakerlib.bentomaker.main(argv, False)
+    finally:
+        sys.stdout = stdout
+sys.stdout.write("%r\\n" % duration)
+sys.stdout.write("\\n".join(sys.modules.keys()))
+"""
+
+def _import_bentomaker(argv=None):
+    """Import bentomaker in a new interpreter, run main with the given
+    arguments if any, and return the import time and the list of imported
+    modules."""
+    if argv is None:
+        argv = []
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    # Outside of any project
+    d = tempfile.mkdtemp()
+    try:
+        p = subprocess.Popen([sys.executable, "-c", _SCRIPT] + argv, env=env, cwd=d,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = p.communicate()
+    finally:
+        shutil.rmtree(d)
+    if p.returncode:
+        raise AssertionError("Running bentomaker %s failed:\n%s" % (" ".join(argv), err.decode()))
+    lines = out.decode().splitlines()
+    return float(lines[0]), lines[1:]
+
+class TestStartup(unittest.TestCase):
+    def test_deferred_imports(self):
+        for argv in [[], ["help"], ["help", "commands"], ["--version"]]:
+            duration, modules = _import_bentomaker(argv)
+            for m in DEFERRED_MODULES:
+                self.assertFalse(m in modules, "%r imported by bentomaker %s" % (m, " ".join(argv)))
+
+    def test_import_time(self):
+        # Best of a few runs, to limit the noise
+        duration = min([_import_bentomaker()[0] for i in range(3)])
+        self.assertTrue(duration < IMPORT_BUDGET,
+                        "Importing bentomaker took %.3fs (budget: %.3fs)" % \
+                        (duration, IMPORT_BUDGET))
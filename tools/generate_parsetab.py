@@ -0,0 +1,20 @@
+"""
+Script to regenerate bento/parser/parsetab.py, the precomputed LR tables of
+the bento.info grammar. Run it whenever the grammar (bento/parser/rules.py) or
+the bundled PLY is changed, and commit the result.
+"""
+import os
+import sys
+
+import os.path as op
+
+sys.path.insert(0, op.abspath(op.join(op.dirname(__file__), os.pardir)))
+try:
+    from bento.parser.parser \
+        import \
+            generate_tables
+finally:
+    sys.path.pop(0)
+
+if __name__ == "__main__":
+    generate_tables()